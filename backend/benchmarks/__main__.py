@@ -0,0 +1,86 @@
+"""命令行入口：python -m benchmarks --sources 20 --items 30 --json bench.json --baseline main.json"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from benchmarks.fake_upstreams import FakeUpstreamConfig
+from benchmarks.harness import SCENARIOS, BenchmarkConfig, cleanup_temp_database, use_temp_database
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="离线压测（模拟 TwitterAPI/GLM/Webhook）")
+    parser.add_argument("--sources", type=int, default=10, help="监控源数量 N")
+    parser.add_argument("--items", type=int, default=20, help="每个监控源的条数 M")
+    parser.add_argument("--rounds", type=int, default=3, help="每个场景重复次数，吞吐取中位数")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="只跑指定场景，可重复；默认全部")
+    parser.add_argument("--sequential", action="store_true", help="pipeline 场景使用顺序执行而非分阶段流水线")
+    parser.add_argument("--trace-memory", action="store_true", help="开启 tracemalloc 统计 Python 堆峰值（更慢）")
+    parser.add_argument("--twitter-latency-ms", type=float, default=80.0)
+    parser.add_argument("--glm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--glm-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--glm-error-rate", type=float, default=0.0)
+    parser.add_argument("--glm-drop-rate", type=float, default=0.0, help="GLM 响应随机漏答的条目比例")
+    parser.add_argument("--webhook-latency-ms", type=float, default=60.0)
+    parser.add_argument("--webhook-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", dest="json_path", help="把完整报告写入 JSON 文件")
+    parser.add_argument("--baseline", help="与基线 JSON 报告对比，有退化时退出码为 1")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="允许的退化比例，默认 0.2（20%%）")
+    parser.add_argument("--verbose", action="store_true", help="输出服务日志")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    # 必须在导入任何数据库相关模块之前切换到临时库
+    use_temp_database()
+    from benchmarks.harness import compare_reports, format_report, run_benchmark
+
+    config = BenchmarkConfig(
+        sources=args.sources,
+        items=args.items,
+        rounds=args.rounds,
+        scenarios=tuple(args.scenario or SCENARIOS),
+        staged=not args.sequential,
+        trace_memory=args.trace_memory,
+        upstream=FakeUpstreamConfig(
+            twitter_latency_ms=args.twitter_latency_ms,
+            tweets_per_page=args.items,
+            glm_latency_ms=args.glm_latency_ms,
+            glm_jitter_ms=args.glm_jitter_ms,
+            glm_error_rate=args.glm_error_rate,
+            glm_drop_rate=args.glm_drop_rate,
+            webhook_latency_ms=args.webhook_latency_ms,
+            webhook_error_rate=args.webhook_error_rate,
+        ),
+    )
+    try:
+        report = asyncio.run(run_benchmark(config))
+    finally:
+        cleanup_temp_database()
+    print(format_report(report))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        regressions = compare_reports(report, baseline, max_regression=args.max_regression)
+        if regressions:
+            print("\nregressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nno regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
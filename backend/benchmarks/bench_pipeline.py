@@ -0,0 +1,54 @@
+"""压测用例：python -m pytest benchmarks/bench_pipeline.py -q -s [--bench-json bench.json]
+
+文件名不以 test_ 开头，默认的 pytest -q 不会收集，需显式指定路径运行。
+"""
+
+import pytest
+
+from benchmarks.fake_upstreams import FakeUpstreamConfig
+from benchmarks.harness import BenchmarkConfig, format_report, run_benchmark, use_temp_database
+
+# 在导入 db.session 之前切换到临时库（conftest 在普通测试运行时也会加载，不能放在那里）
+use_temp_database()
+
+
+@pytest.mark.asyncio
+async def test_bench_all_scenarios(bench_report) -> None:
+    report = bench_report(
+        await run_benchmark(
+            BenchmarkConfig(
+                sources=8,
+                items=20,
+                rounds=3,
+                upstream=FakeUpstreamConfig(tweets_per_page=20, glm_latency_ms=100, glm_jitter_ms=50),
+            )
+        )
+    )
+    print(format_report(report))
+
+    scenarios = report["scenarios"]
+    assert scenarios["pipeline"]["last_round"]["failed_sources"] == 0
+    assert scenarios["llm"]["last_round"]["insights"] == 8 * 20
+    assert scenarios["notify"]["last_round"]["delivered"] == 8 * 3
+    assert all(scenario["items_per_second"] > 0 for scenario in scenarios.values())
+
+
+@pytest.mark.asyncio
+async def test_bench_llm_with_flaky_upstream(bench_report) -> None:
+    """GLM 有错误与漏答时：重试/只补缺失条目的路径，看吞吐与 glm.call 的尾延迟。"""
+    report = bench_report(
+        await run_benchmark(
+            BenchmarkConfig(
+                sources=8,
+                items=20,
+                rounds=3,
+                scenarios=("llm",),
+                upstream=FakeUpstreamConfig(glm_latency_ms=100, glm_jitter_ms=50, glm_error_rate=0.1, glm_drop_rate=0.1),
+            )
+        )
+    )
+    print(format_report(report))
+
+    llm = report["scenarios"]["llm"]
+    assert llm["spans"]["glm.call"]["errors"] > 0
+    assert llm["last_round"]["insights"] > 0
@@ -0,0 +1,36 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.harness import cleanup_temp_database  # noqa: E402
+
+_reports: dict[str, dict] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--bench-json", default=None, help="把各压测用例的报告写入 JSON 文件")
+
+
+@pytest.fixture
+def bench_report(request: pytest.FixtureRequest):
+    """用例把 run_benchmark 的报告交给该 fixture，会话结束时统一写入 --bench-json。"""
+
+    def _record(report: dict) -> dict:
+        _reports[request.node.name] = report
+        return report
+
+    return _record
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    path = session.config.getoption("--bench-json")
+    if path and _reports:
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(_reports, fp, ensure_ascii=False, indent=2)
+    cleanup_temp_database()
@@ -0,0 +1,311 @@
+"""本地模拟的外部服务：TwitterAPI.io、智谱 GLM（OpenAI 兼容的 chat/completions）、飞书/企业微信/钉钉 Webhook。
+
+在后台线程里用 uvicorn 跑一个 FastAPI 应用，监听 127.0.0.1 的随机端口，压测过程不访问外网。
+延迟、错误率、漏答比例都可配置，用来复现上游变慢/抖动时的表现。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 推文文本素材：保证清洗阶段不会把它们当噪音过滤掉
+_TOPICS = (
+    "FastAPI 0.115 adds lifespan state and faster dependency resolution",
+    "New open-source inference server cuts p99 latency for small LLMs",
+    "Benchmarks of async SQLAlchemy with aiosqlite under concurrent writes",
+    "Rust-based JSON parser now 3x faster than the stdlib for large payloads",
+    "Vector database comparison: recall vs. latency at 10M embeddings",
+    "Speculative decoding explained with a minimal PyTorch implementation",
+    "Postgres 17 incremental backup and what it means for large tables",
+    "Practical guide to structured outputs and JSON mode in chat models",
+)
+
+# 与 TwitterAPI.io 一致的时间格式
+_CREATED_AT_FORMAT = "%a %b %d %H:%M:%S +0000 %Y"
+
+_TWEET_ID_JSON_PATTERN = re.compile(r'"tweet_id":\s*"([^"]+)"')
+_TWEET_ID_URL_PATTERN = re.compile(r"/status/(\w+)")
+
+
+@dataclass
+class FakeUpstreamConfig:
+    """模拟服务的行为参数（延迟单位毫秒，比例为 0~1）。"""
+
+    twitter_latency_ms: float = 80.0
+    twitter_error_rate: float = 0.0
+    # 每页推文数与总页数（has_next_page / next_cursor 按此分页）
+    tweets_per_page: int = 20
+    pages: int = 3
+    # 每页中来自公共池的推文比例：不同监控源抓到同一条推文，用于覆盖批内去重路径
+    shared_tweet_ratio: float = 0.1
+
+    glm_latency_ms: float = 400.0
+    # 在基础延迟上叠加的随机抖动上限
+    glm_jitter_ms: float = 200.0
+    glm_error_rate: float = 0.0
+    # 响应中随机漏掉的条目比例，用于覆盖“只重试缺失条目”路径
+    glm_drop_rate: float = 0.0
+    # 流式响应每个分片之间的间隔
+    glm_stream_chunk_ms: float = 20.0
+
+    webhook_latency_ms: float = 60.0
+    webhook_error_rate: float = 0.0
+
+    seed: int = 42
+
+
+def _stable_int(*parts: object) -> int:
+    """跨进程稳定的哈希（内置 hash() 每个进程加盐不同，不能用来生成可复现的数据）。"""
+    return zlib.crc32("|".join(str(part) for part in parts).encode("utf-8"))
+
+
+def make_tweet(user_name: str, page: int, index: int, config: FakeUpstreamConfig) -> dict[str, Any]:
+    """按 (用户, 页码, 序号) 确定性地生成一条推文，格式与 TwitterAPI.io 返回一致。"""
+    rng = random.Random(_stable_int(config.seed, user_name, page, index))
+    shared = rng.random() < config.shared_tweet_ratio
+    if shared:
+        # 公共池只按 (页码, 序号) 取值，所有监控源在同一位置抓到同一条推文
+        tweet_id = f"9{page:03d}{index:05d}"
+        author = f"shared_author_{index % 7}"
+    else:
+        tweet_id = f"{_stable_int(user_name) % 10**9}{page:03d}{index:05d}"
+        author = user_name
+    topic = _TOPICS[_stable_int(tweet_id) % len(_TOPICS)]
+    created_at = time.gmtime(1_700_000_000 + page * 3600 + index * 60)
+    return {
+        "type": "tweet",
+        "id": tweet_id,
+        "url": f"https://x.com/{author}/status/{tweet_id}",
+        "text": f"{topic} (#{tweet_id})",
+        "createdAt": time.strftime(_CREATED_AT_FORMAT, created_at),
+        "likeCount": rng.randint(0, 2000),
+        "retweetCount": rng.randint(0, 400),
+        "replyCount": rng.randint(0, 200),
+        "quoteCount": rng.randint(0, 50),
+        "viewCount": rng.randint(100, 500_000),
+        "author": {"userName": author, "name": author.replace("_", " ").title()},
+    }
+
+
+def _tweet_page(key: str, cursor: str | None, config: FakeUpstreamConfig) -> dict[str, Any]:
+    page = int(cursor) if cursor and cursor.isdigit() else 0
+    tweets = [make_tweet(key, page, index, config) for index in range(config.tweets_per_page)]
+    has_next_page = page + 1 < config.pages
+    return {
+        "status": "success",
+        "tweets": tweets,
+        "has_next_page": has_next_page,
+        "next_cursor": str(page + 1) if has_next_page else "",
+    }
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 3)
+
+
+def _build_glm_content(messages: list[dict[str, Any]], json_mode: bool, rng: random.Random, drop_rate: float) -> str:
+    prompt = "\n".join(str(message.get("content") or "") for message in messages)
+    tweet_ids = _TWEET_ID_JSON_PATTERN.findall(prompt) or _TWEET_ID_URL_PATTERN.findall(prompt)
+    # 去重并保持顺序；按 drop_rate 随机漏答
+    tweet_ids = [tweet_id for tweet_id in dict.fromkeys(tweet_ids) if rng.random() >= drop_rate]
+    if json_mode:
+        items = [
+            {
+                "tweet_id": tweet_id,
+                "ai_score": 50 + _stable_int(tweet_id) % 50,
+                "summary": f"模拟分析：条目 {tweet_id} 给出了可落地的工程实践，适合在服务端性能优化中参考。",
+                "ai_title": f"模拟标题 {tweet_id[-4:]}",
+            }
+            for tweet_id in tweet_ids
+        ]
+        return json.dumps({"items": items}, ensure_ascii=False)
+    lines = [
+        "## 📊 AI分析总览",
+        "- 综合评分: 80",
+        f"- 数据量: {len(tweet_ids)}",
+        "",
+        "## 🔍 关键洞察",
+    ]
+    lines.extend(
+        f"- ID: {tweet_id} | AI评分: {50 + _stable_int(tweet_id) % 50} | 观点: 模拟分析，给出了可落地的工程实践。"
+        for tweet_id in tweet_ids
+    )
+    return "\n".join(lines) + "\n"
+
+
+_WEBHOOK_OK_BODIES = {
+    "feishu": {"code": 0, "msg": "success"},
+    "wechat": {"errcode": 0, "errmsg": "ok"},
+    "dingtalk": {"errcode": 0, "errmsg": "ok"},
+}
+
+
+def build_fake_app(config: FakeUpstreamConfig, stats: Counter[str]) -> FastAPI:
+    """构建模拟服务应用；stats 按 "路由:结果" 累计请求数。"""
+    app = FastAPI()
+    rng = random.Random(config.seed)
+
+    async def _delay(base_ms: float, jitter_ms: float = 0.0) -> None:
+        delay_ms = base_ms + (rng.random() * jitter_ms if jitter_ms > 0 else 0.0)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    def _failed(route: str, error_rate: float) -> bool:
+        if error_rate > 0 and rng.random() < error_rate:
+            stats[f"{route}:error"] += 1
+            return True
+        stats[f"{route}:ok"] += 1
+        return False
+
+    @app.get("/twitter/user/last_tweets")
+    async def last_tweets(userName: str, cursor: str | None = None):
+        await _delay(config.twitter_latency_ms)
+        if _failed("twitter", config.twitter_error_rate):
+            return JSONResponse({"status": "error", "msg": "simulated upstream failure"}, status_code=503)
+        page = _tweet_page(userName, cursor, config)
+        # last_tweets 端点把推文放在 data.tweets 下
+        return {
+            "status": page["status"],
+            "data": {"tweets": page["tweets"]},
+            "has_next_page": page["has_next_page"],
+            "next_cursor": page["next_cursor"],
+        }
+
+    @app.get("/twitter/tweet/advanced_search")
+    async def advanced_search(query: str, queryType: str = "Latest", cursor: str | None = None):
+        await _delay(config.twitter_latency_ms)
+        if _failed("twitter", config.twitter_error_rate):
+            return JSONResponse({"status": "error", "msg": "simulated upstream failure"}, status_code=503)
+        return _tweet_page(f"search:{query}", cursor, config)
+
+    @app.post("/api/paas/v4/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await _delay(config.glm_latency_ms, config.glm_jitter_ms)
+        if _failed("glm", config.glm_error_rate):
+            return JSONResponse({"error": {"code": "1234", "message": "simulated upstream failure"}}, status_code=500)
+        messages = body.get("messages") or []
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        content = _build_glm_content(messages, json_mode=json_mode, rng=rng, drop_rate=config.glm_drop_rate)
+        prompt_tokens = sum(_estimate_tokens(str(message.get("content") or "")) for message in messages)
+        completion_tokens = _estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        model = body.get("model") or "glm-fake"
+        completion_id = f"fake-{rng.getrandbits(32):08x}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+                ],
+                "usage": usage,
+            }
+
+        async def _events():
+            lines = content.splitlines(keepends=True)
+            for line in lines:
+                chunk = {
+                    "id": completion_id,
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"role": "assistant", "content": line}}],
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await _delay(config.glm_stream_chunk_ms)
+            final = {
+                "id": completion_id,
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "delta": {"role": "assistant", "content": ""}}],
+                "usage": usage,
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(_events(), media_type="text/event-stream")
+
+    @app.post("/webhook/{platform}/{token}")
+    async def webhook(platform: str, token: str, request: Request):
+        await request.body()
+        await _delay(config.webhook_latency_ms)
+        if _failed(f"webhook_{platform}", config.webhook_error_rate):
+            return JSONResponse({"errcode": 500, "errmsg": "simulated upstream failure"}, status_code=500)
+        return _WEBHOOK_OK_BODIES.get(platform, {"ok": True})
+
+    return app
+
+
+class FakeUpstreamServer:
+    """在后台线程中运行模拟服务；与被测代码分属不同事件循环，模拟延迟不会占用被测进程的事件循环。"""
+
+    def __init__(self, config: FakeUpstreamConfig | None = None) -> None:
+        self.config = config or FakeUpstreamConfig()
+        self.stats: Counter[str] = Counter()
+        app = build_fake_app(self.config, self.stats)
+        self._server = uvicorn.Server(
+            uvicorn.Config(
+                app,
+                host="127.0.0.1",
+                port=0,
+                log_level="warning",
+                access_log=False,
+                lifespan="off",
+            )
+        )
+        self._thread: threading.Thread | None = None
+        self.base_url = ""
+
+    @property
+    def twitter_base_url(self) -> str:
+        return self.base_url
+
+    @property
+    def glm_base_url(self) -> str:
+        return f"{self.base_url}/api/paas/v4"
+
+    def webhook_url(self, platform: str, token: str = "bench") -> str:
+        return f"{self.base_url}/webhook/{platform}/{token}"
+
+    def start(self, timeout: float = 10.0) -> FakeUpstreamServer:
+        self._thread = threading.Thread(target=self._server.run, name="fake-upstreams", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("fake_upstream_server_failed_to_start")
+            time.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def __enter__(self) -> FakeUpstreamServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
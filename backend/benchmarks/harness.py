@@ -0,0 +1,430 @@
+"""离线压测：用本地模拟的上游服务驱动真实的 PipelineService / LLMService / NotifyService。
+
+场景：
+- pipeline：N 个监控源走完整批处理（抓取 -> 清洗 -> 评分 -> 落库 -> 分析 -> 推送），数据库为临时 SQLite
+- llm：N × M 条资讯按监控源并发调用 analyze_items（真实 SDK + HTTP，请求发往模拟 GLM）
+- notify：N 个监控源各推送 M 条摘要到飞书/企业微信/钉钉三个模拟 Webhook
+
+各阶段与外部调用的耗时取自追踪 Span（与线上 TRACING_EXPORTER 相同的埋点），统计 p50/p95/p99。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from benchmarks.fake_upstreams import FakeUpstreamConfig, FakeUpstreamServer, make_tweet
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，只在开启 tracemalloc 时报告内存
+    resource = None
+
+SCENARIOS = ("pipeline", "llm", "notify")
+_WEBHOOK_PLATFORMS = ("feishu", "wechat", "dingtalk")
+
+# use_temp_database() 设置的临时库地址：压测会清空并重建表，只允许在这个库上执行
+_temp_db_url: str | None = None
+
+
+def use_temp_database() -> str:
+    """把 DB_URL 指向一个临时 SQLite 文件，必须在导入 db.session（及依赖它的服务）之前调用。"""
+    global _temp_db_url
+    if _temp_db_url is None:
+        directory = tempfile.mkdtemp(prefix="bench_")
+        _temp_db_url = f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        os.environ["DB_URL"] = _temp_db_url
+        # 必填配置给出占位值，模拟服务不校验
+        os.environ.setdefault("API_KEY", "bench")
+    return _temp_db_url
+
+
+def cleanup_temp_database() -> None:
+    """删除 use_temp_database() 创建的临时目录（进程退出前调用）。"""
+    if _temp_db_url is not None:
+        shutil.rmtree(os.path.dirname(_temp_db_url.split(":///", 1)[1]), ignore_errors=True)
+
+
+@dataclass
+class BenchmarkConfig:
+    sources: int = 10
+    # 每个监控源每轮抓取/分析/推送的条数
+    items: int = 20
+    rounds: int = 3
+    scenarios: tuple[str, ...] = SCENARIOS
+    # pipeline 场景是否使用分阶段流水线（PIPELINE_STAGED_ENABLED）
+    staged: bool = True
+    # 开启 tracemalloc 统计 Python 堆峰值（会明显拖慢执行，吞吐数字不宜与未开启时对比）
+    trace_memory: bool = False
+    upstream: FakeUpstreamConfig = field(default_factory=FakeUpstreamConfig)
+
+
+class _CollectingExporter:
+    """把结束的 Span 收集在内存里，压测结束后统一计算分位数。"""
+
+    def __init__(self) -> None:
+        self.spans: list[Any] = []
+
+    def export(self, spans: list[Any]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        return None
+
+
+def percentile(values: list[float], q: float) -> float:
+    """线性插值分位数（q 取 0~100）。"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_spans(spans: list[Any]) -> dict[str, dict[str, float]]:
+    durations: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    for span in spans:
+        durations[span.name].append(span.duration_ms)
+        if span.status == "error":
+            errors[span.name] += 1
+    return {
+        name: {
+            "count": len(values),
+            "errors": errors[name],
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(max(values), 2),
+        }
+        for name, values in sorted(durations.items())
+    }
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _apply_settings(settings: Any, overrides: dict[str, Any]) -> dict[str, Any]:
+    previous = {key: getattr(settings, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+    return previous
+
+
+async def _prepare_database(config: BenchmarkConfig, server: FakeUpstreamServer) -> None:
+    from core import get_settings
+    from db.base import Base
+    from db.init_db import init_db
+    from db.session import SessionLocal, engine
+    from models import ChannelPlatform, MonitorSource, PushChannel, SourceChannelBinding, SourceType
+
+    if _temp_db_url is None or get_settings().DB_URL != _temp_db_url:
+        raise RuntimeError("benchmark_requires_temp_database: call use_temp_database() before importing db.session")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+    async with SessionLocal() as session:
+        sources = [
+            MonitorSource(type=SourceType.AUTHOR.value, value=f"bench_author_{index}", is_active=True)
+            for index in range(config.sources)
+        ]
+        channels = [
+            PushChannel(
+                platform=ChannelPlatform(platform_name),
+                webhook_url=server.webhook_url(platform_name),
+                name=f"bench-{platform_name}",
+                is_active=True,
+            )
+            for platform_name in _WEBHOOK_PLATFORMS
+        ]
+        session.add_all([*sources, *channels])
+        await session.flush()
+        session.add_all(
+            SourceChannelBinding(source_id=source.id, channel_id=channel.id) for source in sources for channel in channels
+        )
+        await session.commit()
+
+
+def _crawl_items(config: BenchmarkConfig) -> dict[str, list[Any]]:
+    """llm / notify 场景的输入：与模拟 TwitterAPI 返回相同的推文，按监控源分组。"""
+    from schemas import CrawlItem
+
+    groups: dict[str, list[CrawlItem]] = {}
+    for source_index in range(config.sources):
+        user_name = f"bench_author_{source_index}"
+        groups[user_name] = [
+            CrawlItem(
+                source="author_timeline",
+                tweet_id=tweet["id"],
+                author_username=tweet["author"]["userName"],
+                url=tweet["url"],
+                text=tweet["text"],
+                published_at=None,
+                hotness=0,
+                raw_payload=tweet,
+            )
+            for tweet in (make_tweet(user_name, 0, index, config.upstream) for index in range(config.items))
+        ]
+    return groups
+
+
+async def _gather_limited(coros: list[Any], limit: int) -> list[Any]:
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _run(coro: Any) -> Any:
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(coro) for coro in coros))
+
+
+async def _scenario_pipeline(config: BenchmarkConfig, server: FakeUpstreamServer) -> dict[str, Any]:
+    from services.pipeline_service import PipelineService
+
+    result = await PipelineService().run_all_active_sources()
+    return {
+        "items": config.sources * config.items,
+        "success_sources": result.success_count,
+        "failed_sources": result.failed_count,
+    }
+
+
+async def _scenario_llm(config: BenchmarkConfig, server: FakeUpstreamServer) -> dict[str, Any]:
+    from core import get_settings
+    from core.tracing import tracer
+    from services.llm_service import LLMService
+
+    service = LLMService()
+    groups = _crawl_items(config)
+    with tracer.span("bench.llm"):
+        results = await _gather_limited(
+            [service.analyze_items(items) for items in groups.values()],
+            limit=get_settings().PIPELINE_ANALYZE_CONCURRENCY,
+        )
+    return {
+        "items": sum(len(items) for items in groups.values()),
+        "insights": sum(len(result.insights) for result in results),
+        "tokens": sum(result.total_tokens or 0 for result in results),
+    }
+
+
+async def _scenario_notify(config: BenchmarkConfig, server: FakeUpstreamServer) -> dict[str, Any]:
+    from core import get_settings
+    from core.tracing import tracer
+    from models import ChannelPlatform, PushChannel
+    from services.notify_service import DigestItem, NotifyService
+
+    service = NotifyService()
+    channels = [
+        PushChannel(
+            id=index + 1,
+            platform=ChannelPlatform(platform_name),
+            webhook_url=server.webhook_url(platform_name),
+            name=f"bench-{platform_name}",
+            is_active=True,
+        )
+        for index, platform_name in enumerate(_WEBHOOK_PLATFORMS)
+    ]
+    groups = _crawl_items(config)
+    with tracer.span("bench.notify"):
+        results = await _gather_limited(
+            [
+                service.notify_channels(
+                    channels=channels,
+                    source_name=source_name,
+                    summary_markdown="",
+                    digest_items=[
+                        DigestItem(
+                            title=item.text[:40],
+                            url=item.url,
+                            source=item.author_username,
+                            score=8,
+                            tags=["bench"],
+                            ai_summary_list=["模拟摘要：用于压测推送链路。"],
+                        )
+                        for item in items
+                    ],
+                )
+                for source_name, items in groups.items()
+            ],
+            limit=get_settings().PIPELINE_NOTIFY_CONCURRENCY,
+        )
+    deliveries = [result for group in results for result in group]
+    return {
+        "items": sum(len(items) for items in groups.values()),
+        "deliveries": len(deliveries),
+        "delivered": len([result for result in deliveries if result.success]),
+    }
+
+
+_SCENARIO_RUNNERS = {
+    "pipeline": _scenario_pipeline,
+    "llm": _scenario_llm,
+    "notify": _scenario_notify,
+}
+
+
+async def _run_scenario(name: str, config: BenchmarkConfig, server: FakeUpstreamServer) -> dict[str, Any]:
+    from core.circuit_breaker import circuit_breakers
+    from core.tracing import tracer
+    from services.twitterapi_client import TwitterApiClient
+
+    exporter = _CollectingExporter()
+    tracer.configure(exporter, flush_interval=0.5)
+    if config.trace_memory:
+        tracemalloc.reset_peak()
+    wall_times: list[float] = []
+    outcome: dict[str, Any] = {}
+    try:
+        for _ in range(config.rounds):
+            # 每轮都从“冷”状态开始：上轮的熔断状态与抓取缓存不影响本轮
+            circuit_breakers.reset()
+            if TwitterApiClient._flight is not None:
+                TwitterApiClient._flight.clear()
+            started = time.perf_counter()
+            outcome = await _SCENARIO_RUNNERS[name](config, server)
+            wall_times.append(time.perf_counter() - started)
+    finally:
+        # 关闭时导出剩余 Span
+        tracer.shutdown()
+
+    wall_median = statistics.median(wall_times)
+    report: dict[str, Any] = {
+        "rounds": len(wall_times),
+        "wall_seconds": [round(value, 4) for value in wall_times],
+        "wall_median_seconds": round(wall_median, 4),
+        "items_per_second": round(outcome["items"] / wall_median, 2) if wall_median > 0 else 0.0,
+        "last_round": outcome,
+        "spans": summarize_spans(exporter.spans),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if config.trace_memory:
+        report["peak_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+    return report
+
+
+async def run_benchmark(config: BenchmarkConfig) -> dict[str, Any]:
+    """启动模拟服务，依次执行各场景并返回报告（可直接 json.dumps）。"""
+    from core import get_settings
+    from db.session import engine
+
+    unknown = set(config.scenarios) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"unknown_benchmark_scenarios: {sorted(unknown)}")
+
+    settings = get_settings()
+    server = FakeUpstreamServer(config.upstream).start()
+    previous = _apply_settings(
+        settings,
+        {
+            "TWITTERAPI_IO_API_KEY": "bench",
+            "TWITTERAPI_IO_BASE_URL": server.twitter_base_url,
+            "TWITTERAPI_CACHE_TTL_SECONDS": 0.0,
+            "ZAI_API_KEY": "bench.key",
+            "ZAI_BASE_URL": server.glm_base_url,
+            # 作者模式默认只保留前 N 条，压测按配置的条数处理
+            "AUTHOR_FETCH_LIMIT": config.items,
+            "PIPELINE_STAGED_ENABLED": config.staged,
+        },
+    )
+    if config.trace_memory:
+        tracemalloc.start()
+    try:
+        await _prepare_database(config, server)
+        scenarios = {name: await _run_scenario(name, config, server) for name in config.scenarios}
+    finally:
+        if config.trace_memory:
+            tracemalloc.stop()
+        _apply_settings(settings, previous)
+        await engine.dispose()
+        server.stop()
+
+    return {
+        "config": asdict(config),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "upstream_requests": dict(sorted(server.stats.items())),
+        "scenarios": scenarios,
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines: list[str] = []
+    config = report["config"]
+    lines.append(
+        f"sources={config['sources']} items={config['items']} rounds={config['rounds']} staged={config['staged']}"
+    )
+    for name, scenario in report["scenarios"].items():
+        memory = f" peak_rss={scenario['peak_rss_mb']}MB" if scenario.get("peak_rss_mb") is not None else ""
+        if "peak_heap_mb" in scenario:
+            memory += f" peak_heap={scenario['peak_heap_mb']}MB"
+        lines.append("")
+        lines.append(
+            f"[{name}] {scenario['items_per_second']} items/s  wall_median={scenario['wall_median_seconds']}s{memory}"
+        )
+        lines.append(f"  last_round: {scenario['last_round']}")
+        lines.append(f"  {'span':<24}{'count':>8}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+        for span_name, stats in scenario["spans"].items():
+            lines.append(
+                f"  {span_name:<24}{stats['count']:>8}{stats['errors']:>8}"
+                f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+            )
+    lines.append("")
+    lines.append(f"upstream requests: {report['upstream_requests']}")
+    return "\n".join(lines)
+
+
+def compare_reports(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    max_regression: float = 0.2,
+    min_latency_ms: float = 5.0,
+) -> list[str]:
+    """与基线报告对比，返回超过阈值的退化项（吞吐下降或 Span / 接口 p95 上升超过 max_regression 比例）。
+
+    p95 低于 min_latency_ms 的条目计时噪声较大，不参与对比。
+    """
+    regressions: list[str] = []
+    for name, scenario in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        # 流水线场景按条目吞吐，读接口压测按 QPS
+        unit = "items_per_second" if "items_per_second" in scenario else "requests_per_second"
+        if base.get(unit, 0) > 0:
+            change = scenario[unit] / base[unit] - 1
+            if change < -max_regression:
+                regressions.append(f"{name}: {unit} {base[unit]} -> {scenario[unit]} ({change:+.0%})")
+        for span_name, stats in scenario["spans"].items():
+            base_stats = base["spans"].get(span_name)
+            if base_stats is None or base_stats["p95_ms"] < min_latency_ms:
+                continue
+            change = stats["p95_ms"] / base_stats["p95_ms"] - 1
+            if change > max_regression:
+                regressions.append(
+                    f"{name}/{span_name}: p95 {base_stats['p95_ms']} -> {stats['p95_ms']} ms ({change:+.0%})"
+                )
+    return regressions
@@ -0,0 +1,323 @@
+"""读接口压测：按加权混合的筛选/分页组合驱动 FastAPI，输出各接口延迟分位数与整体 QPS。
+
+用法（先用 `python seed_data.py --bulk` 造数据）：
+
+    python -m benchmarks.load_api --duration 30 --concurrency 16
+    python -m benchmarks.load_api --base-url http://127.0.0.1:8000 --json load.json --baseline main.json
+
+默认进程内通过 ASGITransport 直接调用应用（不触发 lifespan，不启动调度器），压测客户端与服务共享
+同一个事件循环，QPS 偏保守；指定 --base-url 时压测已启动的服务，更接近线上表现。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Any
+
+import httpx
+
+from benchmarks.harness import compare_reports, percentile
+from core import app_now
+from db.seed import BULK_AI_STATUSES, BULK_KEYWORDS, BULK_PLATFORMS
+
+# 各接口在混合负载中的权重，大致对应前端页面的访问比例
+DEFAULT_MIX: dict[str, int] = {
+    "contents_first_page": 20,
+    "contents_deep_page": 10,
+    "contents_keyword": 10,
+    "contents_filtered": 10,
+    "logs_page": 15,
+    "logs_filtered": 10,
+    "log_detail": 10,
+    "dashboard_overview": 10,
+    "dashboard_token_usage": 5,
+}
+
+
+@dataclass
+class LoadTestConfig:
+    duration: float = 30.0
+    requests: int | None = None  # 指定总请求数时忽略 duration
+    concurrency: int = 16
+    page_size: int = 20
+    max_page: int = 200  # 深分页的最大页码，实际还会受数据总量限制
+    seed: int = 42
+    base_url: str | None = None
+    mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+
+
+@dataclass
+class _Dataset:
+    """压测前探测到的数据规模，用于生成合法的页码、ID 与筛选值。"""
+
+    content_pages: int = 1
+    log_pages: int = 1
+    max_log_id: int = 0
+    source_ids: list[int] = field(default_factory=list)
+    keywords: tuple[str, ...] = ()
+
+
+RequestSpec = tuple[str, dict[str, Any]]
+
+
+def _build_requests(config: LoadTestConfig, dataset: _Dataset) -> dict[str, Callable[[random.Random], RequestSpec]]:
+    platforms = [name for name, _ in BULK_PLATFORMS]
+    ai_statuses = [name for name, _ in BULK_AI_STATUSES]
+    size = config.page_size
+
+    def deep_page(rng: random.Random, pages: int) -> int:
+        return rng.randint(1, max(1, min(pages, config.max_page)))
+
+    def date_range(rng: random.Random) -> dict[str, str]:
+        # 种子数据分布在过去一年内，取 1~30 天的随机窗口
+        end = app_now() - timedelta(days=rng.randint(0, 330))
+        start = end - timedelta(days=rng.randint(1, 30))
+        return {"date_from": start.isoformat(), "date_to": end.isoformat()}
+
+    def contents_first_page(rng: random.Random) -> RequestSpec:
+        return "/api/contents", {"page": 1, "page_size": size}
+
+    def contents_deep_page(rng: random.Random) -> RequestSpec:
+        return "/api/contents", {"page": deep_page(rng, dataset.content_pages), "page_size": size}
+
+    def contents_keyword(rng: random.Random) -> RequestSpec:
+        return "/api/contents", {"page": rng.randint(1, 3), "page_size": size, "keyword": rng.choice(dataset.keywords)}
+
+    def contents_filtered(rng: random.Random) -> RequestSpec:
+        params: dict[str, Any] = {"page": rng.randint(1, 5), "page_size": size, "platform": rng.choice(platforms)}
+        if rng.random() < 0.5:
+            params["ai_status"] = rng.choice(ai_statuses)
+        return "/api/contents", params
+
+    def logs_page(rng: random.Random) -> RequestSpec:
+        return "/api/logs", {"page": deep_page(rng, dataset.log_pages), "page_size": size}
+
+    def logs_filtered(rng: random.Random) -> RequestSpec:
+        params: dict[str, Any] = {"page": 1, "page_size": size}
+        choice = rng.random()
+        if choice < 0.3:
+            params["status"] = rng.choice(["success", "failed"])
+        elif choice < 0.6 and dataset.source_ids:
+            params["source_id"] = rng.choice(dataset.source_ids)
+        elif choice < 0.8:
+            params["keyword"] = rng.choice(dataset.keywords)
+        else:
+            params.update(date_range(rng))
+        return "/api/logs", params
+
+    def log_detail(rng: random.Random) -> RequestSpec:
+        return f"/api/logs/{rng.randint(1, max(1, dataset.max_log_id))}", {}
+
+    def dashboard_overview(rng: random.Random) -> RequestSpec:
+        return "/api/dashboard/overview", {}
+
+    def dashboard_token_usage(rng: random.Random) -> RequestSpec:
+        return "/api/dashboard/token-usage", {"days": rng.choice([7, 30, 90])}
+
+    builders = {
+        "contents_first_page": contents_first_page,
+        "contents_deep_page": contents_deep_page,
+        "contents_keyword": contents_keyword,
+        "contents_filtered": contents_filtered,
+        "logs_page": logs_page,
+        "logs_filtered": logs_filtered,
+        "log_detail": log_detail,
+        "dashboard_overview": dashboard_overview,
+        "dashboard_token_usage": dashboard_token_usage,
+    }
+    unknown = set(config.mix) - set(builders)
+    if unknown:
+        raise ValueError(f"unknown request kinds in mix: {sorted(unknown)}")
+    return {name: builders[name] for name, weight in config.mix.items() if weight > 0}
+
+
+async def _discover_dataset(client: httpx.AsyncClient, page_size: int) -> _Dataset:
+    """通过接口本身探测数据规模，进程内与远程两种模式共用。"""
+
+    async def fetch_page(path: str, size: int) -> dict:
+        response = await client.get(path, params={"page": 1, "page_size": size})
+        response.raise_for_status()
+        return response.json()["data"]
+
+    contents = await fetch_page("/api/contents", 1)
+    logs = await fetch_page("/api/logs", 1)
+    sources = await fetch_page("/api/sources", 100)
+    return _Dataset(
+        content_pages=max(1, -(-contents["meta"]["total"] // page_size)),
+        log_pages=max(1, -(-logs["meta"]["total"] // page_size)),
+        max_log_id=logs["items"][0]["id"] if logs["items"] else 0,
+        source_ids=[item["id"] for item in sources["items"]],
+        keywords=BULK_KEYWORDS,
+    )
+
+
+def _summarize_latencies(latencies: list[float], errors: int) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+async def run_load_test(config: LoadTestConfig, client: httpx.AsyncClient | None = None) -> dict[str, Any]:
+    """闭环压测：concurrency 个 worker 各自循环“选请求 → 发送 → 记录耗时”，直到时长或请求数用尽。"""
+    owns_client = client is None
+    if client is None:
+        if config.base_url:
+            client = httpx.AsyncClient(base_url=config.base_url, timeout=30.0)
+        else:
+            from main import app
+
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=30.0)
+
+    try:
+        dataset = await _discover_dataset(client, config.page_size)
+        builders = _build_requests(config, dataset)
+        names = list(builders)
+        weights = [config.mix[name] for name in names]
+
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: dict[str, int] = defaultdict(int)
+        status_codes: dict[int, int] = defaultdict(int)
+        remaining = config.requests
+        deadline = time.perf_counter() + config.duration
+
+        def has_budget() -> bool:
+            nonlocal remaining
+            if remaining is None:
+                return time.perf_counter() < deadline
+            if remaining <= 0:
+                return False
+            remaining -= 1
+            return True
+
+        async def worker(index: int) -> None:
+            rng = random.Random(config.seed + index)
+            while has_budget():
+                name = rng.choices(names, weights)[0]
+                path, params = builders[name](rng)
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path, params=params)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = 0
+                latencies[name].append((time.perf_counter() - started) * 1000)
+                status_codes[status] += 1
+                # 详情接口随机 ID 可能落在空洞上，404 不算错误
+                if status == 0 or status >= 500 or (status >= 400 and not (name == "log_detail" and status == 404)):
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(config.concurrency)))
+        elapsed = time.perf_counter() - started
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    total = sum(len(values) for values in latencies.values())
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "config": asdict(config),
+        "dataset": asdict(dataset) | {"keywords": len(dataset.keywords)},
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "scenarios": {
+            "read_api": {
+                "requests": total,
+                "errors": sum(errors.values()),
+                "wall_seconds": round(elapsed, 3),
+                "requests_per_second": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+                "overall": _summarize_latencies(all_latencies, sum(errors.values())),
+                "spans": {name: _summarize_latencies(latencies[name], errors[name]) for name in sorted(latencies)},
+            }
+        },
+    }
+
+
+def format_load_report(report: dict[str, Any]) -> str:
+    scenario = report["scenarios"]["read_api"]
+    dataset = report["dataset"]
+    lines = [
+        f"dataset: content_pages={dataset['content_pages']} log_pages={dataset['log_pages']} "
+        f"sources={len(dataset['source_ids'])}",
+        f"requests={scenario['requests']} errors={scenario['errors']} wall={scenario['wall_seconds']}s "
+        f"qps={scenario['requests_per_second']} status_codes={report['status_codes']}",
+        f"  {'endpoint':<24}{'count':>8}{'err':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+    ]
+    rows = [*scenario["spans"].items(), ("(all)", scenario["overall"])]
+    for name, stats in rows:
+        lines.append(
+            f"  {name:<24}{stats['count']:>8}{stats['errors']:>6}{stats['p50_ms']:>10}"
+            f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_api", description="读接口压测")
+    parser.add_argument("--base-url", help="压测已启动的服务；不填则进程内调用应用")
+    parser.add_argument("--duration", type=float, default=30.0, help="压测时长（秒）")
+    parser.add_argument("--requests", type=int, help="总请求数，指定后忽略 --duration")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发 worker 数")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--max-page", type=int, default=200, help="深分页的最大页码")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--only", action="append", choices=sorted(DEFAULT_MIX), help="只压测指定请求类型，可重复；默认按权重混合"
+    )
+    parser.add_argument("--json", dest="json_path", help="把完整报告写入 JSON 文件")
+    parser.add_argument("--baseline", help="与基线 JSON 报告对比，有退化时退出码为 1")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="允许的退化比例，默认 0.2（20%%）")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    mix = {name: DEFAULT_MIX[name] for name in args.only} if args.only else dict(DEFAULT_MIX)
+    config = LoadTestConfig(
+        duration=args.duration,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        page_size=args.page_size,
+        max_page=args.max_page,
+        seed=args.seed,
+        base_url=args.base_url,
+        mix=mix,
+    )
+    report = asyncio.run(run_load_test(config))
+    print(format_load_report(report))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        regressions = compare_reports(report, baseline, max_regression=args.max_regression)
+        if regressions:
+            print("\nregressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nno regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
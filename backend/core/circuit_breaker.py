@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断器处于打开状态，调用被快速拒绝。"""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"circuit_open: {name}")
+        self.name = name
+
+
+class CircuitBreaker:
+    """熔断器：closed -> (连续失败达到阈值) -> open -> (冷却结束) -> half_open -> closed/open。
+
+    - closed：正常放行，统计连续失败次数
+    - open：直接拒绝，避免每个监控源都去等上游超时
+    - half_open：冷却结束后只放行一个探测请求，成功则恢复，失败则重新打开
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 60.0) -> None:
+        self.name = name
+        self._failure_threshold = max(1, failure_threshold)
+        self._recovery_seconds = max(0.0, recovery_seconds)
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_inflight = False
+        self._probe_started_at = 0.0
+        self._total_failures = 0
+        self._total_rejected = 0
+        self._last_error: str | None = None
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._recovery_seconds:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """判断本次调用是否放行；半开状态下同一时刻只放行一个探测请求。"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        # 探测请求被取消等情况下不会回报结果，超过冷却时长后允许新的探测，避免永久卡在半开
+        probe_stale = now - self._probe_started_at >= self._recovery_seconds
+        if state == self.HALF_OPEN and (not self._probe_inflight or probe_stale):
+            self._state = self.HALF_OPEN
+            self._probe_inflight = True
+            self._probe_started_at = now
+            logger.info("circuit_half_open name=%s", self.name)
+            return True
+        self._total_rejected += 1
+        return False
+
+    def check(self) -> None:
+        """放行则返回，否则抛出 CircuitOpenError。"""
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info("circuit_closed name=%s", self.name)
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._probe_inflight = False
+
+    def record_failure(self, error: str | None = None) -> None:
+        self._consecutive_failures += 1
+        self._total_failures += 1
+        self._last_error = error
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(
+                    "circuit_opened name=%s failures=%s error=%s",
+                    self.name,
+                    self._consecutive_failures,
+                    error,
+                )
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        self._probe_inflight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        state = self.state
+        retry_in = 0.0
+        if self._state == self.OPEN and state == self.OPEN:
+            retry_in = max(0.0, self._recovery_seconds - (time.monotonic() - self._opened_at))
+        return {
+            "name": self.name,
+            "state": state,
+            "consecutive_failures": self._consecutive_failures,
+            "total_failures": self._total_failures,
+            "total_rejected": self._total_rejected,
+            "retry_in_seconds": round(retry_in, 1),
+            "last_error": self._last_error,
+        }
+
+
+class CircuitBreakerRegistry:
+    """按名称管理熔断器（每个上游一个，Webhook 按 URL 各一个），供 /health/circuits 展示。"""
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            settings = get_settings()
+            breaker = CircuitBreaker(
+                name=name,
+                failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                recovery_seconds=settings.CIRCUIT_RECOVERY_SECONDS,
+            )
+            self._breakers[name] = breaker
+        return breaker
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [breaker.snapshot() for _, breaker in sorted(self._breakers.items())]
+
+    def reset(self) -> None:
+        self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
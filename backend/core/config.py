@@ -23,6 +23,12 @@ class Settings(BaseSettings):
     # Demo 默认测试账号（来自官方文档示例）
     TWITTERAPI_IO_DEMO_USERNAME: str = "KaitoEasyAPI"
 
+    # TwitterAPI 响应短期缓存（秒）：相同时间线/查询在该时间内直接复用结果，0 表示只合并并发请求不缓存
+    TWITTERAPI_CACHE_TTL_SECONDS: float = 60.0
+
+    # TwitterAPI 响应缓存最大条目数（LRU 淘汰）
+    TWITTERAPI_CACHE_MAX_ENTRIES: int = 256
+
     # 关键字模式：仅保留最近 N 小时内的数据（默认 24 小时 = 1 天）
     KEYWORD_LOOKBACK_HOURS: int = 24
 
@@ -36,6 +42,9 @@ class Settings(BaseSettings):
     # 智谱 GLM Key（禁止硬编码，必须从 .env 读取）
     ZAI_API_KEY: str | None = None
 
+    # 智谱 API 基础地址，为空时使用 SDK 默认地址；压测时指向本地的模拟服务
+    ZAI_BASE_URL: str | None = None
+
     # 默认模型名，可按需切换
     GLM_MODEL: str = "glm-4.5-air"
 
@@ -45,9 +54,134 @@ class Settings(BaseSettings):
     # 超时/瞬时错误时的最大重试次数
     GLM_MAX_RETRIES: int = 2
 
+    # 流式输出：边接收边解析洞察行，响应中途断开时保留已完成的洞察而不是整批重试
+    GLM_STREAM_ENABLED: bool = False
+
+    # 请求对冲：单次调用超过近期 p95 耗时仍未返回时，再发一个相同请求，取先返回的结果（会增加少量调用量）
+    GLM_HEDGE_ENABLED: bool = False
+
+    # 请求对冲的触发分位数，以及开始对冲前至少需要的耗时样本数
+    GLM_HEDGE_QUANTILE: float = 0.95
+    GLM_HEDGE_MIN_SAMPLES: int = 20
+
     # 单次调用大模型时，最多打包多少条资讯做批量分析
     LLM_ANALYZE_BATCH_SIZE: int = 8
 
+    # 批量分析时单条资讯最多被请求的次数：输出漏掉的条目会并入下一批重试，超过次数后走兜底
+    LLM_ITEM_MAX_ATTEMPTS: int = 2
+
+    # 逐条分析的输出格式：markdown=Markdown 模板 + 正则解析（默认）；json=JSON 模式（结构化解析，失败时退回 Markdown）
+    # 切换会改变提示词指纹，开启历史回填时所有旧分析都会被视为过期并逐步重新分析
+    LLM_OUTPUT_MODE: str = "markdown"
+
+    # 历史分析回填：提示词模板或模型变化后，后台按热度/时间优先级逐步重新分析旧结果
+    ANALYSIS_BACKFILL_ENABLED: bool = False
+    ANALYSIS_BACKFILL_INTERVAL_MINUTES: int = 10
+    # 回填每小时最多消耗的 token 数（按调用日志中的实际用量统计，缺失时按提示词与响应长度估算），避免一次性全量重跑压垮 GLM
+    ANALYSIS_BACKFILL_TOKENS_PER_HOUR: int = 20000
+    # 单条资讯回填连续失败的最大次数：每次失败后按回填间隔指数退避，达到上限后不再自动回填（手动重新分析会清零）
+    ANALYSIS_BACKFILL_MAX_ATTEMPTS: int = 3
+
+    # 调度模式：daily=每天 08:30 全量执行；adaptive=按监控源产出动态调整抓取间隔
+    SCHEDULER_MODE: str = "daily"
+
+    # 自适应调度：巡检周期（秒），每次巡检只执行“到期”的监控源
+    ADAPTIVE_TICK_SECONDS: int = 60
+
+    # 自适应调度：新监控源的初始抓取间隔（分钟）
+    ADAPTIVE_BASE_INTERVAL_MINUTES: int = 180
+
+    # 自适应调度：抓取间隔的上下限（分钟），防止过密烧配额或过疏漏内容
+    ADAPTIVE_MIN_INTERVAL_MINUTES: int = 30
+    ADAPTIVE_MAX_INTERVAL_MINUTES: int = 1440
+
+    # 自适应调度：参考最近 N 次运行的产出
+    ADAPTIVE_HISTORY_SIZE: int = 5
+
+    # 自适应调度：期望每次运行的新增条数，高于该值缩短间隔，低于该值拉长间隔
+    ADAPTIVE_TARGET_NEW_ITEMS: int = 5
+
+    # 运行锁后端：database=基于 run_locks 表的租约锁（多副本部署）；memory=进程内锁（单进程/测试）
+    RUN_LOCK_BACKEND: str = "database"
+
+    # 运行锁租约时长（秒）：持有者崩溃后，最多等待该时长锁即可被其他进程接管
+    RUN_LOCK_TTL_SECONDS: int = 300
+
+    # 运行锁续约间隔（秒），需明显小于 RUN_LOCK_TTL_SECONDS
+    RUN_LOCK_HEARTBEAT_SECONDS: int = 60
+
+    # 是否在 API 进程内启动任务 worker（单进程部署保持 True；独立部署 `python worker.py` 时设为 False）
+    JOB_WORKER_EMBEDDED: bool = True
+
+    # worker 轮询任务队列的间隔（秒）
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+
+    # running 状态超过该时长（秒）未更新，视为 worker 已崩溃，任务重新入队
+    JOB_STALE_SECONDS: int = 1800
+
+    # 任务执行期间 worker 刷新心跳（updated_at）的间隔（秒），需明显小于 JOB_STALE_SECONDS
+    JOB_HEARTBEAT_SECONDS: int = 60
+
+    # 全量执行是否使用分阶段流水线（抓取/分析/推送并行重叠）；False 则逐个监控源顺序执行
+    PIPELINE_STAGED_ENABLED: bool = True
+
+    # 阶段间有界队列长度：控制同时在内存中等待下游处理的监控源数量（背压）
+    PIPELINE_STAGE_QUEUE_SIZE: int = 2
+
+    # 各阶段 worker 数量：抓取主要受 TwitterAPI 限速，分析受 GLM 并发与 SQLite 写锁影响
+    PIPELINE_CRAWL_CONCURRENCY: int = 4
+    PIPELINE_ANALYZE_CONCURRENCY: int = 2
+    PIPELINE_NOTIFY_CONCURRENCY: int = 2
+
+    # 运行检查点保留天数：记录各监控源完成到的阶段与抓取结果，用于断点续跑
+    PIPELINE_RUN_RETENTION_DAYS: int = 7
+
+    # 单次批处理的整体时间预算（秒）：超过后剩余的 AI 分析直接降级，0 表示不限制
+    PIPELINE_RUN_DEADLINE_SECONDS: int = 0
+
+    # 每日定时任务去重窗口（分钟）：窗口内已被其他进程/副本推送完成的监控源直接跳过，0 表示不去重
+    PIPELINE_DEDUP_WINDOW_MINUTES: int = 120
+
+    # 链路追踪导出：none=关闭；json=写入 TRACING_JSON_PATH（每行一个 Span）；otlp=发送到本地 OTLP/HTTP Collector
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSON_PATH: str = "logs/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://127.0.0.1:4318/v1/traces"
+    TRACING_SERVICE_NAME: str = "bin-ai-tech-aggregator"
+
+    # 熔断：同一上游（TwitterAPI / GLM / 每个 Webhook 地址）连续失败次数达到阈值后打开熔断，快速失败
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+
+    # 熔断打开后的冷却时间（秒），到期后放行一个探测请求，成功即恢复
+    CIRCUIT_RECOVERY_SECONDS: float = 60.0
+
+    # 事件循环监控：周期性心跳测量循环延迟，单个回调占用循环超过阈值时记录其调用栈
+    LOOP_MONITOR_ENABLED: bool = True
+
+    # 心跳间隔（秒），应明显小于阻塞阈值
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+
+    # 阻塞阈值（毫秒）：心跳超过该时长未推进即视为事件循环被阻塞
+    LOOP_BLOCK_THRESHOLD_MS: int = 200
+
+    # CPU 密集任务（推送渲染、大模型输出解析）的进程池大小，0 表示全部在事件循环线程内执行；
+    # 默认关闭，实测有收益后再开启
+    PROCESS_POOL_WORKERS: int = 0
+
+    # 单次渲染条目数达到该值才提交到进程池，数据量小时进程间序列化的开销大于收益
+    PROCESS_POOL_MIN_BATCH: int = 50
+
+    # 大模型返回文本长度（字符数）达到该值才把解析提交到进程池
+    PROCESS_POOL_MIN_PARSE_CHARS: int = 200000
+
+    # 列表/详情/看板接口的 HTTP 协商缓存：返回 ETag / Last-Modified，请求头 If-None-Match 命中时直接 304
+    HTTP_CACHE_ENABLED: bool = True
+
+    # 在线剖析接口 /internal/profile：默认关闭；开启后需在请求头 X-API-Key 中携带 API_KEY
+    PROFILING_ENABLED: bool = False
+
+    # 单次剖析的最长采样时长（秒）
+    PROFILING_MAX_SECONDS: int = 60
+
     # 应用统一时区（用于时间展示与应用侧写库时间）
     APP_TIMEZONE: str = "Asia/Shanghai"
 
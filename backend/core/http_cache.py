@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import func, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core.config import get_settings
+from core.metrics import CACHE_REQUESTS
+
+R = TypeVar("R", bound=Response)
+
+# 响应结构变化（字段增删、序列化方式调整）时递增，让浏览器里旧结构的缓存全部失效
+_ETAG_SCHEMA = "1"
+
+# private：只允许浏览器缓存；no-cache：每次使用前都带 If-None-Match 回源校验
+_CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class CacheValidator:
+    """一次请求的协商缓存结果；etag 为 None 表示未启用（不加响应头）。"""
+
+    etag: str | None = None
+    last_modified: datetime | None = None
+    not_modified: bool = False
+
+    def headers(self) -> dict[str, str]:
+        if self.etag is None:
+            return {}
+        headers = {"ETag": self.etag, "Cache-Control": _CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def not_modified_response(self) -> Response:
+        # 304 必须带上与 200 相同的 ETag / Cache-Control，浏览器据此刷新本地缓存的元数据
+        return Response(status_code=304, headers=self.headers())
+
+    def apply(self, response: R) -> R:
+        response.headers.update(self.headers())
+        return response
+
+
+def _to_utc(value: Any) -> datetime | None:
+    """与 to_app_tz 一致：无时区的时间按 UTC 处理。"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _leading_indexed(model: type, column: str) -> bool:
+    return any(index.columns.keys()[:1] == [column] for index in model.__table__.indexes)
+
+
+def _version_columns(model: type) -> tuple:
+    # 行数 + 最大主键捕获新增与删除（count(*) 可走最小的索引，比 count(id) 快得多）；
+    # 最大 updated_at 捕获更新。只追加写的表没有 updated_at，created_at 仅用于 Last-Modified，
+    # 没有索引时（如 push_log_items）不取，避免为一个响应头做全表扫描
+    timestamp = getattr(model, "updated_at", None)
+    if timestamp is None and _leading_indexed(model, "created_at"):
+        timestamp = model.created_at
+    return (
+        select(func.count()).select_from(model).scalar_subquery(),
+        select(func.max(model.id)).scalar_subquery(),
+        select(func.max(timestamp)).scalar_subquery() if timestamp is not None else null(),
+    )
+
+
+async def table_versions(session: AsyncSession, *models: type) -> list[tuple]:
+    """一次往返查出各表的 (行数, 最大 id, 最新修改时间)；时间列都有索引，开销远小于分页查询本身。"""
+    columns = [column for model in models for column in _version_columns(model)]
+    row = (await session.execute(select(*columns))).one()
+    return [tuple(row[index : index + 3]) for index in range(0, len(row), 3)]
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match 使用弱比较：忽略 W/ 前缀
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+async def validate(request: Request, session: AsyncSession, *models: type, extra: tuple = ()) -> CacheValidator:
+    """
+    在执行分页查询之前计算 ETag：各表版本 + 路径 + 查询参数（筛选条件/分页）+ extra（如看板依赖的“今天”）。
+    请求头 If-None-Match 命中时 not_modified 为 True，接口直接返回 not_modified_response()，不再查询数据。
+
+    只按 ETag 判定 304，不处理 If-Modified-Since：删除数据不会推进最新修改时间，仅凭时间判断会返回过期内容。
+    版本按整张表计算，表内任意一行变化都会让该表相关的所有筛选结果失效，宁可多回源也不返回过期数据。
+    """
+    if not get_settings().HTTP_CACHE_ENABLED:
+        return CacheValidator()
+
+    versions = await table_versions(session, *models)
+    material = repr(
+        (
+            _ETAG_SCHEMA,
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+            [(count, max_id, str(_to_utc(modified))) for count, max_id, modified in versions],
+            extra,
+        )
+    )
+    etag = f'W/"{hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]}"'
+    timestamps = [stamp for stamp in (_to_utc(modified) for _, _, modified in versions) if stamp is not None]
+    not_modified = _matches(request.headers.get("if-none-match"), etag)
+    if "if-none-match" in request.headers:
+        CACHE_REQUESTS.inc(cache="http", result="hit" if not_modified else "miss")
+    return CacheValidator(
+        etag=etag,
+        last_modified=max(timestamps).replace(microsecond=0) if timestamps else None,
+        not_modified=not_modified,
+    )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any
+from uuid import UUID
+
+from pydantic import AnyUrl, BaseModel
+from starlette.responses import JSONResponse
+
+# 可选依赖：安装了 orjson 时使用其 C 实现编码（比标准库快数倍），否则退回标准库 json
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(obj: Any) -> Any:
+    """两种编码器都无法直接处理的类型；输出与 pydantic model_dump(mode="json") 保持一致。"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, time)):
+        # pydantic 把 UTC 偏移写作 "Z"，标准库 isoformat 写作 "+00:00"
+        text = obj.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (AnyUrl, UUID, PurePath)):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    if orjson is not None:
+        # OPT_UTC_Z：UTC 时间输出 "Z" 后缀，与 pydantic 及上面的标准库分支一致
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    全局默认响应类：直接编码 datetime / Enum / pydantic 模型等对象，
+    配合 routers.common 中直接返回响应的 ok() / page()，跳过 FastAPI 的 jsonable_encoder 逐层转换。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
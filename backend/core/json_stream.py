@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+# 模型常把数组包在对象里返回（尤其是 json_object 模式），这些键下的列表视为条目数组
+_WRAPPER_KEYS = ("items", "insights", "results", "data")
+
+
+class JsonItemsStreamDecoder:
+    """宽容的增量 JSON 数组解码器：按片段喂入文本，每解析出一个完整的数组元素就立即产出。
+
+    - 忽略 JSON 前后的说明文字与 ```json 代码块标记
+    - 兼容 `[...]`、`{"items": [...]}`（包装键之前可以有其他键）与单个对象三种结构
+    - 对象按顶层键逐个解析，字符串中的 `[` / `{` 不会被误当作数组起点
+    - 输出被截断时，保留截断点之前已完整的元素，而不是整体解析失败
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        # seek：寻找 JSON 起点；object：逐个解析顶层对象的键值；array：逐个产出数组元素；done：结束
+        self._state = "seek"
+        self._object_start = 0
+        self.items: list[Any] = []
+
+    def feed(self, chunk: str) -> list[Any]:
+        self._buffer += chunk
+        produced: list[Any] = []
+        if self._state == "seek":
+            self._seek()
+        if self._state == "object":
+            produced.extend(self._scan_object())
+        if self._state == "array":
+            produced.extend(self._drain())
+        self.items.extend(produced)
+        return produced
+
+    def finish(self) -> list[Any]:
+        """流结束：未闭合的单个对象（被截断）无法确认内容，不产出。"""
+        self._state = "done"
+        return []
+
+    def _seek(self) -> None:
+        # 说明文字在 JSON 之外，其中的引号不构成字符串；第一个 { 或 [ 即 JSON 起点
+        candidates = [index for index in (self._buffer.find("{", self._pos), self._buffer.find("[", self._pos)) if index >= 0]
+        if not candidates:
+            self._pos = len(self._buffer)
+            return
+        start = min(candidates)
+        self._pos = start + 1
+        if self._buffer[start] == "[":
+            self._state = "array"
+        else:
+            self._state = "object"
+            self._object_start = start
+
+    def _skip_separators(self, pos: int) -> int:
+        buffer = self._buffer
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        return pos
+
+    def _scan_object(self) -> list[Any]:
+        """逐个跳过顶层键值；遇到值为数组的包装键即转入数组模式，对象闭合时整体作为单个条目。"""
+        buffer = self._buffer
+        while True:
+            pos = self._skip_separators(self._pos)
+            self._pos = pos
+            if pos >= len(buffer):
+                return []
+            if buffer[pos] == "}":
+                self._state = "done"
+                try:
+                    value, _ = self._decoder.raw_decode(buffer, self._object_start)
+                except ValueError:
+                    return []
+                return [value] if isinstance(value, dict) else []
+            try:
+                key, pos = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # 键尚未接收完整
+                return []
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(buffer):
+                return []
+            if buffer[pos] != ":":
+                self._state = "done"
+                return []
+            pos += 1
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(buffer):
+                return []
+            if key in _WRAPPER_KEYS and buffer[pos] == "[":
+                self._state = "array"
+                self._pos = pos + 1
+                return []
+            try:
+                _, pos = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # 值尚未接收完整：下次从该键重新解析
+                return []
+            self._pos = pos
+
+    def _drain(self) -> list[Any]:
+        produced: list[Any] = []
+        buffer = self._buffer
+        while True:
+            pos = self._skip_separators(self._pos)
+            self._pos = pos
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._state = "done"
+                break
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # 元素尚未接收完整（或已截断），等待更多数据
+                break
+            produced.append(value)
+            self._pos = end
+        return produced
+
+
+def decode_json_items(text: str) -> list[Any]:
+    """一次性解析：等价于喂入全部文本后结束。"""
+    decoder = JsonItemsStreamDecoder()
+    decoder.feed(text)
+    decoder.finish()
+    return decoder.items
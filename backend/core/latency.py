@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class LatencyWindow:
+    """滑动窗口耗时统计：保留最近 N 次调用耗时，用于估算 p95 等分位数（如请求对冲的触发时机）。"""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=max(1, size))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(max(0.0, seconds))
+
+    def quantile(self, q: float) -> float | None:
+        """最近近似分位数（nearest-rank）；无样本时返回 None。"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = min(len(ordered), max(1, math.ceil(q * len(ordered))))
+        return ordered[rank - 1]
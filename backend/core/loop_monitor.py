@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from core.config import get_settings
+from core.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG_SECONDS
+from core.timezone import app_now
+
+logger = logging.getLogger(__name__)
+
+# backend 根目录：定位阻塞点时优先取该目录下（而非标准库/第三方）最内层的栈帧
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class LoopBlock:
+    """
+    一次事件循环阻塞：where 为阻塞时最内层的业务代码位置。
+    完整调用栈只写入 event_loop_blocked 日志，不保留在快照里，避免经由 /health/loop 暴露代码路径与局部细节。
+    """
+
+    started_at: str
+    where: str
+    # 事件循环恢复调度时的心跳延迟（阻塞时长的下限）；仍在阻塞中为 None
+    duration_ms: float | None = None
+
+
+def _in_backend(filename: str) -> bool:
+    return filename.startswith(_BACKEND_ROOT + os.sep) and filename != __file__
+
+
+def _locate(frame: Any) -> str:
+    """返回最内层业务代码栈帧的位置；栈上没有业务代码时退化为最内层栈帧。"""
+    fallback: str | None = None
+    while frame is not None:
+        code = frame.f_code
+        if _in_backend(code.co_filename):
+            return f"{code.co_name} ({os.path.relpath(code.co_filename, _BACKEND_ROOT)}:{frame.f_lineno})"
+        fallback = fallback or f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+class LoopMonitor:
+    """
+    事件循环延迟与阻塞监控。
+
+    - 心跳：在事件循环里每 interval 秒调度一次回调，实际触发时间与预期之差即循环延迟，写入直方图
+    - 看门狗线程：心跳超过 threshold 未推进，说明当前回调占住了循环，立即抓取事件循环线程的调用栈并记录日志
+      （此时阻塞仍在进行，抓到的正是阻塞代码本身）；心跳恢复后补记阻塞时长
+
+    阻塞时长超过 threshold + interval 时必定被捕获，因此 interval 应明显小于 threshold。
+    心跳与看门狗都只读时间戳与栈帧，开销可忽略，适合常驻生产环境。
+    """
+
+    def __init__(self, history_size: int = 50) -> None:
+        self._interval = 0.1
+        self._threshold = 0.2
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._last_tick = 0.0
+        self._current_block: LoopBlock | None = None
+        self._lock = threading.Lock()
+        self._recent: deque[LoopBlock] = deque(maxlen=history_size)
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._blocked_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    def start(self, interval: float = 0.1, threshold_ms: float = 200.0) -> None:
+        """在事件循环线程中调用。"""
+        self.stop()
+        self._interval = max(0.01, interval)
+        self._threshold = max(0.01, threshold_ms / 1000)
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._handle = self._loop.call_later(self._interval, self._tick)
+        self._stop_event = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def start_from_settings(self) -> None:
+        settings = get_settings()
+        if not settings.LOOP_MONITOR_ENABLED:
+            return
+        self.start(
+            interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+            threshold_ms=settings.LOOP_BLOCK_THRESHOLD_MS,
+        )
+        logger.info(
+            "loop_monitor_started interval=%ss threshold=%sms",
+            settings.LOOP_MONITOR_INTERVAL_SECONDS,
+            settings.LOOP_BLOCK_THRESHOLD_MS,
+        )
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._stop_event.set()
+        if self._watchdog is not None and self._watchdog is not threading.current_thread():
+            self._watchdog.join(timeout=1.0)
+        self._watchdog = None
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        lag = max(0.0, now - self._last_tick - self._interval)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        with self._lock:
+            self._last_tick = now
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+            block, self._current_block = self._current_block, None
+        if block is not None:
+            block.duration_ms = round(lag * 1000, 1)
+            logger.warning("event_loop_unblocked duration_ms=%s where=%s", block.duration_ms, block.where)
+        if self._loop is not None and self._handle is not None:
+            self._handle = self._loop.call_later(self._interval, self._tick)
+
+    def _watch(self) -> None:
+        check_every = min(self._interval, self._threshold) / 2
+        while not self._stop_event.wait(check_every):
+            with self._lock:
+                stalled = time.monotonic() - self._last_tick - self._interval
+                if stalled < self._threshold or self._current_block is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id) if self._loop_thread_id else None
+                block = LoopBlock(started_at=app_now().isoformat(), where=_locate(frame))
+                stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+                self._current_block = block
+                self._recent.append(block)
+                self._blocked_count += 1
+            EVENT_LOOP_BLOCKED.inc()
+            logger.warning(
+                "event_loop_blocked threshold_ms=%s where=%s\n%s",
+                round(self._threshold * 1000),
+                block.where,
+                stack,
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "interval_seconds": self._interval,
+                "threshold_ms": round(self._threshold * 1000, 1),
+                "lag_ms": round(self._last_lag * 1000, 1),
+                "max_lag_ms": round(self._max_lag * 1000, 1),
+                "blocked_count": self._blocked_count,
+                "recent_blocks": [asdict(block) for block in reversed(self._recent)],
+            }
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from core.config import get_settings
+from core.metrics import PROCESS_POOL_TASKS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ProcessPool:
+    """
+    CPU 密集纯函数的执行入口：数据量小时在当前线程直接执行，超过阈值才提交到进程池，
+    让早间全量运行的 Markdown 渲染、大模型输出解析用上多核，不占住事件循环。
+
+    - 提交的函数必须是模块级函数，参数与返回值必须可 pickle（dataclass / pydantic 模型 / 基本类型）
+    - 使用 spawn 启动子进程：API 进程里已有调度器、看门狗等线程，fork 可能继承到被占用的锁
+    - 进程池在第一次需要时才创建；子进程异常退出（BrokenProcessPool）时本次改为就地执行，下次重建进程池
+    """
+
+    def __init__(self) -> None:
+        self._workers = 0
+        self._min_batch = 50
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._workers > 0
+
+    def configure(self, workers: int, min_batch: int = 50) -> None:
+        self.shutdown()
+        self._workers = max(0, workers)
+        self._min_batch = max(1, min_batch)
+
+    def configure_from_settings(self) -> None:
+        settings = get_settings()
+        self.configure(settings.PROCESS_POOL_WORKERS, settings.PROCESS_POOL_MIN_BATCH)
+        if self.enabled:
+            logger.info("process_pool_enabled workers=%s min_batch=%s", self._workers, self._min_batch)
+
+    def should_offload(self, size: int, min_size: int | None = None) -> bool:
+        return self.enabled and size >= (self._min_batch if min_size is None else min_size)
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        size: int,
+        min_size: int | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        size 为本次处理的数据量，用于判断是否值得付出进程间序列化的开销；
+        默认按条目数与 PROCESS_POOL_MIN_BATCH 比较，按其它口径（如文本长度）计量时用 min_size 指定阈值。
+        """
+        task = getattr(func, "__name__", "unknown")
+        if not self.should_offload(size, min_size):
+            PROCESS_POOL_TASKS.inc(task=task, mode="inline")
+            return func(*args, **kwargs)
+
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        except BrokenProcessPool:
+            logger.warning("process_pool_broken task=%s fallback=inline", task, exc_info=True)
+            self._discard(executor)
+            PROCESS_POOL_TASKS.inc(task=task, mode="fallback")
+            return func(*args, **kwargs)
+        PROCESS_POOL_TASKS.inc(task=task, mode="pool")
+        return result
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+process_pool = ProcessPool()
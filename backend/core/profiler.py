@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any
+
+# backend 根目录：该目录下的文件用相对路径展示，其余（标准库/第三方）只保留最后两级
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_BACKEND_ROOT + os.sep):
+        return os.path.relpath(filename, _BACKEND_ROOT)
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+
+def _frame_label(code_name: str, filename: str, lineno: int | None) -> str:
+    # 折叠栈格式用 ';' 分隔栈帧、最后一个空格分隔计数，标签中不能出现 ';'
+    return f"{code_name} ({_short_path(filename)}:{lineno})".replace(";", ":")
+
+
+def _fold_frame(frame: FrameType | None) -> list[str]:
+    """把线程栈转成从外到内的帧标签列表。"""
+    labels: list[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code.co_name, frame.f_code.co_filename, frame.f_lineno))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _coroutine_stack(coro: Any) -> list[str]:
+    """沿 cr_await 链展开协程的挂起位置（从外到内），得到 Task 当前在等什么。"""
+    labels: list[str] = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame.f_code.co_name, frame.f_code.co_filename, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return labels
+
+
+def format_folded(stacks: Counter[str]) -> str:
+    """输出折叠栈文本（flamegraph.pl / speedscope / inferno 均可直接读取）。"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+@dataclass
+class ProfileResult:
+    seconds: float
+    interval_ms: float
+    samples: int = 0
+    # 线程栈采样：折叠栈 -> 命中次数
+    cpu: Counter[str] = field(default_factory=Counter)
+    # asyncio Task 等待栈采样：折叠栈 -> 命中次数（按墙钟时间反映各 Task 卡在哪里）
+    tasks: Counter[str] = field(default_factory=Counter)
+    task_samples: int = 0
+    # 结束时的 Task 快照
+    task_dump: list[dict[str, Any]] = field(default_factory=list)
+    # tracemalloc：折叠分配栈 -> 采样窗口内新分配且仍存活的字节数
+    memory: Counter[str] = field(default_factory=Counter)
+    top_allocations: list[dict[str, Any]] = field(default_factory=list)
+    memory_traced: bool = False
+
+    def folded(self, kind: str = "cpu") -> str:
+        return format_folded({"cpu": self.cpu, "tasks": self.tasks, "memory": self.memory}[kind])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "seconds": self.seconds,
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "task_samples": self.task_samples,
+            "cpu_folded": self.folded("cpu"),
+            "tasks_folded": self.folded("tasks"),
+            "task_dump": self.task_dump,
+            "memory": {
+                "traced": self.memory_traced,
+                "folded": self.folded("memory"),
+                "top": self.top_allocations,
+            },
+        }
+
+
+class _StackSampler(threading.Thread):
+    """后台采样线程：按固定间隔读取 sys._current_frames()，只读不改，不会阻塞事件循环。"""
+
+    def __init__(self, thread_ids: set[int] | None, interval: float) -> None:
+        super().__init__(name="profiler-sampler", daemon=True)
+        self._thread_ids = thread_ids
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self._interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self._thread_ids is not None and thread_id not in self._thread_ids):
+                    continue
+                labels = _fold_frame(frame)
+                if self._thread_ids is None:
+                    labels.insert(0, f"thread:{names.get(thread_id, thread_id)}")
+                self.stacks[";".join(labels)] += 1
+            self.samples += 1
+
+
+class Profiler:
+    """
+    运行中进程的按需剖析：在 seconds 秒内同时做三件事
+    - 线程栈统计采样（默认只采事件循环所在线程；all_threads=True 时采全部线程并以线程名作为根帧）
+    - asyncio Task 等待栈采样（在事件循环内周期执行，反映各 Task 的墙钟耗时分布），结束时附带 Task 快照
+    - tracemalloc 分配统计（仅统计窗口内新分配且仍存活的内存；进程已开启 tracemalloc 时沿用不关闭）
+
+    同一时间只允许一个剖析任务，避免叠加开销；调用方需在事件循环线程中 await run()。
+    """
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def run(
+        self,
+        seconds: float,
+        interval_ms: float = 10.0,
+        task_interval_ms: float = 100.0,
+        all_threads: bool = False,
+        memory: bool = True,
+        memory_frames: int = 16,
+        top: int = 20,
+    ) -> ProfileResult:
+        async with self._lock:
+            return await self._run(seconds, interval_ms, task_interval_ms, all_threads, memory, memory_frames, top)
+
+    async def _run(
+        self,
+        seconds: float,
+        interval_ms: float,
+        task_interval_ms: float,
+        all_threads: bool,
+        memory: bool,
+        memory_frames: int,
+        top: int,
+    ) -> ProfileResult:
+        result = ProfileResult(seconds=seconds, interval_ms=interval_ms)
+        started_tracemalloc = False
+        baseline: tracemalloc.Snapshot | None = None
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(max(1, memory_frames))
+                started_tracemalloc = True
+            else:
+                baseline = tracemalloc.take_snapshot()
+
+        current = asyncio.current_task()
+        sampler = _StackSampler(None if all_threads else {threading.get_ident()}, interval_ms / 1000)
+        sampler.start()
+        try:
+            deadline = time.monotonic() + seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(task_interval_ms / 1000, remaining))
+                for task in asyncio.all_tasks():
+                    if task is current or task.done():
+                        continue
+                    labels = _coroutine_stack(task.get_coro())
+                    if labels:
+                        result.tasks[";".join(labels)] += 1
+                result.task_samples += 1
+            snapshot = tracemalloc.take_snapshot() if memory and tracemalloc.is_tracing() else None
+        finally:
+            # 请求被取消时同样要停掉采样线程与 tracemalloc，避免开销残留在进程里
+            sampler.stop()
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+        await asyncio.to_thread(sampler.join)
+        result.cpu = sampler.stacks
+        result.samples = sampler.samples
+        result.task_dump = self._dump_tasks(exclude=current)
+        if snapshot is not None:
+            result.memory_traced = True
+            # 统计分配栈较耗 CPU，放到线程里做，事件循环仍可按 GIL 切换间隔继续调度
+            await asyncio.to_thread(self._collect_memory, result, snapshot, baseline, top)
+        return result
+
+    @staticmethod
+    def _dump_tasks(exclude: asyncio.Task | None) -> list[dict[str, Any]]:
+        tasks = []
+        for task in asyncio.all_tasks():
+            if task is exclude:
+                continue
+            coro = task.get_coro()
+            tasks.append(
+                {
+                    "name": task.get_name(),
+                    "coro": getattr(coro, "__qualname__", repr(coro)),
+                    "done": task.done(),
+                    "stack": _coroutine_stack(coro),
+                }
+            )
+        tasks.sort(key=lambda item: item["name"])
+        return tasks
+
+    @staticmethod
+    def _collect_memory(
+        result: ProfileResult,
+        snapshot: tracemalloc.Snapshot,
+        baseline: tracemalloc.Snapshot | None,
+        top: int,
+    ) -> None:
+        # 排除剖析器自身（采样线程、计数器等）的分配
+        exclude = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__, all_frames=True)]
+        snapshot = snapshot.filter_traces(exclude)
+        if baseline is not None:
+            stats = [
+                stat for stat in snapshot.compare_to(baseline.filter_traces(exclude), "traceback") if stat.size_diff > 0
+            ]
+            sizes = [(stat.traceback, stat.size_diff, stat.count_diff) for stat in stats]
+        else:
+            sizes = [(stat.traceback, stat.size, stat.count) for stat in snapshot.statistics("traceback")]
+
+        for traceback, size, _ in sizes:
+            # tracemalloc 不记录函数名，分配栈只用 文件:行号 作为帧标签（从外到内）
+            labels = [f"{_short_path(frame.filename)}:{frame.lineno}".replace(";", ":") for frame in traceback]
+            result.memory[";".join(labels)] += size
+
+        sizes.sort(key=lambda item: item[1], reverse=True)
+        result.top_allocations = [
+            {
+                "size_kb": round(size / 1024, 1),
+                "count": count,
+                "traceback": [f"{_short_path(frame.filename)}:{frame.lineno}" for frame in traceback],
+            }
+            for traceback, size, count in sizes[:top]
+        ]
+
+
+profiler = Profiler()
@@ -1,6 +1,21 @@
 from __future__ import annotations
 
+import time
 from contextvars import ContextVar
 
 
 request_id_ctx_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# 当前批处理运行 ID：定时任务/worker 没有 HTTP 请求，用它串联同一次运行的事件与日志
+run_id_ctx_var: ContextVar[str] = ContextVar("run_id", default="-")
+
+# 当前批处理的截止时间（time.monotonic() 时间点）：所有 LLM 调用共享同一个整体时间预算
+run_deadline_ctx_var: ContextVar[float | None] = ContextVar("run_deadline", default=None)
+
+
+def remaining_run_budget() -> float | None:
+    """本次运行剩余的时间预算（秒）；未设置截止时间时返回 None。"""
+    deadline = run_deadline_ctx_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from core.metrics import CACHE_REQUESTS
+
+
+class SingleFlight:
+    """请求合并（single-flight）+ 短 TTL 结果缓存。
+
+    - 同一个 key 的并发调用只真正执行一次，其余调用方共享同一个进行中的 Future
+    - 成功结果缓存 ttl_seconds 秒（0 表示只合并不缓存），异常不缓存
+    - 实际调用放在独立 Task 中执行，发起方被取消不会影响其他等待方
+
+    注意：缓存命中时多个调用方拿到的是同一个对象，调用方不应修改返回值。
+    """
+
+    def __init__(self, ttl_seconds: float = 0.0, max_entries: int = 256, name: str | None = None) -> None:
+        # 指定 name 时，命中/合并/未命中次数同时计入 cache_requests_total 指标
+        self._name = name
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._max_entries = max(1, max_entries)
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, value = cached
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                self._count("hit")
+                return value
+            self._cache.pop(key, None)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+            self._count("shared")
+        else:
+            self.misses += 1
+            self._count("miss")
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return await asyncio.shield(task)
+
+    def _count(self, result: str) -> None:
+        if self._name is not None:
+            CACHE_REQUESTS.inc(cache=self._name, result=result)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self._ttl_seconds <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self._ttl_seconds, task.result())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+import httpx
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """一次被追踪的操作（运行 / 监控源 / 阶段 / 外部调用 / DB 语句）。"""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException | str) -> None:
+        self.status = "error"
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """追踪关闭时返回的空 Span，调用方无需判断是否开启。"""
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def set_error(self, error: BaseException | str) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+# 当前 Span：asyncio.create_task 会复制当前上下文，子任务中创建的 Span 自动挂到父 Span 下
+current_span_ctx_var: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class JsonFileSpanExporter:
+    """每个 Span 一行 JSON，便于离线用 jq / pandas 分析。"""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: list[Span]) -> None:
+        with open(self._path, "a", encoding="utf-8") as fp:
+            for span in spans:
+                fp.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str))
+                fp.write("\n")
+
+    def shutdown(self) -> None:
+        return None
+
+
+class OtlpHttpSpanExporter:
+    """OTLP/HTTP（JSON 编码）导出到本地 Collector，如 http://127.0.0.1:4318/v1/traces。"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0) -> None:
+        self._endpoint = endpoint
+        self._service_name = service_name
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: list[Span]) -> None:
+        response = self._client.post(self._endpoint, json=self.encode(spans))
+        response.raise_for_status()
+
+    def encode(self, spans: list[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", self._service_name)]},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "bin-ai-tech-aggregator"},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def shutdown(self) -> None:
+        self._client.close()
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        encoded: dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+        # OTLP 状态码：1=OK，2=ERROR
+        "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id:
+        payload["parentSpanId"] = span.parent_id
+    return payload
+
+
+_TICK = object()
+
+
+class BatchSpanProcessor:
+    """后台线程批量导出：结束的 Span 先入队，攒够一批或到达间隔后再写文件/发 Collector，不阻塞事件循环。"""
+
+    def __init__(self, exporter: SpanExporter, max_batch: int = 256, flush_interval: float = 2.0) -> None:
+        self._exporter = exporter
+        self._max_batch = max(1, max_batch)
+        self._flush_interval = max(0.1, flush_interval)
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=10000)
+        self._dropped = 0
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            # 导出端跟不上时丢弃，追踪不能反过来拖慢业务
+            self._dropped += 1
+
+    def _run(self) -> None:
+        batch: list[Span] = []
+        deadline = time.monotonic() + self._flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = _TICK
+            if item is None:
+                # shutdown：导出剩余的 Span 后退出
+                if batch:
+                    self._export(batch)
+                return
+            if isinstance(item, Span):
+                batch.append(item)
+            if len(batch) >= self._max_batch or time.monotonic() >= deadline:
+                if batch:
+                    self._export(batch)
+                    batch = []
+                deadline = time.monotonic() + self._flush_interval
+
+    def _export(self, batch: list[Span]) -> None:
+        try:
+            self._exporter.export(batch)
+        except Exception:  # noqa: BLE001
+            logger.warning("trace_export_failed spans=%s", len(batch), exc_info=True)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=timeout)
+        self._exporter.shutdown()
+        if self._dropped:
+            logger.warning("trace_spans_dropped count=%s", self._dropped)
+
+
+class Tracer:
+    """轻量追踪器：用 contextvar 维护父子关系，未配置导出器时所有操作都是空操作。"""
+
+    def __init__(self) -> None:
+        self._processor: BatchSpanProcessor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._processor is not None
+
+    def configure(self, exporter: SpanExporter | None, flush_interval: float = 2.0) -> None:
+        self.shutdown()
+        if exporter is not None:
+            self._processor = BatchSpanProcessor(exporter, flush_interval=flush_interval)
+
+    def configure_from_settings(self) -> None:
+        """按 TRACING_EXPORTER 配置导出器：none（默认关闭）/ json / otlp。"""
+        settings = get_settings()
+        kind = settings.TRACING_EXPORTER.strip().lower()
+        if kind == "json":
+            self.configure(JsonFileSpanExporter(settings.TRACING_JSON_PATH))
+        elif kind == "otlp":
+            self.configure(OtlpHttpSpanExporter(settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME))
+        elif kind in ("", "none"):
+            self.configure(None)
+        else:
+            raise ValueError(f"unsupported_tracing_exporter: {settings.TRACING_EXPORTER}")
+        if self.enabled:
+            logger.info("tracing_enabled exporter=%s", kind)
+
+    def start_span(self, name: str, **attributes: Any) -> Span | None:
+        """手动开始一个 Span（事件回调等无法使用 with 的场景），需配对调用 end_span。"""
+        if self._processor is None:
+            return None
+        parent = current_span_ctx_var.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent is not None else None,
+            start_ns=time.time_ns(),
+            attributes={key: value for key, value in attributes.items() if value is not None},
+        )
+
+    def end_span(self, span: Span | None) -> None:
+        if span is None or span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if self._processor is not None:
+            self._processor.on_end(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        """创建子 Span 并设为当前 Span；异常会记录到 Span 后继续抛出。"""
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield NOOP_SPAN
+            return
+        token = current_span_ctx_var.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_error(exc)
+            raise
+        finally:
+            current_span_ctx_var.reset(token)
+            self.end_span(span)
+
+    def shutdown(self) -> None:
+        processor, self._processor = self._processor, None
+        if processor is not None:
+            processor.shutdown()
+
+
+def current_trace_id() -> str | None:
+    span = current_span_ctx_var.get()
+    return span.trace_id if span is not None else None
+
+
+tracer = Tracer()
@@ -1,5 +1,10 @@
 """数据库初始化工具。"""
 
+import logging
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
 from db.base import Base
 from db.session import engine
 
@@ -12,12 +17,18 @@ from models import (  # noqa: F401
     ContentItem,
     LLMCallLog,
     MonitorSource,
+    PipelineJob,
+    PipelineRun,
+    PipelineRunSource,
     PushChannel,
     PushLog,
     PushLogItem,
+    RunLock,
     SourceChannelBinding,
 )
 
+logger = logging.getLogger(__name__)
+
 
 async def init_db() -> None:
     """根据模型定义自动创建数据表（不存在才创建）。"""
@@ -27,3 +38,23 @@ async def init_db() -> None:
         # create_all: 类似 Hibernate 的 hbm2ddl.auto = update
         # 它会检查数据库，如果表不存在就创建，如果存在则跳过（不会修改现有表结构）
         await conn.run_sync(Base.metadata.create_all)
+        # create_all 不会给已有表加列：模型里新增的可空列在这里补齐（轻量迁移）
+        await conn.run_sync(_ensure_columns)
+
+
+def _ensure_columns(conn: Connection) -> None:
+    """给已存在的表补充模型中新增的可空列（ALTER TABLE ... ADD COLUMN）。"""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+            logger.info("db_column_added table=%s column=%s", table.name, column.name)
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
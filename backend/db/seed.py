@@ -1,9 +1,35 @@
-"""本地开发/测试用的初始化数据脚本（可重复执行）。"""
+"""本地开发/测试用的初始化数据脚本。
 
-from sqlalchemy import select
+- seed_db：少量演示数据（可重复执行）
+- seed_bulk：批量生成大规模的合成数据，用于读接口压测与查询优化（每次执行都会追加）
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import random
+import time
+import uuid
+from collections.abc import Callable
+from datetime import timedelta
+
+from sqlalchemy import func, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import ChannelPlatform, MonitorSource, PushChannel, PushLog, PushStatus, SourceType
+from core import app_now
+from models import (
+    ChannelPlatform,
+    ContentAIAnalysis,
+    ContentItem,
+    LLMCallLog,
+    MonitorSource,
+    PushChannel,
+    PushLog,
+    PushLogItem,
+    PushStatus,
+    SourceType,
+)
 
 
 async def _seed_sources(session: AsyncSession) -> dict[str, MonitorSource]:
@@ -103,3 +129,309 @@ async def seed_db(session: AsyncSession) -> None:
     await _seed_channels(session)
     await _seed_logs(session, source_map)
     await session.commit()
+
+
+# ---- 批量合成数据 ----
+
+# 正文里的技术关键词：压测脚本按这些词做 keyword 筛选，命中率约为 1/len
+BULK_KEYWORDS = (
+    "FastAPI",
+    "PyTorch",
+    "Rust",
+    "Kubernetes",
+    "Postgres",
+    "LLM",
+    "RAG",
+    "CUDA",
+    "WebGPU",
+    "SQLite",
+    "Agent",
+    "Vector",
+)
+# (平台, 权重)：大部分来自 twitter，少量其他平台用于 platform 筛选
+BULK_PLATFORMS = (("twitter", 85), ("hackernews", 10), ("reddit", 5))
+BULK_AI_STATUSES = (("success", 88), ("degraded", 7), ("failed", 5))
+
+_BULK_PHRASES = (
+    "releases a new version with",
+    "benchmarks show",
+    "a practical guide to",
+    "lessons learned from running",
+    "why we migrated to",
+    "deep dive into",
+    "open-sourced a tool for",
+    "cuts p99 latency with",
+)
+_BULK_TAILS = (
+    "in production",
+    "at scale",
+    "on a single GPU",
+    "without downtime",
+    "for small teams",
+    "with 40% less memory",
+)
+
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def _weighted_picker(choices: tuple[tuple[str, int], ...]) -> Callable[[random.Random], str]:
+    """预先算好累计权重，逐行生成时不再重复构造列表。"""
+    values = [value for value, _ in choices]
+    cum_weights = list(itertools.accumulate(weight for _, weight in choices))
+    return lambda rng: rng.choices(values, cum_weights=cum_weights)[0]
+
+
+_pick_platform = _weighted_picker(BULK_PLATFORMS)
+_pick_ai_status = _weighted_picker(BULK_AI_STATUSES)
+
+
+def _bulk_text(rng: random.Random) -> tuple[str, str]:
+    """返回 (正文, 主关键词)。"""
+    keyword = rng.choice(BULK_KEYWORDS)
+    other = rng.choice(BULK_KEYWORDS)
+    text_value = (
+        f"{keyword} {rng.choice(_BULK_PHRASES)} {other} {rng.choice(_BULK_TAILS)}. "
+        f"Thread #{rng.randint(1, 10**6)} covers setup, trade-offs and numbers."
+    )
+    return text_value, keyword
+
+
+async def _next_id(session: AsyncSession, column) -> int:
+    return int((await session.execute(select(func.coalesce(func.max(column), 0)))).scalar_one()) + 1
+
+
+async def _insert_batches(
+    session: AsyncSession,
+    table,
+    rows_factory: Callable[[int, int], list[dict]],
+    total: int,
+    batch_size: int,
+    label: str,
+    on_progress: ProgressCallback | None,
+) -> None:
+    """按批生成并插入（Core executemany，绕过 ORM 对象开销），每批提交一次。"""
+    for start in range(0, total, batch_size):
+        count = min(batch_size, total - start)
+        await session.execute(insert(table), rows_factory(start, count))
+        await session.commit()
+        if on_progress is not None:
+            on_progress(label, start + count, total)
+
+
+async def seed_bulk(
+    session: AsyncSession,
+    contents: int = 100_000,
+    logs: int = 10_000,
+    items_per_log: int = 5,
+    sources: int = 50,
+    analyzed_ratio: float = 0.8,
+    days: int = 365,
+    batch_size: int = 5_000,
+    seed: int = 42,
+    on_progress: ProgressCallback | None = None,
+) -> dict[str, int]:
+    """
+    批量生成合成数据：监控源、资讯 + AI 分析、推送日志 + 明细、大模型调用日志。
+
+    - 时间均匀分布在最近 days 天内，热度与评分带偏态，关键词/平台/状态按固定比例分布，便于压测时构造不同选择性的筛选
+    - 主键直接按当前最大 ID 递增分配，资讯与分析、日志与明细无需回查
+    - SQLite 下临时关闭 synchronous 以加快写入（进程崩溃时可能丢失最后几批，合成数据可接受）
+    - external_id 带本次运行的随机前缀，重复执行会追加而不会触发唯一约束
+    """
+    rng = random.Random(seed)
+    run_tag = uuid.uuid4().hex[:8]
+    now = app_now()
+    window_seconds = max(1, days) * 86400
+    stats = {"sources": 0, "contents": 0, "analyses": 0, "logs": 0, "log_items": 0, "llm_calls": 0}
+    started = time.perf_counter()
+
+    is_sqlite = session.bind is not None and session.bind.dialect.name == "sqlite"
+    if is_sqlite:
+        await session.execute(text("PRAGMA synchronous = OFF"))
+
+    try:
+        source_rows = [
+            MonitorSource(
+                type=SourceType.AUTHOR.value if index % 3 else SourceType.KEYWORD.value,
+                value=f"seed_{run_tag}_{index}",
+                is_active=index % 10 != 0,
+                remark="seed: bulk",
+            )
+            for index in range(max(1, sources))
+        ]
+        session.add_all(source_rows)
+        await session.commit()
+        source_ids = [source.id for source in source_rows]
+        stats["sources"] = len(source_ids)
+
+        content_start_id = await _next_id(session, ContentItem.id)
+        analysis_start_id = await _next_id(session, ContentAIAnalysis.id)
+
+        def _content_rows(offset: int, count: int) -> list[dict]:
+            rows = []
+            for index in range(offset, offset + count):
+                content_text, _ = _bulk_text(rng)
+                published_at = now - timedelta(seconds=rng.randrange(window_seconds))
+                author = f"author_{rng.randrange(5_000)}"
+                external_id = f"{run_tag}{index:09d}"
+                rows.append(
+                    {
+                        "id": content_start_id + index,
+                        "platform": _pick_platform(rng),
+                        "source_type": "author_timeline" if rng.random() < 0.6 else "tweet_advanced_search",
+                        "external_id": external_id,
+                        "author_name": author,
+                        "url": f"https://x.com/{author}/status/{external_id}",
+                        "title": None if rng.random() < 0.7 else f"[AI生成] {content_text[:40]}",
+                        "content_text": content_text,
+                        "content_hash": hashlib.sha256(content_text.encode("utf-8")).hexdigest(),
+                        "published_at": published_at,
+                        "raw_payload": None,
+                        # 热度偏态：大部分较低，少量爆款
+                        "hotness": min(100, int(rng.expovariate(1 / 15))),
+                        "created_at": published_at,
+                        "updated_at": published_at,
+                    }
+                )
+            return rows
+
+        await _insert_batches(
+            session, ContentItem.__table__, _content_rows, contents, batch_size, "contents", on_progress
+        )
+        stats["contents"] = contents
+
+        analyzed = int(contents * max(0.0, min(1.0, analyzed_ratio)))
+        # 已分析的资讯在 ID 区间内随机分布，未分析的散落其中（ai_status 筛选与 outerjoin 更接近真实分布）
+        analyzed_offsets = sorted(rng.sample(range(contents), analyzed)) if analyzed else []
+
+        def _analysis_rows(offset: int, count: int) -> list[dict]:
+            rows = []
+            for index in range(offset, offset + count):
+                status = _pick_ai_status(rng)
+                updated_at = now - timedelta(seconds=rng.randrange(window_seconds))
+                rows.append(
+                    {
+                        "id": analysis_start_id + index,
+                        "content_item_id": content_start_id + analyzed_offsets[index],
+                        "model": "glm-4.5-air",
+                        "ai_score": max(0, min(100, int(rng.gauss(62, 15)))),
+                        "summary": f"合成分析 {rng.choice(BULK_KEYWORDS)}：给出了可落地的工程实践与取舍。",
+                        # 合成数据不回查正文，分析的 content_hash 留空（读接口不使用该字段）
+                        "content_hash": "",
+                        "prompt_fingerprint": None,
+                        "prompt_text": None,
+                        "response_text": None,
+                        "status": status,
+                        "failure_reason": None if status == "success" else "seed_simulated",
+                        "created_at": updated_at,
+                        "updated_at": updated_at,
+                    }
+                )
+            return rows
+
+        await _insert_batches(
+            session,
+            ContentAIAnalysis.__table__,
+            _analysis_rows,
+            analyzed,
+            batch_size,
+            "analyses",
+            on_progress,
+        )
+        stats["analyses"] = analyzed
+
+        log_start_id = await _next_id(session, PushLog.id)
+        log_times = sorted(
+            (now - timedelta(seconds=rng.randrange(window_seconds)) for _ in range(logs)),
+        )
+
+        def _log_rows(offset: int, count: int) -> list[dict]:
+            rows = []
+            for index in range(offset, offset + count):
+                content_text, keyword = _bulk_text(rng)
+                rows.append(
+                    {
+                        "id": log_start_id + index,
+                        "source_id": rng.choice(source_ids),
+                        "raw_content": content_text,
+                        "ai_summary": f"- **核心点**: {keyword} 相关动态 {rng.randint(1, 10**6)}。",
+                        "status": PushStatus.SUCCESS if rng.random() < 0.92 else PushStatus.FAILED,
+                        # 按时间排序分配 ID，与真实写入顺序一致（列表按 id 倒序即按时间倒序）
+                        "created_at": log_times[index],
+                    }
+                )
+            return rows
+
+        await _insert_batches(session, PushLog.__table__, _log_rows, logs, batch_size, "logs", on_progress)
+        stats["logs"] = logs
+
+        log_item_batch = max(1, batch_size // max(1, items_per_log))
+
+        def _log_item_rows(offset: int, count: int) -> list[dict]:
+            rows = []
+            for index in range(offset, offset + count):
+                for position in range(items_per_log):
+                    content_text, _ = _bulk_text(rng)
+                    author = f"author_{rng.randrange(5_000)}"
+                    tweet_id = f"{run_tag}{index:09d}{position:02d}"
+                    rows.append(
+                        {
+                            "push_log_id": log_start_id + index,
+                            "tweet_id": tweet_id,
+                            "source": "author_timeline",
+                            "author_username": author,
+                            "url": f"https://x.com/{author}/status/{tweet_id}",
+                            "text": content_text,
+                            "hotness": min(100, int(rng.expovariate(1 / 15))),
+                            "ai_score": max(0, min(100, int(rng.gauss(62, 15)))),
+                            "created_at": log_times[index],
+                        }
+                    )
+            return rows
+
+        await _insert_batches(
+            session,
+            PushLogItem.__table__,
+            _log_item_rows,
+            logs if items_per_log > 0 else 0,
+            log_item_batch,
+            "log_items",
+            on_progress,
+        )
+        stats["log_items"] = logs * max(0, items_per_log)
+
+        def _llm_call_rows(offset: int, count: int) -> list[dict]:
+            rows = []
+            for index in range(offset, offset + count):
+                prompt_tokens = rng.randint(800, 4_000)
+                completion_tokens = rng.randint(150, 900)
+                rows.append(
+                    {
+                        "source_id": rng.choice(source_ids),
+                        "push_log_id": log_start_id + index,
+                        "model": "glm-4.5-air",
+                        "prompt_text": "seed",
+                        "response_text": None,
+                        "status": "success" if rng.random() < 0.95 else "failed",
+                        "error_message": None,
+                        "call_type": "reanalyze",
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                        "latency_ms": int(rng.lognormvariate(7.3, 0.4)),
+                        "created_at": log_times[index],
+                    }
+                )
+            return rows
+
+        # 每条推送日志对应一次大模型调用
+        await _insert_batches(
+            session, LLMCallLog.__table__, _llm_call_rows, logs, batch_size, "llm_calls", on_progress
+        )
+        stats["llm_calls"] = logs
+    finally:
+        if is_sqlite:
+            await session.execute(text("PRAGMA synchronous = FULL"))
+
+    stats["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+    return stats
@@ -1,11 +1,16 @@
 """数据库异步连接与会话管理。"""
 
+import time
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import event
+
 # 导入 SQLAlchemy 的异步模块
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from core import get_settings
+from core.metrics import DB_QUERY_SECONDS
+from core.tracing import current_span_ctx_var, tracer
 
 settings = get_settings()
 
@@ -19,6 +24,48 @@ engine: AsyncEngine = create_async_engine(
     future=True, # 使用 SQLAlchemy 2.0 的新特性
 )
 
+
+# 语句耗时指标与追踪：异步引擎底层仍是同步的 Engine，事件挂在 sync_engine 上
+# （SQLAlchemy 的 greenlet 桥接会沿用调用方的 contextvars，DB Span 能挂到当前阶段 Span 下）
+_QUERY_OPERATIONS = ("select", "insert", "update", "delete")
+
+
+def _query_operation(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return verb if verb in _QUERY_OPERATIONS else "other"
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = None
+    # 只在已有追踪上下文（运行/请求）时记录 DB Span，避免产生大量孤立的根 Span
+    if tracer.enabled and current_span_ctx_var.get() is not None:
+        span = tracer.start_span("db.query", operation=_query_operation(statement), statement=statement[:200])
+    conn.info.setdefault("query_started_at", []).append((time.perf_counter(), span))
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_stack = conn.info.get("query_started_at")
+    if not started_stack:
+        return
+    started, span = started_stack.pop()
+    DB_QUERY_SECONDS.observe(time.perf_counter() - started, operation=_query_operation(statement))
+    tracer.end_span(span)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    started_stack = conn.info.get("query_started_at") if conn is not None else None
+    if not started_stack:
+        return
+    _, span = started_stack.pop()
+    if span is not None:
+        span.set_error(exception_context.original_exception)
+        tracer.end_span(span)
+
+
 # 2. 创建会话工厂 (SessionMaker)
 # 用于生成数据库会话 (Session)
 # expire_on_commit=False: 提交后不立即可用，防止异步环境下对象属性过早失效
@@ -1,5 +1,6 @@
 from contextlib import asynccontextmanager
 import logging
+import time
 import uuid
 from typing import AsyncIterator
 
@@ -7,14 +8,18 @@ from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
-from starlette.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
 # 导入配置加载函数
 from core import get_settings, setup_logging
+from core.json_response import FastJSONResponse
+from core.loop_monitor import loop_monitor
+from core.metrics import HTTP_REQUEST_SECONDS
+from core.process_pool import process_pool
 from core.request_context import request_id_ctx_var
+from core.tracing import tracer
 from db.init_db import init_db
 from db.session import SessionLocal
 from models import PushChannel
@@ -24,17 +29,22 @@ from routers import (
     dashboard_router,
     jobs_router,
     logs_router,
+    profiling_router,
     source_channel_bindings_router,
     sources_router,
     system_router,
 )
 from services import NotifyService, PipelineService, SchedulerService
+from services.job_queue_service import JobQueueService
+from services.job_worker import JobWorker
 
 logger = logging.getLogger(__name__)
 
 pipeline_service = PipelineService()
 scheduler_service = SchedulerService(pipeline_service=pipeline_service)
 notify_service = NotifyService()
+job_worker = JobWorker(pipeline_service=pipeline_service)
+job_queue = JobQueueService()
 
 
 class RequestIdMiddleware(BaseHTTPMiddleware):
@@ -49,6 +59,35 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
             request_id_ctx_var.reset(token)
 
 
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """按路由模板（如 /api/contents/{content_id}/analyze）统计请求耗时，避免按真实路径产生海量标签。
+
+    开启链路追踪时同时创建请求级根 Span，并通过 x-trace-id 响应头返回 trace_id。
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        started = time.perf_counter()
+        status = "500"
+        with tracer.span("http.request", method=request.method) as span:
+            try:
+                response = await call_next(request)
+                status = str(response.status_code)
+                if span.trace_id is not None:
+                    response.headers["x-trace-id"] = span.trace_id
+                return response
+            finally:
+                route = request.scope.get("route")
+                route_path = getattr(route, "path", None) or "unmatched"
+                span.set_attribute("http.route", route_path)
+                span.set_attribute("http.status_code", int(status))
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - started,
+                    method=request.method,
+                    route=route_path,
+                    status=status,
+                )
+
+
 async def validate_no_duplicate_webhooks() -> None:
     """
     启动校验：禁止重复 webhook_url。
@@ -86,22 +125,33 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     # 在应用启动时，先加载并校验配置
     # 如果 .env 文件缺少必要的配置，这里会直接报错停止启动，避免运行时出错
     setup_logging()
-    get_settings()
+    settings = get_settings()
+    tracer.configure_from_settings()
+    loop_monitor.start_from_settings()
+    process_pool.configure_from_settings()
     await init_db()
     await validate_no_duplicate_webhooks()
     scheduler_service.start()
+    # 单进程部署时在 API 进程内消费任务队列；独立部署 worker.py 时关闭
+    if settings.JOB_WORKER_EMBEDDED:
+        job_worker.start()
     logger.info("application_started")
     
     yield  # 这里的 yield 是分界线，上面是启动代码，下面是关闭代码
     
     # --- 关闭阶段 (Shutdown) ---
     # 如果有数据库连接池关闭、Redis 断开等操作，写在这里
+    await job_worker.stop()
     await scheduler_service.shutdown()
+    process_pool.shutdown()
+    loop_monitor.stop()
+    tracer.shutdown()
     logger.info("application_shutdown")
 
 # 初始化 FastAPI 应用
 # lifespan 参数指定了上面的生命周期管理器
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(RequestIdMiddleware)
 
 
@@ -113,42 +163,40 @@ app.include_router(contents_router)
 app.include_router(logs_router)
 app.include_router(jobs_router)
 app.include_router(dashboard_router)
+app.include_router(profiling_router)
 
 
 @app.exception_handler(HTTPException)
-async def http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse:
-    return JSONResponse(
+async def http_exception_handler(_: Request, exc: HTTPException) -> FastJSONResponse:
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={"code": exc.status_code, "message": str(exc.detail), "data": None},
     )
 
 
 @app.exception_handler(RequestValidationError)
-async def validation_exception_handler(_: Request, exc: RequestValidationError) -> JSONResponse:
-    return JSONResponse(
+async def validation_exception_handler(_: Request, exc: RequestValidationError) -> FastJSONResponse:
+    return FastJSONResponse(
         status_code=422,
         content={"code": 422, "message": "validation_error", "data": exc.errors()},
     )
 
 
 @app.exception_handler(Exception)
-async def unhandled_exception_handler(_: Request, exc: Exception) -> JSONResponse:
+async def unhandled_exception_handler(_: Request, exc: Exception) -> FastJSONResponse:
     logger.exception("unhandled_exception", exc_info=exc)
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={"code": 500, "message": "internal_server_error", "data": None},
     )
 
 
 @app.post("/internal/jobs/run-now")
-async def run_now() -> dict[str, int]:
-    """3.13 手动触发入口（内部调试接口）。"""
-    result = await pipeline_service.trigger_run_now()
-    return {
-        "total_sources": result.total_sources,
-        "success_count": result.success_count,
-        "failed_count": result.failed_count,
-    }
+async def run_now() -> dict[str, str]:
+    """3.13 手动触发入口（内部调试接口）：与 POST /api/jobs/run-now 一样只入队，由 worker 执行。"""
+    async with SessionLocal() as session:
+        job = await job_queue.enqueue(session=session, kind="run_all")
+    return {"job_id": job.id, "status": "accepted"}
 
 
 @app.post("/internal/webhook/test")
@@ -3,9 +3,12 @@ from .content_item import ContentItem
 from .enums import ChannelPlatform, PushStatus, SourceType
 from .llm_call_log import LLMCallLog
 from .monitor_source import MonitorSource
+from .pipeline_job import PipelineJob
+from .pipeline_run import PipelineRun, PipelineRunSource
 from .push_channel import PushChannel
 from .push_log import PushLog
 from .push_log_item import PushLogItem
+from .run_lock import RunLock
 from .source_channel_binding import SourceChannelBinding
 
 __all__ = [
@@ -16,8 +19,12 @@ __all__ = [
     "ContentAIAnalysis",
     "LLMCallLog",
     "MonitorSource",
+    "PipelineJob",
+    "PipelineRun",
+    "PipelineRunSource",
     "PushChannel",
     "PushLog",
     "PushLogItem",
+    "RunLock",
     "SourceChannelBinding",
 ]
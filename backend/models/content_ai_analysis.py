@@ -18,6 +18,7 @@ class ContentAIAnalysis(Base):
         Index("idx_content_ai_analyses_content_item_id", "content_item_id", unique=True),
         Index("idx_content_ai_analyses_content_hash", "content_hash"),
         Index("idx_content_ai_analyses_updated_at", "updated_at"),
+        Index("idx_content_ai_analyses_prompt_fingerprint", "prompt_fingerprint"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -30,10 +31,15 @@ class ContentAIAnalysis(Base):
     ai_score: Mapped[int] = mapped_column(Integer, nullable=False)
     summary: Mapped[str] = mapped_column(Text, nullable=False)
     content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # 提示词模板 + 模型的指纹：与当前指纹不一致（或为空）的分析视为过期，由后台回填重新分析
+    prompt_fingerprint: Mapped[str | None] = mapped_column(String(32), nullable=True)
     prompt_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     response_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="success")
     failure_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # 后台回填连续失败次数与下次可重试时间：超过 ANALYSIS_BACKFILL_MAX_ATTEMPTS 后不再回填，写入新分析时清空
+    backfill_attempts: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    next_retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
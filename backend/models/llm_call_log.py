@@ -36,6 +36,13 @@ class LLMCallLog(Base):
     response_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # 调用类型：reanalyze（手动/批量重新分析）/ backfill（后台回填）
+    call_type: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # GLM 返回的实际用量（含重试与对冲请求）；旧数据或上游未返回 usage 时为空
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    total_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
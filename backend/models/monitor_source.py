@@ -1,6 +1,9 @@
-from sqlalchemy import Boolean, CheckConstraint, Index, Integer, String
+from datetime import datetime
+
+from sqlalchemy import Boolean, CheckConstraint, DateTime, Float, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
+from core import app_now
 from db.base import Base
 
 
@@ -38,3 +41,20 @@ class MonitorSource(Base):
     # Mapped[str | None]: 表示这个字段可能是字符串，也可能是 None (Java 的 null)
     # nullable=True: 允许数据库存 NULL
     remark: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # 最近修改时间：HTTP 协商缓存据此判断监控源列表是否变化
+    # 可空：已有数据库通过 init_db 的轻量迁移补列，旧行保持 NULL
+    # 新增与修改都由应用侧 app_now 写入（同一时钟、带微秒）：不用 func.now()，
+    # 否则 SQLite 的 CURRENT_TIMESTAMP（UTC、精确到秒）与 app_now 混存，max(updated_at) 失真
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        default=app_now,
+        onupdate=app_now,
+    )
+
+    # 自适应调度状态（AdaptivePollingService 读写）：最近一次运行完成时间、当前抓取间隔、最近 N 次 [新增条数, 平均热度]
+    # 存在数据库而非进程内存：重启后不会所有监控源同时到期，多个 worker / 副本看到同一份调度进度
+    last_polled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    poll_interval_minutes: Mapped[float | None] = mapped_column(Float, nullable=True)
+    poll_history: Mapped[str | None] = mapped_column(Text, nullable=True)
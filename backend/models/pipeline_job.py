@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class PipelineJob(Base):
+    """持久化任务队列：API 只负责入队与查询，独立 worker 进程领取并执行。"""
+
+    __tablename__ = "pipeline_jobs"
+    __table_args__ = (
+        CheckConstraint(
+            "status in ('queued', 'running', 'done', 'failed')",
+            name="ck_pipeline_jobs_status",
+        ),
+        Index("idx_pipeline_jobs_status_created_at", "status", "created_at"),
+        Index("idx_pipeline_jobs_updated_at", "updated_at"),
+    )
+
+    # 使用 UUID 字符串作为任务 ID，与旧版内存 job_id 格式保持一致
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # 任务类型，如 run_all（全量执行）
+    kind: Mapped[str] = mapped_column(String(32), nullable=False, default="run_all")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+    # 以下 JSON 字段统一用 Text 存储，兼容 SQLite
+    payload: Mapped[str | None] = mapped_column(Text, nullable=True)
+    progress: Mapped[str | None] = mapped_column(Text, nullable=True)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    worker_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class PipelineRun(Base):
+    """批处理运行记录：配合 pipeline_run_sources 做断点续跑。"""
+
+    __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        CheckConstraint(
+            "status in ('running', 'done', 'failed')",
+            name="ck_pipeline_runs_status",
+        ),
+        Index("idx_pipeline_runs_created_at", "created_at"),
+    )
+
+    # run_id：由 worker 执行时等于 job_id，定时任务则为随机 UUID
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="running")
+    # 断点续跑时记录来源 run_id，便于追溯
+    resumed_from: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class PipelineRunSource(Base):
+    """单次运行中每个监控源的阶段检查点：crawled -> persisted -> analyzed -> notified。"""
+
+    __tablename__ = "pipeline_run_sources"
+    __table_args__ = (
+        UniqueConstraint("run_id", "source_id", name="uq_pipeline_run_sources_run_source"),
+        CheckConstraint(
+            "stage in ('crawled', 'persisted', 'analyzed', 'notified', 'failed')",
+            name="ck_pipeline_run_sources_stage",
+        ),
+        Index("idx_pipeline_run_sources_run_id", "run_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("pipeline_runs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    source_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("monitor_sources.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    stage: Mapped[str] = mapped_column(String(20), nullable=False)
+    # 抓取+清洗+评分后的 CrawlItem 列表（JSON），续跑时直接复用，不再调用抓取 API
+    crawl_items: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class RunLock(Base):
+    """运行锁（租约）表：多副本/多 worker 部署时，保证同一任务同一时刻只有一个持有者。
+
+    时间字段统一存 UTC，持有者需在 expires_at 之前续约，否则锁可被其他进程抢占。
+    """
+
+    __tablename__ = "run_locks"
+    __table_args__ = (Index("idx_run_locks_expires_at", "expires_at"),)
+
+    # 锁名，如 pipeline:run_all / pipeline:source:1
+    name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(128), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
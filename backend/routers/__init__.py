@@ -3,6 +3,7 @@ from .contents import router as contents_router
 from .dashboard import router as dashboard_router
 from .jobs import router as jobs_router
 from .logs import router as logs_router
+from .profiling import router as profiling_router
 from .source_channel_bindings import router as source_channel_bindings_router
 from .sources import router as sources_router
 from .system import router as system_router
@@ -16,4 +17,5 @@ __all__ = [
     "jobs_router",
     "dashboard_router",
     "system_router",
+    "profiling_router",
 ]
@@ -7,14 +7,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.session import get_db
 from models import ChannelPlatform, PushChannel
-from routers.common import ok, page
+from routers.common import FastJSONResponse, ok, page
 from schemas import PushChannelCreate, PushChannelResponse, PushChannelUpdate
 
 router = APIRouter(prefix="/api/channels", tags=["channels"])
 
 
 @router.post("")
-async def create_channel(payload: PushChannelCreate, db: AsyncSession = Depends(get_db)) -> dict:
+async def create_channel(payload: PushChannelCreate, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     row = PushChannel(
         platform=payload.platform.value if isinstance(payload.platform, ChannelPlatform) else str(payload.platform),
         webhook_url=str(payload.webhook_url),
@@ -38,7 +38,7 @@ async def list_channels(
     platform: ChannelPlatform | None = None,
     is_active: bool | None = None,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> FastJSONResponse:
     stmt = select(PushChannel)
     count_stmt = select(func.count(PushChannel.id))
     if platform is not None:
@@ -56,7 +56,7 @@ async def list_channels(
 
 
 @router.put("/{channel_id}")
-async def update_channel(channel_id: int, payload: PushChannelUpdate, db: AsyncSession = Depends(get_db)) -> dict:
+async def update_channel(channel_id: int, payload: PushChannelUpdate, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     row = await db.get(PushChannel, channel_id)
     if row is None:
         raise HTTPException(status_code=404, detail="channel_not_found")
@@ -81,7 +81,7 @@ async def update_channel(channel_id: int, payload: PushChannelUpdate, db: AsyncS
 
 
 @router.delete("/{channel_id}")
-async def delete_channel(channel_id: int, db: AsyncSession = Depends(get_db)) -> dict:
+async def delete_channel(channel_id: int, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     row = await db.get(PushChannel, channel_id)
     if row is None:
         return ok({"deleted": False, "reason": "channel_not_found"})
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+from core.json_response import FastJSONResponse
+
 
 # 定义通用 API 响应包装函数
 # 类似 Java 中的 R.ok(data) 或 Result.success(data)
-def ok(data=None, message: str = "ok") -> dict:
-    return {"code": 0, "message": message, "data": data}
+# 直接返回响应对象：FastAPI 对 Response 不再做 response_model 校验与 jsonable_encoder 转换，
+# data 中的 datetime / Enum 等由 FastJSONResponse 编码
+def ok(data=None, message: str = "ok") -> FastJSONResponse:
+    return FastJSONResponse({"code": 0, "message": message, "data": data})
 
 
 # 定义分页响应包装函数
 # 类似 Java 中的 PageResult<T>
-def page(items: list, total: int, page_no: int, page_size: int) -> dict:
+def page(items: list, total: int, page_no: int, page_size: int) -> FastJSONResponse:
     return ok(
         data={
             "items": items,
@@ -1,49 +1,43 @@
 from __future__ import annotations
 
-import hashlib
-
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core import app_now
+from core import http_cache
 from db.session import get_db
-from models import ContentAIAnalysis, ContentItem, LLMCallLog, PushLog, PushLogItem
-from routers.common import ok, page
-from schemas import CrawlItem, LLMInsightItem
-from schemas.content import ContentAnalysisInfo, ContentListItem
+from models import ContentAIAnalysis, ContentItem
+from routers.common import FastJSONResponse, ok, page
+from schemas.content import ContentBulkAnalyzeRequest
+from services.content_analysis_service import ContentAnalysisService
+from services.job_queue_service import JobQueueService
 from services.llm_service import LLMService
 
 router = APIRouter(prefix="/api/contents", tags=["contents"])
 _llm_service = LLMService()
+_analysis_service = ContentAnalysisService(llm_service=_llm_service)
+_job_queue = JobQueueService()
 
 
 @router.get("")
 async def list_contents(
+    request: Request,
     page_no: int = Query(default=1, alias="page", ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     keyword: str | None = None,
     platform: str | None = None,
     ai_status: str | None = None,
     db: AsyncSession = Depends(get_db),
-) -> dict:
-    conditions = []
-    if keyword:
-        like = f"%{keyword.strip()}%"
-        conditions.append(
-            or_(
-                ContentItem.title.like(like),
-                ContentItem.content_text.like(like),
-                ContentItem.author_name.like(like),
-                ContentAIAnalysis.summary.like(like),
-            )
-        )
-    if platform:
-        conditions.append(ContentItem.platform == platform.strip())
-    if ai_status:
-        conditions.append(ContentAIAnalysis.status == ai_status.strip())
+) -> Response:
+    # 数据未变化时直接 304，跳过下面的 count + 分页查询
+    cache = await http_cache.validate(request, db, ContentItem, ContentAIAnalysis)
+    if cache.not_modified:
+        return cache.not_modified_response()
 
-    stmt = select(ContentItem, ContentAIAnalysis).outerjoin(
+    conditions = _build_list_conditions(keyword=keyword, platform=platform, ai_status=ai_status)
+
+    # 只查询列表需要的列：不加载 raw_payload / prompt_text / response_text 等大字段，也不构造 ORM 对象
+    stmt = select(*_CONTENT_LIST_COLUMNS, *_ANALYSIS_LIST_COLUMNS).outerjoin(
         ContentAIAnalysis,
         ContentAIAnalysis.content_item_id == ContentItem.id,
     )
@@ -62,39 +56,45 @@ async def list_contents(
     )
     rows = (await db.execute(stmt)).all()
 
-    items = [_serialize_content_item(content_item=content_item, analysis=analysis) for content_item, analysis in rows]
+    items = [_serialize_content_row(row) for row in rows]
+
+    return cache.apply(page(items=items, total=total, page_no=page_no, page_size=page_size))
+
+
+@router.post("/analyze")
+async def bulk_analyze_contents(payload: ContentBulkAnalyzeRequest, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
+    """批量重新分析：按 ID 列表或列表筛选条件选出资讯，入队后台任务，返回 job_id 供查询进度。"""
+    if payload.content_ids:
+        stmt = select(ContentItem.id).where(ContentItem.id.in_(payload.content_ids))
+    else:
+        stmt = select(ContentItem.id).outerjoin(
+            ContentAIAnalysis,
+            ContentAIAnalysis.content_item_id == ContentItem.id,
+        )
+        conditions = _build_list_conditions(
+            keyword=payload.keyword,
+            platform=payload.platform,
+            ai_status=payload.ai_status,
+        )
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+    stmt = stmt.order_by(ContentItem.published_at.desc(), ContentItem.id.desc()).limit(payload.limit)
+    content_ids = [int(row[0]) for row in (await db.execute(stmt)).all()]
+    if not content_ids:
+        return ok({"job_id": None, "status": "empty", "total": 0}, message="no_matched_contents")
 
-    return page(items=items, total=total, page_no=page_no, page_size=page_size)
+    job = await _job_queue.enqueue(session=db, kind="content_reanalyze", payload={"content_ids": content_ids})
+    return ok({"job_id": job.id, "status": "accepted", "total": len(content_ids)}, message="accepted")
 
 
 @router.post("/{content_id}/analyze")
-async def analyze_content(content_id: int, db: AsyncSession = Depends(get_db)) -> dict:
+async def analyze_content(content_id: int, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     content_item = await db.get(ContentItem, content_id)
     if content_item is None:
         raise HTTPException(status_code=404, detail="content_not_found")
 
-    crawl_item = CrawlItem(
-        source=content_item.source_type,
-        tweet_id=content_item.external_id,
-        author_username=content_item.author_name or "",
-        url=content_item.url,
-        text=content_item.content_text,
-        published_at=content_item.published_at,
-        hotness=content_item.hotness,
-        raw_payload={},
-    )
-
-    batch_result = await _llm_service.analyze_items([crawl_item])
-    insight_map = {insight.tweet_id: insight for insight in batch_result.insights}
-    insight = insight_map.get(content_item.external_id)
-    if insight is None:
-        insight = _build_fallback_insight(crawl_item=crawl_item)
-        status = "failed"
-        failure_reason = batch_result.failure_reason or "missing_item_in_batch_output"
-    else:
-        status = batch_result.status
-        failure_reason = batch_result.failure_reason
-
+    await _analysis_service.analyze_contents(session=db, content_items=[content_item], record_batch_status=True)
+    await db.refresh(content_item)
     analysis_row = (
         (
             await db.execute(
@@ -106,142 +106,97 @@ async def analyze_content(content_id: int, db: AsyncSession = Depends(get_db)) -
         .scalars()
         .first()
     )
-    content_hash = _compute_source_text_hash(content_item.content_text)
-    now = app_now()
-
-    if analysis_row is None:
-        analysis_row = ContentAIAnalysis(
-            content_item_id=content_item.id,
-            model=batch_result.model or "unknown",
-            ai_score=insight.ai_score,
-            summary=insight.summary,
-            content_hash=content_hash,
-            prompt_text=batch_result.prompt_text,
-            response_text=batch_result.raw_response_text,
-            status=status,
-            failure_reason=failure_reason,
-            created_at=now,
-            updated_at=now,
-        )
-        db.add(analysis_row)
-    else:
-        analysis_row.model = batch_result.model or "unknown"
-        analysis_row.ai_score = insight.ai_score
-        analysis_row.summary = insight.summary
-        analysis_row.content_hash = content_hash
-        analysis_row.prompt_text = batch_result.prompt_text
-        analysis_row.response_text = batch_result.raw_response_text
-        analysis_row.status = status
-        analysis_row.failure_reason = failure_reason
-        analysis_row.updated_at = now
-
-    _apply_ai_generated_title_if_missing(content_item=content_item, insight=insight)
-    source_id = await _resolve_source_id_for_content(db=db, content_item=content_item)
-    if source_id is not None:
-        db.add(
-            LLMCallLog(
-                source_id=source_id,
-                push_log_id=None,
-                model=batch_result.model or "unknown",
-                prompt_text=batch_result.prompt_text or "",
-                response_text=batch_result.raw_response_text,
-                status=status,
-                error_message=failure_reason,
-                created_at=now,
-            )
-        )
-    content_item.updated_at = now
-    await db.commit()
-    await db.refresh(content_item)
-    await db.refresh(analysis_row)
 
     return ok(_serialize_content_item(content_item=content_item, analysis=analysis_row))
 
 
-def _serialize_content_item(content_item: ContentItem, analysis: ContentAIAnalysis | None) -> dict:
+def _build_list_conditions(keyword: str | None, platform: str | None, ai_status: str | None) -> list:
+    """列表查询与批量重分析共用的筛选条件（需 outerjoin ContentAIAnalysis）。"""
+    conditions = []
+    if keyword:
+        like = f"%{keyword.strip()}%"
+        conditions.append(
+            or_(
+                ContentItem.title.like(like),
+                ContentItem.content_text.like(like),
+                ContentItem.author_name.like(like),
+                ContentAIAnalysis.summary.like(like),
+            )
+        )
+    if platform:
+        conditions.append(ContentItem.platform == platform.strip())
+    if ai_status:
+        conditions.append(ContentAIAnalysis.status == ai_status.strip())
+    return conditions
+
+
+_CONTENT_LIST_COLUMNS = (
+    ContentItem.id,
+    ContentItem.platform,
+    ContentItem.source_type,
+    ContentItem.external_id,
+    ContentItem.author_name,
+    ContentItem.url,
+    ContentItem.title,
+    ContentItem.content_text,
+    ContentItem.hotness,
+    ContentItem.published_at,
+    ContentItem.created_at,
+)
+_ANALYSIS_LIST_COLUMNS = (
+    ContentAIAnalysis.id.label("ai_id"),
+    ContentAIAnalysis.status.label("ai_status"),
+    ContentAIAnalysis.ai_score.label("ai_score"),
+    ContentAIAnalysis.summary.label("ai_summary"),
+    ContentAIAnalysis.model.label("ai_model"),
+    ContentAIAnalysis.updated_at.label("ai_updated_at"),
+    ContentAIAnalysis.failure_reason.label("ai_failure_reason"),
+)
+
+
+# 序列化直接构造 dict（字段与 ContentListItem / ContentAnalysisInfo 一致），
+# datetime 交给 FastJSONResponse 编码，列表页不再逐行创建 pydantic 模型
+def _content_dict(item, ai_data: dict | None) -> dict:
+    """item 为 ContentItem 或按 _CONTENT_LIST_COLUMNS 查询的行，两者属性名相同。"""
+    return {
+        "id": item.id,
+        "platform": item.platform,
+        "source_type": item.source_type,
+        "external_id": item.external_id,
+        "author_name": item.author_name,
+        "url": item.url,
+        "title": item.title,
+        "content_text": item.content_text,
+        "hotness": item.hotness,
+        "published_at": item.published_at,
+        "created_at": item.created_at,
+        "ai": ai_data,
+    }
+
+
+def _serialize_content_row(row) -> dict:
     ai_data = None
-    if analysis is not None:
-        ai_data = ContentAnalysisInfo(
-            status=analysis.status,
-            ai_score=analysis.ai_score,
-            summary=analysis.summary,
-            model=analysis.model,
-            updated_at=analysis.updated_at,
-            failure_reason=analysis.failure_reason,
-        ).model_dump(mode="json")
-
-    return ContentListItem(
-        id=content_item.id,
-        platform=content_item.platform,
-        source_type=content_item.source_type,
-        external_id=content_item.external_id,
-        author_name=content_item.author_name,
-        url=content_item.url,
-        title=content_item.title,
-        content_text=content_item.content_text,
-        hotness=content_item.hotness,
-        published_at=content_item.published_at,
-        created_at=content_item.created_at,
-        ai=ai_data,
-    ).model_dump(mode="json")
-
-
-def _build_fallback_insight(crawl_item: CrawlItem) -> LLMInsightItem:
-    hotness = crawl_item.hotness or 0
-    score = max(10, min(100, round(hotness)))
-    summary = " ".join((crawl_item.text or "").split()).strip()
-    if not summary:
-        summary = "原文为空，建议人工复核。"
-    if len(summary) > 120:
-        summary = f"{summary[:120]}..."
-    return LLMInsightItem(
-        tweet_id=crawl_item.tweet_id,
-        ai_score=score,
-        summary=summary,
-        ai_title=None,
-    )
+    if row.ai_id is not None:
+        ai_data = {
+            "status": row.ai_status,
+            "ai_score": row.ai_score,
+            "summary": row.ai_summary,
+            "model": row.ai_model,
+            "updated_at": row.ai_updated_at,
+            "failure_reason": row.ai_failure_reason,
+        }
+    return _content_dict(row, ai_data)
 
 
-def _apply_ai_generated_title_if_missing(content_item: ContentItem, insight: LLMInsightItem) -> None:
-    if content_item.title and content_item.title.strip():
-        return
-
-    candidate = (insight.ai_title or "").strip()
-    if not candidate:
-        candidate = _build_title_from_summary(insight.summary)
-    if not candidate:
-        return
-    content_item.title = f"[AI生成] {candidate}"[:512]
-
-
-def _build_title_from_summary(summary: str) -> str:
-    text = " ".join((summary or "").replace("\n", " ").split()).strip()
-    if not text:
-        return ""
-    for sep in ("。", "！", "？", ".", "!", "?"):
-        if sep in text:
-            text = text.split(sep, 1)[0].strip()
-            break
-    if len(text) > 28:
-        text = f"{text[:28]}..."
-    return text
-
-
-def _compute_source_text_hash(text: str) -> str:
-    normalized = " ".join((text or "").split()).strip()
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
-
-
-async def _resolve_source_id_for_content(db: AsyncSession, content_item: ContentItem) -> int | None:
-    stmt = (
-        select(PushLog.source_id)
-        .select_from(PushLogItem)
-        .join(PushLog, PushLog.id == PushLogItem.push_log_id)
-        .where(PushLogItem.tweet_id == content_item.external_id)
-        .order_by(PushLog.created_at.desc())
-        .limit(1)
-    )
-    row = (await db.execute(stmt)).first()
-    if row is None:
-        return None
-    return int(row[0])
+def _serialize_content_item(content_item: ContentItem, analysis: ContentAIAnalysis | None) -> dict:
+    ai_data = None
+    if analysis is not None:
+        ai_data = {
+            "status": analysis.status,
+            "ai_score": analysis.ai_score,
+            "summary": analysis.summary,
+            "model": analysis.model,
+            "updated_at": analysis.updated_at,
+            "failure_reason": analysis.failure_reason,
+        }
+    return _content_dict(content_item, ai_data)
@@ -1,23 +1,50 @@
 from __future__ import annotations
 
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core import app_now
+from core import app_now, http_cache
 from db.session import get_db
-from models import PushLog, PushLogItem, PushStatus
+from models import LLMCallLog, MonitorSource, PushLog, PushLogItem, PushStatus
 from routers.common import ok
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+# 上游未返回 usage（旧数据）时，按每条资讯的平均消耗粗估
+_TOKENS_PER_ITEM_ESTIMATE = 700
+
+
+def _usage_columns():
+    return (
+        func.count(LLMCallLog.id),
+        func.coalesce(func.sum(LLMCallLog.prompt_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.completion_tokens), 0),
+        func.coalesce(func.sum(LLMCallLog.total_tokens), 0),
+        func.avg(LLMCallLog.latency_ms),
+    )
+
+
+def _usage_dict(calls: int, prompt: int, completion: int, total: int, avg_latency: float | None) -> dict:
+    return {
+        "calls": int(calls),
+        "prompt_tokens": int(prompt),
+        "completion_tokens": int(completion),
+        "total_tokens": int(total),
+        "avg_latency_ms": round(float(avg_latency)) if avg_latency is not None else None,
+    }
+
 
 @router.get("/overview")
-async def overview(db: AsyncSession = Depends(get_db)) -> dict:
+async def overview(request: Request, db: AsyncSession = Depends(get_db)) -> Response:
     now = app_now()
     today_start = datetime.combine(now.date(), time.min, tzinfo=now.tzinfo)
+    # 统计口径是“今天”：日期也计入 ETag，跨天后即使没有新数据也重新计算
+    cache = await http_cache.validate(request, db, PushLog, PushLogItem, LLMCallLog, extra=(now.date().isoformat(),))
+    if cache.not_modified:
+        return cache.not_modified_response()
 
     total_runs_today = int(
         (await db.execute(select(func.count(PushLog.id)).where(PushLog.created_at >= today_start))).scalar_one()
@@ -51,15 +78,67 @@ async def overview(db: AsyncSession = Depends(get_db)) -> dict:
         .first()
     )
     latest_status = latest_log.status.value if latest_log else "none"
-    llm_tokens_estimate = items_today * 700
+    usage_today = _usage_dict(
+        *(await db.execute(select(*_usage_columns()).where(LLMCallLog.created_at >= today_start))).one()
+    )
+    # 有实际用量时直接使用；今天还没有带 usage 的调用记录时退回按条目量粗估
+    token_estimate = usage_today["total_tokens"] or items_today * _TOKENS_PER_ITEM_ESTIMATE
 
-    return ok(
+    response = ok(
         {
             "today_fetch_count": items_today,
             "today_run_count": total_runs_today,
             "today_success_count": success_runs_today,
             "latest_run_status": latest_status,
             "latest_run_at": latest_log.created_at.isoformat() if latest_log else None,
-            "token_estimate": llm_tokens_estimate,
+            "token_estimate": token_estimate,
+            "token_usage_today": usage_today,
+        }
+    )
+    return cache.apply(response)
+
+
+@router.get("/token-usage")
+async def token_usage(
+    request: Request,
+    days: int = Query(default=7, ge=1, le=90),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """最近 days 天（含今天）的大模型用量：按天、按监控源汇总调用次数、token 与平均耗时。"""
+    now = app_now()
+    start = datetime.combine(now.date() - timedelta(days=days - 1), time.min, tzinfo=now.tzinfo)
+    cache = await http_cache.validate(request, db, LLMCallLog, MonitorSource, extra=(now.date().isoformat(),))
+    if cache.not_modified:
+        return cache.not_modified_response()
+
+    day_expr = func.date(LLMCallLog.created_at)
+
+    daily_rows = (
+        await db.execute(
+            select(day_expr, *_usage_columns())
+            .where(LLMCallLog.created_at >= start)
+            .group_by(day_expr)
+            .order_by(day_expr)
+        )
+    ).all()
+    source_rows = (
+        await db.execute(
+            select(LLMCallLog.source_id, MonitorSource.type, MonitorSource.value, *_usage_columns())
+            .join(MonitorSource, MonitorSource.id == LLMCallLog.source_id)
+            .where(LLMCallLog.created_at >= start)
+            .group_by(LLMCallLog.source_id, MonitorSource.type, MonitorSource.value)
+            .order_by(func.coalesce(func.sum(LLMCallLog.total_tokens), 0).desc())
+        )
+    ).all()
+
+    response = ok(
+        {
+            "days": days,
+            "daily": [{"date": str(day), **_usage_dict(*usage)} for day, *usage in daily_rows],
+            "sources": [
+                {"source_id": source_id, "source_type": source_type, "source_value": source_value, **_usage_dict(*usage)}
+                for source_id, source_type, source_value, *usage in source_rows
+            ],
         }
     )
+    return cache.apply(response)
@@ -1,75 +1,115 @@
 from __future__ import annotations
 
 import asyncio
-import logging
-import time
-import uuid
+import json
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
 
-from routers.common import ok
-from services import PipelineService
+from db.session import SessionLocal, get_db
+from routers.common import FastJSONResponse, ok
+from services.job_queue_service import JobQueueService
+from services.run_checkpoint_service import RunCheckpointService
+from services.run_event_bus import RunEvent, RunEventBus, run_event_bus
 
-logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
-_pipeline_service = PipelineService()
-_job_state: dict[str, dict] = {}
-_JOB_STATE_MAX_SIZE = 500
-_JOB_STATE_TTL_SECONDS = 24 * 3600
+# API 只负责入队与查询状态，真正执行由 worker（独立进程或嵌入式）完成。
+_job_queue = JobQueueService()
+_checkpoints = RunCheckpointService()
 
+# SSE 心跳间隔（秒）：同时用于兜底查询任务终态（worker 在其他进程时收不到进程内事件）
+_SSE_KEEPALIVE_SECONDS = 5.0
+_TERMINAL_JOB_STATUSES = ("done", "failed")
 
-def _cleanup_job_state() -> None:
-    now = time.time()
-    expired_ids = []
-    for job_id, state in _job_state.items():
-        updated_at = float(state.get("updated_at", now))
-        if now - updated_at > _JOB_STATE_TTL_SECONDS:
-            expired_ids.append(job_id)
 
-    for job_id in expired_ids:
-        _job_state.pop(job_id, None)
+@router.post("/run-now")
+async def run_now(resume_run_id: str | None = None, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
+    """立即执行；传入 resume_run_id（即之前的 job_id）时从该次运行的检查点续跑。"""
+    payload = {"resume_run_id": resume_run_id} if resume_run_id else None
+    job = await _job_queue.enqueue(session=db, kind="run_all", payload=payload)
+    return ok({"job_id": job.id, "status": "accepted"}, message="accepted")
+
+
+@router.get("/runs/{run_id}")
+async def run_checkpoints(run_id: str, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
+    """查询某次运行各监控源完成到的阶段（crawled/persisted/analyzed/notified）。"""
+    run = await _checkpoints.describe_run(session=db, run_id=run_id)
+    if run is None:
+        return ok({"run_id": run_id, "status": "not_found"})
+    return ok(run)
+
+
+@router.get("/run-now/{job_id}")
+async def run_now_status(job_id: str, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
+    job = await _job_queue.get(session=db, job_id=job_id)
+    if job is None:
+        return ok({"job_id": job_id, "status": "not_found"})
+    return ok(_job_queue.to_dict(job))
 
-    if len(_job_state) <= _JOB_STATE_MAX_SIZE:
-        return
-    overflow = len(_job_state) - _JOB_STATE_MAX_SIZE
-    oldest_ids = sorted(_job_state.keys(), key=lambda key: float(_job_state[key].get("updated_at", now)))[:overflow]
-    for job_id in oldest_ids:
-        _job_state.pop(job_id, None)
 
+@router.get("/run-now/{job_id}/events")
+async def run_now_events(job_id: str, request: Request, db: AsyncSession = Depends(get_db)) -> StreamingResponse:
+    """
+    SSE 实时进度：推送每个监控源的阶段事件（crawled/cleaned/analyzed/notified ...），
+    任务结束时推送 job_status 事件并关闭连接，前端无需再轮询状态接口。
+    """
+    job = await _job_queue.get(session=db, job_id=job_id)
+    if job is None:
+        initial_state = {"job_id": job_id, "status": "not_found"}
+    else:
+        initial_state = _job_queue.to_dict(job)
 
-async def _run_job(job_id: str) -> None:
+    return StreamingResponse(
+        _stream_job_events(job_id=job_id, request=request, initial_state=initial_state),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_job_events(
+    job_id: str,
+    request: Request,
+    initial_state: dict,
+    bus: RunEventBus = run_event_bus,
+) -> AsyncIterator[str]:
+    yield _format_sse("job_status", initial_state)
+    if initial_state["status"] in (*_TERMINAL_JOB_STATUSES, "not_found"):
+        return
+
+    queue = bus.subscribe(job_id)
     try:
-        result = await _pipeline_service.trigger_run_now()
-        _job_state[job_id] = {
-            "status": "done",
-            "updated_at": time.time(),
-            "result": {
-                "total_sources": result.total_sources,
-                "success_count": result.success_count,
-                "failed_count": result.failed_count,
-            },
-        }
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("run_now_job_failed job_id=%s", job_id)
-        _job_state[job_id] = {"status": "failed", "error": str(exc), "updated_at": time.time()}
+        while True:
+            if await request.is_disconnected():
+                return
+            try:
+                event: RunEvent = await asyncio.wait_for(queue.get(), timeout=_SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                state = await _load_job_state(job_id)
+                if state is not None and state["status"] in _TERMINAL_JOB_STATUSES:
+                    yield _format_sse("job_status", state)
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            yield _format_sse(event.stage, event.to_dict())
+            if event.stage in RunEventBus.TERMINAL_STAGES:
+                state = await _load_job_state(job_id)
+                if state is not None:
+                    yield _format_sse("job_status", state)
+                return
     finally:
-        _cleanup_job_state()
+        bus.unsubscribe(job_id, queue)
 
 
-@router.post("/run-now")
-async def run_now() -> dict:
-    _cleanup_job_state()
-    job_id = str(uuid.uuid4())
-    _job_state[job_id] = {"status": "running", "updated_at": time.time()}
-    asyncio.create_task(_run_job(job_id))
-    return ok({"job_id": job_id, "status": "accepted"}, message="accepted")
+async def _load_job_state(job_id: str) -> dict | None:
+    async with SessionLocal() as session:
+        job = await _job_queue.get(session=session, job_id=job_id)
+        return _job_queue.to_dict(job) if job is not None else None
 
 
-@router.get("/run-now/{job_id}")
-async def run_now_status(job_id: str) -> dict:
-    _cleanup_job_state()
-    state = _job_state.get(job_id)
-    if state is None:
-        return ok({"job_id": job_id, "status": "not_found"})
-    return ok({"job_id": job_id, **state})
+def _format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
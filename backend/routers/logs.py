@@ -2,20 +2,22 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core import http_cache
 from db.session import get_db
 from models import PushLog, PushStatus
 from routers.common import ok, page
-from schemas import PushLogDetail, PushLogListItem
+from schemas import PushLogDetail
 
 router = APIRouter(prefix="/api/logs", tags=["logs"])
 
 
 @router.get("")
 async def list_logs(
+    request: Request,
     page_no: int = Query(default=1, alias="page", ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     status: PushStatus | None = None,
@@ -24,7 +26,11 @@ async def list_logs(
     date_from: datetime | None = None,
     date_to: datetime | None = None,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> Response:
+    cache = await http_cache.validate(request, db, PushLog)
+    if cache.not_modified:
+        return cache.not_modified_response()
+
     conditions = []
     if status is not None:
         conditions.append(PushLog.status == status.value)
@@ -38,7 +44,8 @@ async def list_logs(
     if date_to is not None:
         conditions.append(PushLog.created_at <= date_to)
 
-    stmt = select(PushLog)
+    # 列表只返回 4 个字段：不加载 raw_content / ai_summary 大文本，也不构造 ORM 对象与 pydantic 模型
+    stmt = select(PushLog.source_id, PushLog.status, PushLog.created_at, PushLog.id)
     count_stmt = select(func.count(PushLog.id))
     if conditions:
         where_clause = and_(*conditions)
@@ -47,14 +54,19 @@ async def list_logs(
 
     total = int((await db.execute(count_stmt)).scalar_one())
     stmt = stmt.order_by(PushLog.id.desc()).offset((page_no - 1) * page_size).limit(page_size)
-    rows = list((await db.execute(stmt)).scalars().all())
-    items = [PushLogListItem.model_validate(row).model_dump(mode="json") for row in rows]
-    return page(items=items, total=total, page_no=page_no, page_size=page_size)
+    rows = (await db.execute(stmt)).all()
+    # 字段与 PushLogListItem 一致
+    items = [dict(row._mapping) for row in rows]
+    return cache.apply(page(items=items, total=total, page_no=page_no, page_size=page_size))
 
 
 @router.get("/{log_id}")
-async def get_log_detail(log_id: int, db: AsyncSession = Depends(get_db)) -> dict:
+async def get_log_detail(log_id: int, request: Request, db: AsyncSession = Depends(get_db)) -> Response:
+    cache = await http_cache.validate(request, db, PushLog)
+    if cache.not_modified:
+        return cache.not_modified_response()
+
     row = await db.get(PushLog, log_id)
     if row is None:
         raise HTTPException(status_code=404, detail="log_not_found")
-    return ok(PushLogDetail.model_validate(row).model_dump(mode="json"))
+    return cache.apply(ok(PushLogDetail.model_validate(row).model_dump(mode="json")))
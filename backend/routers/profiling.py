@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import secrets
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from starlette.responses import Response
+
+from core import get_settings
+from core.profiler import profiler
+from routers.common import ok
+
+router = APIRouter(prefix="/internal/profile", tags=["internal"])
+
+
+def require_profiling_access(x_api_key: str | None = Header(default=None)) -> None:
+    """剖析接口默认关闭（404，不暴露存在性）；开启后校验 X-API-Key 与 API_KEY 一致。"""
+    settings = get_settings()
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_api_key or not secrets.compare_digest(x_api_key, settings.API_KEY):
+        raise HTTPException(status_code=401, detail="invalid_api_key")
+
+
+@router.get("", include_in_schema=False, dependencies=[Depends(require_profiling_access)])
+async def profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=10.0, ge=1, le=1000),
+    task_interval_ms: float = Query(default=100.0, ge=10, le=5000),
+    all_threads: bool = False,
+    memory: bool = True,
+    top: int = Query(default=20, ge=1, le=200),
+    format: Literal["json", "folded"] = "json",
+    kind: Literal["cpu", "tasks", "memory"] = "cpu",
+) -> Response:
+    """
+    对当前进程采样 seconds 秒：线程栈统计采样、asyncio Task 等待栈、tracemalloc 分配。
+
+    - format=json：返回全部结果（三类折叠栈文本 + Task 快照 + 分配 Top N）
+    - format=folded：只返回 kind 指定的折叠栈文本，可直接交给 flamegraph.pl / speedscope
+    采样在独立线程里读取调用栈，事件循环与调度中的任务照常运行；同一时间只允许一个剖析请求。
+    """
+    settings = get_settings()
+    if seconds > settings.PROFILING_MAX_SECONDS:
+        raise HTTPException(status_code=422, detail=f"seconds_exceeds_limit:{settings.PROFILING_MAX_SECONDS}")
+    if profiler.busy:
+        raise HTTPException(status_code=409, detail="profile_in_progress")
+
+    result = await profiler.run(
+        seconds=seconds,
+        interval_ms=interval_ms,
+        task_interval_ms=task_interval_ms,
+        all_threads=all_threads,
+        memory=memory,
+        top=top,
+    )
+    if format == "folded":
+        return Response(content=result.folded(kind), media_type="text/plain; charset=utf-8")
+    return ok(result.to_dict())
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.session import get_db
 from models import MonitorSource, PushChannel, SourceChannelBinding
-from routers.common import ok, page
+from routers.common import FastJSONResponse, ok, page
 from schemas import SourceChannelBindingCreate, SourceChannelBindingResponse
 
 router = APIRouter(prefix="/api/source-channel-bindings", tags=["source-channel-bindings"])
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/api/source-channel-bindings", tags=["source-channel-
 async def create_source_channel_binding(
     payload: SourceChannelBindingCreate,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> FastJSONResponse:
     source = await db.get(MonitorSource, payload.source_id)
     if source is None:
         raise HTTPException(status_code=404, detail="source_not_found")
@@ -43,7 +43,7 @@ async def list_source_channel_bindings(
     source_id: int | None = None,
     channel_id: int | None = None,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> FastJSONResponse:
     stmt = select(SourceChannelBinding)
     count_stmt = select(func.count(SourceChannelBinding.id))
     if source_id is not None:
@@ -61,7 +61,7 @@ async def list_source_channel_bindings(
 
 
 @router.delete("/{binding_id}")
-async def delete_source_channel_binding(binding_id: int, db: AsyncSession = Depends(get_db)) -> dict:
+async def delete_source_channel_binding(binding_id: int, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     row = await db.get(SourceChannelBinding, binding_id)
     if row is None:
         return ok({"deleted": False, "reason": "binding_not_found"})
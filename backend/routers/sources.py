@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core import http_cache
 from db.session import get_db
 from models import MonitorSource, PushLog, SourceType
-from routers.common import ok, page
+from routers.common import FastJSONResponse, ok, page
 from schemas import MonitorSourceCreate, MonitorSourceResponse, MonitorSourceUpdate
 
 # 定义路由组 (Controller)
@@ -20,7 +21,7 @@ router = APIRouter(prefix="/api/sources", tags=["sources"])
 # payload: 请求体 JSON，自动映射为 MonitorSourceCreate 对象 (@RequestBody)
 # db: 依赖注入获取数据库会话
 @router.post("")
-async def create_source(payload: MonitorSourceCreate, db: AsyncSession = Depends(get_db)) -> dict:
+async def create_source(payload: MonitorSourceCreate, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     # 1. 创建 ORM 对象
     row = MonitorSource(
         type=payload.type.value, # 枚举转字符串
@@ -47,6 +48,7 @@ async def create_source(payload: MonitorSourceCreate, db: AsyncSession = Depends
 # GET /api/sources - 获取监控源列表 (分页)
 @router.get("")
 async def list_sources(
+    request: Request,
     # Query 参数: ?page=1&page_size=20
     # alias="page": URL 参数名叫 page，代码里叫 page_no
     page_no: int = Query(default=1, alias="page", ge=1), # ge=1: >= 1
@@ -54,7 +56,12 @@ async def list_sources(
     type: SourceType | None = None,
     is_active: bool | None = None,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> Response:
+    # 协商缓存：ETag 由表版本 + 筛选/分页参数计算，If-None-Match 命中时直接 304，不再执行下面的查询
+    cache = await http_cache.validate(request, db, MonitorSource)
+    if cache.not_modified:
+        return cache.not_modified_response()
+
     # 构造查询语句 (Criteria API / QueryDSL)
     stmt = select(MonitorSource)
     count_stmt = select(func.count(MonitorSource.id))
@@ -76,15 +83,16 @@ async def list_sources(
     stmt = stmt.order_by(MonitorSource.id.desc()).offset((page_no - 1) * page_size).limit(page_size)
     rows = (await db.execute(stmt)).scalars().all()
     
-    # 转为 DTO 列表
-    items = [MonitorSourceResponse.model_validate(row).model_dump() for row in rows]
+    # 转为 DTO 列表：直接构造 dict（字段与 MonitorSourceResponse 一致），跳过逐行的 pydantic 校验
+    items = [_serialize_source(row) for row in rows]
     
-    return page(items=items, total=total, page_no=page_no, page_size=page_size)
+    # 把 ETag / Last-Modified 写入响应头
+    return cache.apply(page(items=items, total=total, page_no=page_no, page_size=page_size))
 
 
 # PUT /api/sources/{source_id} - 更新监控源
 @router.put("/{source_id}")
-async def update_source(source_id: int, payload: MonitorSourceUpdate, db: AsyncSession = Depends(get_db)) -> dict:
+async def update_source(source_id: int, payload: MonitorSourceUpdate, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     # 先查出来
     row = await db.get(MonitorSource, source_id)
     if row is None:
@@ -110,7 +118,7 @@ async def update_source(source_id: int, payload: MonitorSourceUpdate, db: AsyncS
 
 # DELETE /api/sources/{source_id} - 删除监控源
 @router.delete("/{source_id}")
-async def delete_source(source_id: int, db: AsyncSession = Depends(get_db)) -> dict:
+async def delete_source(source_id: int, db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     row = await db.get(MonitorSource, source_id)
     if row is None:
         return ok({"deleted": False, "reason": "source_not_found"})
@@ -124,3 +132,13 @@ async def delete_source(source_id: int, db: AsyncSession = Depends(get_db)) -> d
     await db.delete(row)
     await db.commit()
     return ok({"deleted": True, "id": source_id})
+
+
+def _serialize_source(row: MonitorSource) -> dict:
+    return {
+        "type": row.type,
+        "value": row.value,
+        "is_active": row.is_active,
+        "remark": row.remark,
+        "id": row.id,
+    }
@@ -3,19 +3,41 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
 
+from core.circuit_breaker import circuit_breakers
+from core.loop_monitor import loop_monitor
+from core.metrics import metrics
 from db.session import get_db
-from routers.common import ok
+from routers.common import FastJSONResponse, ok
 
 router = APIRouter(tags=["system"])
 
 
 @router.get("/health")
-async def health() -> dict:
+async def health() -> FastJSONResponse:
     return ok({"status": "ok"})
 
 
 @router.get("/ready")
-async def ready(db: AsyncSession = Depends(get_db)) -> dict:
+async def ready(db: AsyncSession = Depends(get_db)) -> FastJSONResponse:
     await db.execute(text("SELECT 1"))
     return ok({"status": "ready"})
+
+
+@router.get("/health/circuits")
+async def circuits() -> FastJSONResponse:
+    """熔断器状态：closed=正常，open=快速失败中，half_open=等待探测请求。"""
+    return ok({"circuits": circuit_breakers.snapshot()})
+
+
+@router.get("/health/loop")
+async def event_loop() -> FastJSONResponse:
+    """事件循环延迟与最近的阻塞记录（阻塞位置与时长），完整调用栈见 event_loop_blocked 日志。"""
+    return ok(loop_monitor.snapshot())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    """Prometheus 抓取入口：各阶段耗时、上游调用、Webhook 投递、缓存命中、DB 查询与 HTTP 请求指标。"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,5 +1,5 @@
 from .api import ApiResponse, PageMeta, PageResult
-from .content import ContentAnalysisInfo, ContentListItem
+from .content import ContentAnalysisInfo, ContentBulkAnalyzeRequest, ContentListItem
 from .crawler import CrawlBatchResult, CrawlItem
 from .llm import LLMBatchItemAnalysisResult, LLMInsightItem, LLMItemAnalysisResult, LLMSummaryResult
 from .monitor_source import MonitorSourceCreate, MonitorSourceResponse, MonitorSourceUpdate
@@ -12,6 +12,7 @@ __all__ = [
     "PageMeta",
     "PageResult",
     "ContentAnalysisInfo",
+    "ContentBulkAnalyzeRequest",
     "ContentListItem",
     "CrawlItem",
     "CrawlBatchResult",
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ContentAnalysisInfo(BaseModel):
@@ -25,3 +25,12 @@ class ContentListItem(BaseModel):
     published_at: datetime | None = None
     created_at: datetime
     ai: ContentAnalysisInfo | None = None
+
+
+class ContentBulkAnalyzeRequest(BaseModel):
+    # 传 content_ids 时按 ID 列表；否则按与列表接口相同的筛选条件选取
+    content_ids: list[int] = Field(default_factory=list, max_length=1000)
+    keyword: str | None = None
+    platform: str | None = None
+    ai_status: str | None = None
+    limit: int = Field(default=200, ge=1, le=1000)
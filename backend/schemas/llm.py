@@ -26,6 +26,11 @@ class LLMSummaryResult(BaseModel):
     prompt_text: str | None = None # 发送给 LLM 的提示词（用于调试）
     raw_response_text: str | None = None # LLM 的原始响应
     failure_reason: str | None = None # 失败原因
+    # GLM 返回的实际用量（含重试/对冲）与累计调用耗时；上游未返回 usage 时为空
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    total_tokens: int | None = None
+    latency_ms: int | None = None
 
 
 class LLMItemAnalysisResult(BaseModel):
@@ -48,3 +53,7 @@ class LLMBatchItemAnalysisResult(BaseModel):
     prompt_text: str | None = None
     raw_response_text: str | None = None
     failure_reason: str | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    total_tokens: int | None = None
+    latency_ms: int | None = None
@@ -1,9 +1,16 @@
-"""seed 脚本命令行入口。"""
+"""seed 脚本命令行入口。
 
+    python seed_data.py                                   # 写入少量演示数据（可重复执行）
+    python seed_data.py --bulk --contents 1000000 --logs 100000   # 批量合成数据（每次执行追加）
+"""
+
+import argparse
 import asyncio
+import sys
 
+from db.init_db import init_db
+from db.seed import seed_bulk, seed_db
 from db.session import SessionLocal
-from db.seed import seed_db
 
 
 async def run() -> None:
@@ -12,8 +19,44 @@ async def run() -> None:
         await seed_db(session)
 
 
+def _print_progress(label: str, done: int, total: int) -> None:
+    sys.stdout.write(f"\r{label}: {done}/{total}")
+    if done >= total:
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+async def run_bulk(args: argparse.Namespace) -> None:
+    await init_db()
+    async with SessionLocal() as session:
+        stats = await seed_bulk(
+            session,
+            contents=args.contents,
+            logs=args.logs,
+            items_per_log=args.items_per_log,
+            sources=args.sources,
+            analyzed_ratio=args.analyzed_ratio,
+            days=args.days,
+            batch_size=args.batch_size,
+            seed=args.seed,
+            on_progress=_print_progress,
+        )
+    print(stats)
+
+
 def main() -> None:
-    asyncio.run(run())
+    parser = argparse.ArgumentParser(description="写入演示数据或批量合成数据")
+    parser.add_argument("--bulk", action="store_true", help="批量生成合成数据（用于读接口压测）")
+    parser.add_argument("--contents", type=int, default=100_000, help="资讯条数")
+    parser.add_argument("--logs", type=int, default=10_000, help="推送日志条数")
+    parser.add_argument("--items-per-log", type=int, default=5, help="每条推送日志的明细条数")
+    parser.add_argument("--sources", type=int, default=50, help="新建的监控源数量")
+    parser.add_argument("--analyzed-ratio", type=float, default=0.8, help="已有 AI 分析的资讯比例")
+    parser.add_argument("--days", type=int, default=365, help="数据分布的天数范围")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="每批插入行数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    asyncio.run(run_bulk(args) if args.bulk else run())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import get_settings, to_app_tz
+from db.session import SessionLocal
+from models import MonitorSource
+
+logger = logging.getLogger(__name__)
+
+
+class PollingRunResult(Protocol):
+    """record_runs 需要的运行结果字段（与 pipeline_service.SourceRunResult 一致）。"""
+
+    source_id: int
+    status: str
+    new_items: int
+    avg_hotness: float
+
+
+@dataclass
+class SourcePollingState:
+    """单个监控源的自适应调度状态；持久化在 monitor_sources 的 poll_* 列上，重启与多副本之间共享。"""
+
+    interval_minutes: float
+    last_run_at: datetime | None = None
+    # 最近 N 次运行的 (新增条数, 平均热度)
+    history: deque[tuple[int, float]] = field(default_factory=deque)
+
+
+class AdaptivePollingService:
+    """自适应抓取频率：按最近运行的新增产出与热度，动态缩短/拉长每个监控源的抓取间隔。
+
+    规则：
+    1) 有效产出 = 平均新增条数 * (0.5 + 平均热度/100)，热度越高权重越大（0.5x ~ 1.5x）
+    2) 有效产出高于目标值则按比例缩短间隔，低于目标值则拉长，单次调整幅度限制在 0.5x ~ 2x
+    3) 最终间隔始终落在 [ADAPTIVE_MIN_INTERVAL_MINUTES, ADAPTIVE_MAX_INTERVAL_MINUTES]
+    """
+
+    _MIN_STEP_FACTOR = 0.5
+    _MAX_STEP_FACTOR = 2.0
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None) -> None:
+        self._settings = get_settings()
+        self._session_factory = session_factory or SessionLocal
+        self._states: dict[int, SourcePollingState] = {}
+
+    def due_sources(self, sources: Sequence[MonitorSource], now: datetime) -> list[MonitorSource]:
+        """
+        按数据库中的轮询状态筛选到期的监控源。
+        调用方需持有 pipeline:run_all 租约，保证多个进程不会同时选中同一批监控源。
+        """
+        self.load_states(sources)
+        due_ids = set(self.select_due_sources([source.id for source in sources], now=now))
+        return [source for source in sources if source.id in due_ids]
+
+    async def record_runs(self, results: Sequence[PollingRunResult], finished_at: datetime) -> None:
+        """把本次运行的产出写回 monitor_sources，其他进程下次巡检时能看到这次运行。"""
+        if not results:
+            return
+        source_ids = [result.source_id for result in results]
+        async with self._session_factory() as session:
+            rows = (await session.execute(select(MonitorSource).where(MonitorSource.id.in_(source_ids)))).scalars().all()
+            # 以数据库中的最新状态为基础计算，不用可能已过期的内存状态
+            self.load_states(rows)
+            known_ids = {row.id for row in rows}
+            for result in results:
+                if result.source_id not in known_ids:
+                    continue
+                self.record_run(
+                    source_id=result.source_id,
+                    new_items=result.new_items,
+                    avg_hotness=result.avg_hotness,
+                    finished_at=finished_at,
+                    success=result.status == "success",
+                )
+                state = self._states[result.source_id]
+                await session.execute(
+                    update(MonitorSource)
+                    .where(MonitorSource.id == result.source_id)
+                    .values(
+                        last_polled_at=state.last_run_at,
+                        poll_interval_minutes=state.interval_minutes,
+                        poll_history=json.dumps([list(entry) for entry in state.history]),
+                        # 轮询状态不在监控源列表中展示，保持 updated_at 不变，避免每次运行都让列表的 ETag 失效
+                        updated_at=MonitorSource.updated_at,
+                    )
+                )
+            await session.commit()
+
+    def load_states(self, sources: Sequence[MonitorSource]) -> None:
+        """用监控源行上保存的轮询状态替换内存状态（内存中只保留本次计算需要的监控源）。"""
+        self._states = {source.id: self._state_from_source(source) for source in sources}
+
+    def select_due_sources(self, source_ids: list[int], now: datetime) -> list[int]:
+        """返回当前已到期、需要抓取的监控源 ID（从未运行过的视为到期）。"""
+        due_ids: list[int] = []
+        for source_id in source_ids:
+            state = self._get_state(source_id)
+            if state.last_run_at is None:
+                due_ids.append(source_id)
+                continue
+            if _local_naive(now) >= _local_naive(state.last_run_at) + timedelta(minutes=state.interval_minutes):
+                due_ids.append(source_id)
+        return due_ids
+
+    def record_run(
+        self,
+        source_id: int,
+        new_items: int,
+        avg_hotness: float,
+        finished_at: datetime,
+        success: bool = True,
+    ) -> float:
+        """
+        记录一次运行产出并重新计算抓取间隔，返回新的间隔（分钟）。
+        失败的运行不计入产出历史，只刷新运行时间，按原间隔等待下次重试。
+        """
+        state = self._get_state(source_id)
+        state.last_run_at = finished_at
+        if not success:
+            return state.interval_minutes
+
+        state.history.append((max(0, new_items), max(0.0, avg_hotness)))
+        history_size = max(1, self._settings.ADAPTIVE_HISTORY_SIZE)
+        while len(state.history) > history_size:
+            state.history.popleft()
+
+        previous = state.interval_minutes
+        state.interval_minutes = self._clamp_interval(previous * self._compute_step_factor(state.history))
+        if state.interval_minutes != previous:
+            logger.info(
+                "adaptive_interval_changed source_id=%s from_minutes=%.1f to_minutes=%.1f",
+                source_id,
+                previous,
+                state.interval_minutes,
+            )
+        return state.interval_minutes
+
+    def get_interval_minutes(self, source_id: int) -> float:
+        return self._get_state(source_id).interval_minutes
+
+    def _state_from_source(self, source: MonitorSource) -> SourcePollingState:
+        history: deque[tuple[int, float]] = deque()
+        if source.poll_history:
+            try:
+                history.extend((int(entry[0]), float(entry[1])) for entry in json.loads(source.poll_history))
+            except (TypeError, ValueError, IndexError):
+                logger.warning("adaptive_history_invalid source_id=%s", source.id)
+        interval = source.poll_interval_minutes or float(self._settings.ADAPTIVE_BASE_INTERVAL_MINUTES)
+        return SourcePollingState(
+            interval_minutes=self._clamp_interval(float(interval)),
+            last_run_at=source.last_polled_at,
+            history=history,
+        )
+
+    def _get_state(self, source_id: int) -> SourcePollingState:
+        state = self._states.get(source_id)
+        if state is None:
+            state = SourcePollingState(
+                interval_minutes=self._clamp_interval(float(self._settings.ADAPTIVE_BASE_INTERVAL_MINUTES)),
+            )
+            self._states[source_id] = state
+        return state
+
+    def _compute_step_factor(self, history: deque[tuple[int, float]]) -> float:
+        if not history:
+            return 1.0
+        avg_new = sum(x[0] for x in history) / len(history)
+        avg_hotness = sum(x[1] for x in history) / len(history)
+        effective_yield = avg_new * (0.5 + min(100.0, avg_hotness) / 100)
+        if effective_yield <= 0:
+            return self._MAX_STEP_FACTOR
+
+        target = max(1, self._settings.ADAPTIVE_TARGET_NEW_ITEMS)
+        # 产出是目标的 2 倍 -> 间隔减半；产出是目标的一半 -> 间隔翻倍
+        factor = target / effective_yield
+        return max(self._MIN_STEP_FACTOR, min(self._MAX_STEP_FACTOR, factor))
+
+    def _clamp_interval(self, minutes: float) -> float:
+        low = float(max(1, self._settings.ADAPTIVE_MIN_INTERVAL_MINUTES))
+        high = float(max(low, self._settings.ADAPTIVE_MAX_INTERVAL_MINUTES))
+        return max(low, min(high, minutes))
+
+
+def _local_naive(value: datetime) -> datetime:
+    # SQLite 不保存时区：从数据库读出的是 app_now 写入的无时区应用时区时间，比较前统一成同一形式
+    return to_app_tz(value).replace(tzinfo=None) if value.tzinfo is not None else value
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from datetime import timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import app_now, get_settings
+from db.session import SessionLocal
+from models import ContentAIAnalysis, ContentItem, LLMCallLog
+from services.content_analysis_service import ContentAnalysisService
+from services.llm_service import estimate_tokens
+from services.run_lock_service import RunLockService
+
+logger = logging.getLogger(__name__)
+
+# token 预算的统计窗口（秒）
+_BUDGET_WINDOW_SECONDS = 3600.0
+# 回填租约名：多进程/多副本各自启动调度器时，同一时刻只有一个进程执行回填
+_LOCK_NAME = "pipeline:backfill"
+# 估算一次请求的 token 时，每条资讯额外计入的模板与输出开销
+_PER_ITEM_OVERHEAD_TOKENS = 200
+
+
+class AnalysisBackfillService:
+    """历史分析回填：提示词模板或模型变化后，增量地重新分析指纹过期的旧结果，以及兜底（failed）的结果。
+
+    - 优先级：热度高的在前，同热度按发布时间新的在前
+    - 每次巡检按 LLM_ANALYZE_BATCH_SIZE 一批一批处理，超出每小时 token 预算即停止，下次巡检继续
+    - 每轮持有 pipeline:backfill 租约：多个副本不会并行回填同一批过期结果
+    - 回填失败的条目按回填间隔指数退避，连续失败 ANALYSIS_BACKFILL_MAX_ATTEMPTS 次后不再选中，
+      避免永久失败的条目每轮都消耗预算
+    - 预算按 llm_call_logs 中最近一小时 call_type=backfill 的用量统计（所有副本共享）：
+      优先取 GLM 返回的实际用量，缺失时按提示词与响应长度估算；
+      追溯不到监控源、未写调用日志的批次只能记在当前进程内
+    """
+
+    def __init__(
+        self,
+        analysis_service: ContentAnalysisService | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        lock_service: RunLockService | None = None,
+    ) -> None:
+        self._settings = get_settings()
+        self._analysis = analysis_service or ContentAnalysisService()
+        self._session_factory = session_factory or SessionLocal
+        self._locks = lock_service or RunLockService()
+        self._unlogged: deque[tuple[float, int]] = deque()
+
+    async def remaining_budget(self, session: AsyncSession) -> int:
+        """最近一小时内剩余的 token 预算。"""
+        since = app_now() - timedelta(seconds=_BUDGET_WINDOW_SECONDS)
+        recent = (LLMCallLog.call_type == "backfill", LLMCallLog.created_at >= since)
+        reported = (
+            await session.execute(select(func.coalesce(func.sum(LLMCallLog.total_tokens), 0)).where(*recent))
+        ).scalar_one()
+        # 上游未返回 usage 的调用按文本长度估算（与 analyze_contents 的口径一致）
+        estimated_rows = (
+            await session.execute(
+                select(LLMCallLog.prompt_text, LLMCallLog.response_text).where(*recent, LLMCallLog.total_tokens.is_(None))
+            )
+        ).all()
+        estimated = sum(estimate_tokens(prompt or "") + estimate_tokens(response or "") for prompt, response in estimated_rows)
+
+        cutoff = time.monotonic() - _BUDGET_WINDOW_SECONDS
+        while self._unlogged and self._unlogged[0][0] < cutoff:
+            self._unlogged.popleft()
+        unlogged = sum(tokens for _, tokens in self._unlogged)
+        used = int(reported) + estimated + unlogged
+        return max(0, self._settings.ANALYSIS_BACKFILL_TOKENS_PER_HOUR - used)
+
+    async def run_once(self) -> dict[str, int]:
+        """执行一轮回填，返回 {batches, analyzed, failed, tokens}；其他进程正在回填时直接跳过。"""
+        async with self._locks.hold(_LOCK_NAME) as acquired:
+            if not acquired:
+                logger.info("analysis_backfill_skipped reason=locked")
+                return {"batches": 0, "analyzed": 0, "failed": 0, "tokens": 0}
+            return await self._run_locked()
+
+    async def _run_locked(self) -> dict[str, int]:
+        stats = {"batches": 0, "analyzed": 0, "failed": 0, "tokens": 0}
+        fingerprint = self._analysis.current_fingerprint()
+        batch_size = max(1, self._settings.LLM_ANALYZE_BATCH_SIZE)
+        # 同一轮中分析失败的条目退避时间已写入，这里再按 ID 排除一次，避免同一轮内在同一批上反复消耗预算
+        attempted: set[int] = set()
+
+        async with self._session_factory() as session:
+            while True:
+                remaining = await self.remaining_budget(session)
+                if remaining <= 0:
+                    break
+                batch = await self._load_stale_batch(
+                    session=session,
+                    fingerprint=fingerprint,
+                    limit=batch_size,
+                    exclude_ids=attempted,
+                )
+                if not batch:
+                    break
+                estimated = sum(estimate_tokens(item.content_text) + _PER_ITEM_OVERHEAD_TOKENS for item in batch)
+                # 预算未动用时至少放行一批，否则单批超过整体预算的配置永远无法推进
+                if estimated > remaining and remaining < self._settings.ANALYSIS_BACKFILL_TOKENS_PER_HOUR:
+                    break
+
+                attempted.update(item.id for item in batch)
+                result = await self._analysis.analyze_contents(
+                    session=session,
+                    content_items=batch,
+                    keep_existing_on_failure=True,
+                    call_type="backfill",
+                )
+                await self._record_failed_attempts(session=session, batch=batch, fingerprint=fingerprint)
+                if result["unlogged_tokens"]:
+                    self._unlogged.append((time.monotonic(), result["unlogged_tokens"]))
+                stats["batches"] += 1
+                stats["analyzed"] += result["success"]
+                stats["failed"] += result["failed"]
+                stats["tokens"] += result["tokens"]
+
+        if stats["batches"]:
+            async with self._session_factory() as session:
+                remaining = await self.remaining_budget(session)
+            logger.info(
+                "analysis_backfill_done batches=%s analyzed=%s failed=%s tokens=%s remaining_budget=%s",
+                stats["batches"],
+                stats["analyzed"],
+                stats["failed"],
+                stats["tokens"],
+                remaining,
+            )
+        return stats
+
+    async def _load_stale_batch(
+        self,
+        session: AsyncSession,
+        fingerprint: str,
+        limit: int,
+        exclude_ids: set[int],
+    ) -> list[ContentItem]:
+        stmt = (
+            select(ContentItem)
+            .join(ContentAIAnalysis, ContentAIAnalysis.content_item_id == ContentItem.id)
+            .where(self._stale_condition(fingerprint), self._retry_due_condition())
+            .order_by(ContentItem.hotness.desc(), ContentItem.published_at.desc(), ContentItem.id.desc())
+            .limit(limit)
+        )
+        if exclude_ids:
+            stmt = stmt.where(ContentItem.id.not_in(exclude_ids))
+        return list((await session.execute(stmt)).scalars().all())
+
+    @staticmethod
+    def _stale_condition(fingerprint: str):
+        # 兜底结果（failed）同样带当前指纹，需按状态一并选出；degraded 已有模型给出的分析，只在指纹过期时回填
+        return or_(
+            ContentAIAnalysis.prompt_fingerprint.is_(None),
+            ContentAIAnalysis.prompt_fingerprint != fingerprint,
+            ContentAIAnalysis.status == "failed",
+        )
+
+    def _retry_due_condition(self):
+        return and_(
+            func.coalesce(ContentAIAnalysis.backfill_attempts, 0) < max(1, self._settings.ANALYSIS_BACKFILL_MAX_ATTEMPTS),
+            or_(ContentAIAnalysis.next_retry_at.is_(None), ContentAIAnalysis.next_retry_at <= app_now()),
+        )
+
+    async def _record_failed_attempts(self, session: AsyncSession, batch: list[ContentItem], fingerprint: str) -> None:
+        """本批中仍未得到当前指纹下成功分析的条目：失败次数 +1，并按回填间隔指数退避。"""
+        stmt = select(ContentAIAnalysis.id, ContentAIAnalysis.backfill_attempts).where(
+            ContentAIAnalysis.content_item_id.in_([item.id for item in batch]),
+            self._stale_condition(fingerprint),
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return
+        now = app_now()
+        interval_minutes = max(1, self._settings.ANALYSIS_BACKFILL_INTERVAL_MINUTES)
+        for analysis_id, attempts in rows:
+            attempts = (attempts or 0) + 1
+            await session.execute(
+                update(ContentAIAnalysis)
+                .where(ContentAIAnalysis.id == analysis_id)
+                .values(
+                    backfill_attempts=attempts,
+                    next_retry_at=now + timedelta(minutes=interval_minutes * 2 ** (attempts - 1)),
+                    # 只是重试计划，不是新的分析结果：保持 updated_at 不变（列表展示与 ETag 依赖它）
+                    updated_at=ContentAIAnalysis.updated_at,
+                )
+            )
+        await session.commit()
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import app_now, get_settings
+from models import ContentAIAnalysis, ContentItem, LLMCallLog, PushLog, PushLogItem
+from schemas import CrawlItem, LLMBatchItemAnalysisResult, LLMInsightItem
+from services.llm_service import LLMService, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class ContentAnalysisService:
+    """资讯 AI（重新）分析：单条重分析接口与批量重分析任务共用。
+
+    按 LLM_ANALYZE_BATCH_SIZE 分批调用大模型，每批结果立即落库并提交，
+    批量任务中途失败时已完成的批次不会丢失。
+    """
+
+    def __init__(self, llm_service: LLMService | None = None) -> None:
+        self._settings = get_settings()
+        self._llm = llm_service or LLMService()
+
+    async def analyze_contents(
+        self,
+        session: AsyncSession,
+        content_items: list[ContentItem],
+        on_progress: ProgressCallback | None = None,
+        keep_existing_on_failure: bool = False,
+        call_type: str = "reanalyze",
+        record_batch_status: bool = False,
+    ) -> dict[str, int]:
+        """分批分析并落库，返回 {total, done, success, failed, tokens, unlogged_tokens}。
+
+        tokens 优先取 GLM 返回的实际用量，上游未返回 usage 时按提示词与响应长度估算；
+        unlogged_tokens 为无法追溯到监控源、因而没有写入 llm_call_logs 的批次消耗。
+
+        keep_existing_on_failure=True 时（后台回填），分析失败的条目保留原有分析，不用兜底结果覆盖。
+
+        record_batch_status=True 时（单条重分析接口），有结果的条目记录整批的状态与原因（如 degraded），
+        而不是一律记为 success；批量任务中一批的 degraded 多为其他条目漏答，仍按条目记为 success。
+        """
+        stats = {"total": len(content_items), "done": 0, "success": 0, "failed": 0, "tokens": 0, "unlogged_tokens": 0}
+        batch_size = max(1, self._settings.LLM_ANALYZE_BATCH_SIZE)
+        fingerprint = self.current_fingerprint()
+        for start in range(0, len(content_items), batch_size):
+            batch = content_items[start : start + batch_size]
+            batch_result = await self._llm.analyze_items([self.to_crawl_item(item) for item in batch])
+            if batch_result.total_tokens is not None:
+                batch_tokens = batch_result.total_tokens
+            else:
+                batch_tokens = estimate_tokens(batch_result.prompt_text or "") + estimate_tokens(
+                    batch_result.raw_response_text or ""
+                )
+            stats["tokens"] += batch_tokens
+            insight_map = {insight.tweet_id: insight for insight in batch_result.insights}
+            for content_item in batch:
+                insight = insight_map.get(content_item.external_id)
+                if insight is None and keep_existing_on_failure and await self._has_analysis(session, content_item):
+                    stats["failed"] += 1
+                elif insight is None:
+                    await self.save_analysis(
+                        session=session,
+                        content_item=content_item,
+                        insight=self.build_fallback_insight(self.to_crawl_item(content_item)),
+                        batch_result=batch_result,
+                        status="failed",
+                        failure_reason=batch_result.failure_reason or "missing_item_in_batch_output",
+                        prompt_fingerprint=fingerprint,
+                    )
+                    stats["failed"] += 1
+                else:
+                    await self.save_analysis(
+                        session=session,
+                        content_item=content_item,
+                        insight=insight,
+                        batch_result=batch_result,
+                        status=batch_result.status if record_batch_status else "success",
+                        failure_reason=batch_result.failure_reason if record_batch_status else None,
+                        prompt_fingerprint=fingerprint,
+                    )
+                    stats["success"] += 1
+
+            logged = await self._save_call_log(
+                session=session,
+                content_items=batch,
+                batch_result=batch_result,
+                call_type=call_type,
+            )
+            if not logged:
+                stats["unlogged_tokens"] += batch_tokens
+            await session.commit()
+            stats["done"] += len(batch)
+            if on_progress is not None:
+                await on_progress(dict(stats))
+        return stats
+
+    async def save_analysis(
+        self,
+        session: AsyncSession,
+        content_item: ContentItem,
+        insight: LLMInsightItem,
+        batch_result: LLMBatchItemAnalysisResult,
+        status: str,
+        failure_reason: str | None,
+        prompt_fingerprint: str | None = None,
+    ) -> ContentAIAnalysis:
+        """写入（或覆盖）资讯的最新分析，并在缺少标题时补充 AI 标题；不提交事务。"""
+        analysis_row = (
+            (
+                await session.execute(
+                    select(ContentAIAnalysis).where(
+                        ContentAIAnalysis.content_item_id == content_item.id,
+                    )
+                )
+            )
+            .scalars()
+            .first()
+        )
+        content_hash = self.compute_source_text_hash(content_item.content_text)
+        now = app_now()
+
+        if analysis_row is None:
+            analysis_row = ContentAIAnalysis(
+                content_item_id=content_item.id,
+                model=batch_result.model or "unknown",
+                ai_score=insight.ai_score,
+                summary=insight.summary,
+                content_hash=content_hash,
+                prompt_fingerprint=prompt_fingerprint,
+                prompt_text=batch_result.prompt_text,
+                response_text=batch_result.raw_response_text,
+                status=status,
+                failure_reason=failure_reason,
+                created_at=now,
+                updated_at=now,
+            )
+            session.add(analysis_row)
+        else:
+            analysis_row.model = batch_result.model or "unknown"
+            analysis_row.ai_score = insight.ai_score
+            analysis_row.summary = insight.summary
+            analysis_row.content_hash = content_hash
+            analysis_row.prompt_fingerprint = prompt_fingerprint
+            analysis_row.prompt_text = batch_result.prompt_text
+            analysis_row.response_text = batch_result.raw_response_text
+            analysis_row.status = status
+            analysis_row.failure_reason = failure_reason
+            analysis_row.backfill_attempts = None
+            analysis_row.next_retry_at = None
+            analysis_row.updated_at = now
+
+        self.apply_ai_generated_title_if_missing(content_item=content_item, insight=insight)
+        content_item.updated_at = now
+        return analysis_row
+
+    @staticmethod
+    async def _has_analysis(session: AsyncSession, content_item: ContentItem) -> bool:
+        stmt = select(ContentAIAnalysis.id).where(ContentAIAnalysis.content_item_id == content_item.id)
+        return (await session.execute(stmt)).first() is not None
+
+    def current_fingerprint(self) -> str:
+        return self._llm.prompt_fingerprint()
+
+    async def _save_call_log(
+        self,
+        session: AsyncSession,
+        content_items: list[ContentItem],
+        batch_result: LLMBatchItemAnalysisResult,
+        call_type: str,
+    ) -> bool:
+        """每批记录一条调用日志，归属到第一条能追溯到监控源的资讯；都追溯不到时不记录，返回 False。"""
+        source_id = None
+        for content_item in content_items:
+            source_id = await self._resolve_source_id_for_content(session=session, content_item=content_item)
+            if source_id is not None:
+                break
+        if source_id is None:
+            return False
+        session.add(
+            LLMCallLog(
+                source_id=source_id,
+                push_log_id=None,
+                model=batch_result.model or "unknown",
+                prompt_text=batch_result.prompt_text or "",
+                response_text=batch_result.raw_response_text,
+                status=batch_result.status,
+                error_message=batch_result.failure_reason,
+                call_type=call_type,
+                prompt_tokens=batch_result.prompt_tokens,
+                completion_tokens=batch_result.completion_tokens,
+                total_tokens=batch_result.total_tokens,
+                latency_ms=batch_result.latency_ms,
+                created_at=app_now(),
+            )
+        )
+        return True
+
+    @staticmethod
+    def to_crawl_item(content_item: ContentItem) -> CrawlItem:
+        return CrawlItem(
+            source=content_item.source_type,
+            tweet_id=content_item.external_id,
+            author_username=content_item.author_name or "",
+            url=content_item.url,
+            text=content_item.content_text,
+            published_at=content_item.published_at,
+            hotness=content_item.hotness,
+            raw_payload={},
+        )
+
+    @staticmethod
+    def build_fallback_insight(crawl_item: CrawlItem) -> LLMInsightItem:
+        hotness = crawl_item.hotness or 0
+        score = max(10, min(100, round(hotness)))
+        summary = " ".join((crawl_item.text or "").split()).strip()
+        if not summary:
+            summary = "原文为空，建议人工复核。"
+        if len(summary) > 120:
+            summary = f"{summary[:120]}..."
+        return LLMInsightItem(
+            tweet_id=crawl_item.tweet_id,
+            ai_score=score,
+            summary=summary,
+            ai_title=None,
+        )
+
+    @classmethod
+    def apply_ai_generated_title_if_missing(cls, content_item: ContentItem, insight: LLMInsightItem) -> None:
+        if content_item.title and content_item.title.strip():
+            return
+
+        candidate = (insight.ai_title or "").strip()
+        if not candidate:
+            candidate = cls._build_title_from_summary(insight.summary)
+        if not candidate:
+            return
+        content_item.title = f"[AI生成] {candidate}"[:512]
+
+    @staticmethod
+    def _build_title_from_summary(summary: str) -> str:
+        text = " ".join((summary or "").replace("\n", " ").split()).strip()
+        if not text:
+            return ""
+        for sep in ("。", "！", "？", ".", "!", "?"):
+            if sep in text:
+                text = text.split(sep, 1)[0].strip()
+                break
+        if len(text) > 28:
+            text = f"{text[:28]}..."
+        return text
+
+    @staticmethod
+    def compute_source_text_hash(text: str) -> str:
+        normalized = " ".join((text or "").split()).strip()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    async def _resolve_source_id_for_content(session: AsyncSession, content_item: ContentItem) -> int | None:
+        stmt = (
+            select(PushLog.source_id)
+            .select_from(PushLogItem)
+            .join(PushLog, PushLog.id == PushLogItem.push_log_id)
+            .where(PushLogItem.tweet_id == content_item.external_id)
+            .order_by(PushLog.created_at.desc())
+            .limit(1)
+        )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            return None
+        return int(row[0])
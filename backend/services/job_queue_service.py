@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import app_now, get_settings
+from models import PipelineJob
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueService:
+    """基于 pipeline_jobs 表的持久化任务队列。
+
+    - API 进程：enqueue / get，重启不会丢任务
+    - worker 进程：claim_next 领取任务，执行过程中 update_progress / heartbeat，结束时 mark_done / mark_failed
+    - 结束状态只由领取任务的 worker 写入：任务被判定僵死并由其他 worker 重新领取后，原 worker 的结果不再覆盖
+    """
+
+    async def enqueue(
+        self,
+        session: AsyncSession,
+        kind: str,
+        payload: dict[str, Any] | None = None,
+    ) -> PipelineJob:
+        now = app_now()
+        job = PipelineJob(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            status="queued",
+            payload=self._dumps(payload),
+            attempts=0,
+            created_at=now,
+            updated_at=now,
+        )
+        session.add(job)
+        await session.commit()
+        logger.info("job_enqueued job_id=%s kind=%s", job.id, kind)
+        return job
+
+    async def get(self, session: AsyncSession, job_id: str) -> PipelineJob | None:
+        return await session.get(PipelineJob, job_id)
+
+    async def claim_next(self, session: AsyncSession, worker_id: str) -> PipelineJob | None:
+        """
+        领取最早入队的任务。
+        通过 `UPDATE ... WHERE status='queued'` 的影响行数判断是否抢到，多个 worker 并发领取也不会重复执行。
+        """
+        for _ in range(3):
+            stmt = (
+                select(PipelineJob.id)
+                .where(PipelineJob.status == "queued")
+                .order_by(PipelineJob.created_at, PipelineJob.id)
+                .limit(1)
+            )
+            job_id = (await session.execute(stmt)).scalar_one_or_none()
+            if job_id is None:
+                return None
+
+            now = app_now()
+            result = await session.execute(
+                update(PipelineJob)
+                .where(PipelineJob.id == job_id, PipelineJob.status == "queued")
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    attempts=PipelineJob.attempts + 1,
+                    started_at=now,
+                    updated_at=now,
+                )
+            )
+            await session.commit()
+            if result.rowcount:
+                job = await session.get(PipelineJob, job_id, populate_existing=True)
+                logger.info("job_claimed job_id=%s kind=%s worker=%s", job_id, job.kind if job else "-", worker_id)
+                return job
+            # 被其他 worker 抢先，重试下一条
+        return None
+
+    async def update_progress(self, session: AsyncSession, job_id: str, progress: dict[str, Any]) -> None:
+        """记录执行进度，同时刷新 updated_at 作为 worker 心跳。"""
+        await session.execute(
+            update(PipelineJob)
+            .where(PipelineJob.id == job_id)
+            .values(progress=self._dumps(progress), updated_at=app_now())
+        )
+        await session.commit()
+
+    async def heartbeat(self, session: AsyncSession, job_id: str, worker_id: str) -> bool:
+        """只刷新 updated_at（不覆盖进度），避免长任务被 requeue_stale 判定为僵死；任务已不属于该 worker 时返回 False。"""
+        result = await session.execute(
+            update(PipelineJob)
+            .where(PipelineJob.id == job_id, PipelineJob.status == "running", PipelineJob.worker_id == worker_id)
+            .values(updated_at=app_now())
+        )
+        await session.commit()
+        return bool(result.rowcount)
+
+    async def mark_done(self, session: AsyncSession, job_id: str, worker_id: str, result: dict[str, Any]) -> bool:
+        now = app_now()
+        return await self._finish(
+            session=session,
+            job_id=job_id,
+            worker_id=worker_id,
+            values={"status": "done", "result": self._dumps(result), "error": None, "finished_at": now, "updated_at": now},
+        )
+
+    async def mark_failed(self, session: AsyncSession, job_id: str, worker_id: str, error: str) -> bool:
+        now = app_now()
+        return await self._finish(
+            session=session,
+            job_id=job_id,
+            worker_id=worker_id,
+            values={"status": "failed", "error": error, "finished_at": now, "updated_at": now},
+        )
+
+    async def _finish(self, session: AsyncSession, job_id: str, worker_id: str, values: dict[str, Any]) -> bool:
+        """仅当任务仍由 worker_id 持有且处于 running 时写入结束状态；返回是否写入成功。"""
+        result = await session.execute(
+            update(PipelineJob)
+            .where(PipelineJob.id == job_id, PipelineJob.status == "running", PipelineJob.worker_id == worker_id)
+            .values(**values)
+        )
+        await session.commit()
+        if not result.rowcount:
+            logger.warning("job_finish_skipped job_id=%s worker=%s status=%s", job_id, worker_id, values["status"])
+        return bool(result.rowcount)
+
+    async def requeue_stale(self, session: AsyncSession) -> int:
+        """把长时间未更新的 running 任务重新入队（worker 崩溃/被 kill 的兜底）。"""
+        deadline = app_now() - timedelta(seconds=max(60, get_settings().JOB_STALE_SECONDS))
+        result = await session.execute(
+            update(PipelineJob)
+            .where(PipelineJob.status == "running", PipelineJob.updated_at < deadline)
+            .values(status="queued", worker_id=None, updated_at=app_now())
+        )
+        await session.commit()
+        if result.rowcount:
+            logger.warning("job_requeued_stale count=%s", result.rowcount)
+        return int(result.rowcount or 0)
+
+    def load_payload(self, job: PipelineJob) -> dict[str, Any]:
+        if not job.payload:
+            return {}
+        payload = self._loads(job.payload)
+        return payload if isinstance(payload, dict) else {}
+
+    def to_dict(self, job: PipelineJob) -> dict[str, Any]:
+        """转换为 API 返回结构（保持旧版 job_id/status/result/error 字段）。"""
+        data: dict[str, Any] = {
+            "job_id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "attempts": job.attempts,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+        if job.progress:
+            data["progress"] = self._loads(job.progress)
+        if job.result:
+            data["result"] = self._loads(job.result)
+        if job.error:
+            data["error"] = job.error
+        return data
+
+    @staticmethod
+    def _dumps(value: dict[str, Any] | None) -> str | None:
+        if value is None:
+            return None
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _loads(value: str) -> Any:
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import get_settings
+from core.request_context import run_id_ctx_var
+from core.tracing import tracer
+from db.session import SessionLocal
+from models import ContentItem, PipelineJob
+from services.content_analysis_service import ContentAnalysisService
+from services.job_queue_service import JobQueueService
+from services.pipeline_service import PipelineService
+from services.run_event_bus import publish_run_event
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[PipelineJob], Awaitable[dict[str, Any]]]
+
+
+class JobWorker:
+    """任务 worker：轮询 pipeline_jobs 表，领取任务并执行。
+
+    既可以作为独立进程运行（`python worker.py`），也可以嵌入 API 进程（JOB_WORKER_EMBEDDED=True）。
+    """
+
+    def __init__(
+        self,
+        pipeline_service: PipelineService | None = None,
+        job_queue: JobQueueService | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        content_analysis_service: ContentAnalysisService | None = None,
+    ) -> None:
+        self._settings = get_settings()
+        self._pipeline = pipeline_service or PipelineService()
+        self._queue = job_queue or JobQueueService()
+        self._session_factory = session_factory or SessionLocal
+        self._content_analysis = content_analysis_service or ContentAnalysisService()
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: dict[str, JobHandler] = {
+            "run_all": self._handle_run_all,
+            "content_reanalyze": self._handle_content_reanalyze,
+        }
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def register_handler(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    async def report_progress(self, job_id: str, progress: dict[str, Any]) -> None:
+        async with self._session_factory() as session:
+            await self._queue.update_progress(session=session, job_id=job_id, progress=progress)
+
+    async def run_once(self) -> bool:
+        """领取并执行一个任务；队列为空时返回 False。"""
+        async with self._session_factory() as session:
+            job = await self._queue.claim_next(session=session, worker_id=self._worker_id)
+        if job is None:
+            return False
+
+        handler = self._handlers.get(job.kind)
+        # job_id 即 run_id：SSE 订阅方按 job_id 接收本次运行的阶段事件
+        token = run_id_ctx_var.set(job.id)
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            if handler is None:
+                raise ValueError(f"unsupported_job_kind: {job.kind}")
+            with tracer.span("job", job_id=job.id, kind=job.kind, attempt=job.attempts):
+                result = await handler(job)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("job_failed job_id=%s kind=%s", job.id, job.kind)
+            publish_run_event("run_failed", error=str(exc))
+            async with self._session_factory() as session:
+                await self._queue.mark_failed(session=session, job_id=job.id, worker_id=self._worker_id, error=str(exc))
+            return True
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+            run_id_ctx_var.reset(token)
+
+        async with self._session_factory() as session:
+            await self._queue.mark_done(session=session, job_id=job.id, worker_id=self._worker_id, result=result)
+        logger.info("job_done job_id=%s kind=%s", job.id, job.kind)
+        return True
+
+    async def run_forever(self, stop_event: asyncio.Event | None = None) -> None:
+        stop_event = stop_event or self._stop_event
+        poll_interval = max(0.1, self._settings.JOB_POLL_INTERVAL_SECONDS)
+        logger.info("job_worker_started worker=%s", self._worker_id)
+        await self._requeue_stale()
+
+        idle_rounds = 0
+        while not stop_event.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:  # noqa: BLE001
+                # 数据库短暂不可用等异常不应让 worker 退出
+                logger.exception("job_worker_poll_failed worker=%s", self._worker_id)
+                processed = False
+            if processed:
+                idle_rounds = 0
+                continue
+
+            idle_rounds += 1
+            if idle_rounds % 300 == 0:
+                await self._requeue_stale()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop_event.wait(), timeout=poll_interval)
+        logger.info("job_worker_stopped worker=%s", self._worker_id)
+
+    def start(self) -> None:
+        """以后台任务方式嵌入当前事件循环（API 进程内使用）。"""
+        if self._task is not None:
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self.run_forever(self._stop_event))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop_event.set()
+        # 正在执行的任务会被取消，超时后由 requeue_stale 重新入队
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """任务执行期间定期刷新 updated_at，超过 JOB_STALE_SECONDS 的长任务不会被其他 worker 重新领取。"""
+        stale_seconds = max(60, self._settings.JOB_STALE_SECONDS)
+        interval = max(1, min(self._settings.JOB_HEARTBEAT_SECONDS, stale_seconds // 3))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with self._session_factory() as session:
+                    alive = await self._queue.heartbeat(session=session, job_id=job_id, worker_id=self._worker_id)
+            except Exception:  # noqa: BLE001
+                logger.exception("job_heartbeat_failed job_id=%s worker=%s", job_id, self._worker_id)
+                continue
+            if not alive:
+                logger.warning("job_lost job_id=%s worker=%s", job_id, self._worker_id)
+                return
+
+    async def _requeue_stale(self) -> None:
+        try:
+            async with self._session_factory() as session:
+                await self._queue.requeue_stale(session=session)
+        except Exception:  # noqa: BLE001
+            logger.exception("job_requeue_stale_failed worker=%s", self._worker_id)
+
+    async def _handle_run_all(self, job: PipelineJob) -> dict[str, Any]:
+        await self.report_progress(job.id, {"stage": "running"})
+        payload = self._queue.load_payload(job)
+        result = await self._pipeline.trigger_run_now(resume_run_id=payload.get("resume_run_id"))
+        return {
+            "total_sources": result.total_sources,
+            "success_count": result.success_count,
+            "failed_count": result.failed_count,
+            "skipped_count": result.skipped_count,
+            "skipped_reason": result.skipped_reason,
+        }
+
+    async def _handle_content_reanalyze(self, job: PipelineJob) -> dict[str, Any]:
+        """批量重新分析：按 LLM_ANALYZE_BATCH_SIZE 分批，每批提交后上报进度 {done, total, success, failed}。"""
+        payload = self._queue.load_payload(job)
+        content_ids = [int(content_id) for content_id in payload.get("content_ids") or []]
+        await self.report_progress(job.id, {"stage": "running", "done": 0, "total": len(content_ids)})
+
+        async def on_progress(stats: dict[str, int]) -> None:
+            await self.report_progress(job.id, {"stage": "running", **stats})
+            publish_run_event("content_reanalyze_progress", **stats)
+
+        async with self._session_factory() as session:
+            rows = (await session.execute(select(ContentItem).where(ContentItem.id.in_(content_ids)))).scalars().all()
+            # 保持入队时的顺序（通常是按发布时间倒序筛出的）
+            order = {content_id: index for index, content_id in enumerate(content_ids)}
+            content_items = sorted(rows, key=lambda item: order.get(item.id, len(order)))
+            stats = await self._content_analysis.analyze_contents(
+                session=session,
+                content_items=content_items,
+                on_progress=on_progress,
+            )
+        return {**stats, "missing": len(content_ids) - len(content_items)}
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import re
-from collections.abc import Sequence
-from typing import Any
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, TypeVar
 
 from core import get_settings
+from core.circuit_breaker import CircuitBreaker, circuit_breakers
+from core.json_stream import decode_json_items
+from core.latency import LatencyWindow
+from core.metrics import LLM_TOKENS, UPSTREAM_REQUEST_SECONDS
+from core.process_pool import process_pool
+from core.request_context import remaining_run_budget
+from core.tracing import tracer
 from schemas import (
     CrawlItem,
     LLMBatchItemAnalysisResult,
@@ -14,6 +28,7 @@ from schemas import (
     LLMItemAnalysisResult,
     LLMSummaryResult,
 )
+from services.run_event_bus import publish_run_event
 
 # 动态导入 SDK，避免因缺少依赖导致整个服务崩溃
 try:
@@ -21,6 +36,198 @@ try:
 except Exception:  # pragma: no cover
     ZhipuAiClient = None  # type: ignore[assignment]
 
+# 洞察行格式：- ID: <tweet_id> | AI评分: <0-100> | 观点: <文本>
+# ID:\s*(.*?): 匹配 ID: 后的内容，非贪婪匹配；AI评分:\s*(\d+): 匹配分数；观点:\s*(.*): 匹配观点内容
+_INSIGHT_LINE_PATTERN = re.compile(r"ID:\s*(.*?)\s*\|\s*AI评分:\s*(\d+)\s*\|\s*观点:\s*(.*)")
+
+InsightCallback = Callable[[LLMInsightItem], Awaitable[None] | None]
+ResultT = TypeVar("ResultT", LLMSummaryResult, LLMBatchItemAnalysisResult)
+
+
+def parse_insight_line(line: str) -> LLMInsightItem | None:
+    """解析单行洞察；不是洞察行（或格式不完整）时返回 None。"""
+    line = line.strip()
+    if not line.startswith("-"):
+        return None
+    match = _INSIGHT_LINE_PATTERN.search(line)
+    if not match:
+        return None
+    return LLMInsightItem(
+        tweet_id=match.group(1).strip(),
+        ai_score=int(match.group(2)),
+        summary=match.group(3).strip(),
+    )
+
+
+# 以下解析函数为模块级纯函数（入参/返回值可 pickle），返回文本较长时由 process_pool 提交到子进程执行
+def parse_summary_response(text: str) -> LLMSummaryResult:
+    """
+    解析器：把大模型返回的非结构化 Markdown 文本，
+    通过正则 (Regex) 提取为结构化的 LLMSummaryResult 对象。
+    """
+    # 1. 提取综合评分
+    score_match = re.search(r"综合评分[:：]\s*(\d+)", text)
+    overall_score = int(score_match.group(1)) if score_match else 0
+
+    # 2. 提取每条洞察 (Insight)，与流式解析共用同一行格式
+    insights: list[LLMInsightItem] = []
+    for line in text.split("\n"):
+        insight = parse_insight_line(line)
+        if insight is not None:
+            insights.append(insight)
+
+    return LLMSummaryResult(
+        status="success",
+        summary_markdown=text,
+        overall_score=overall_score,
+        insights=insights,
+    )
+
+
+def parse_batch_item_output(text: str, allowed_ids: set[str]) -> list[LLMInsightItem]:
+    """
+    解析 JSON 模式输出：宽容解码（忽略代码块/说明文字、保留截断前的完整条目），
+    再逐条校验：只保留输入中存在的 ID，分数截断到 0-100，summary 不能为空。
+    """
+    insights: list[LLMInsightItem] = []
+    seen: set[str] = set()
+    for raw in decode_json_items(text):
+        if not isinstance(raw, dict):
+            continue
+        tweet_id = str(raw.get("tweet_id") or raw.get("id") or "").strip()
+        summary = str(raw.get("summary") or "").strip()
+        if tweet_id not in allowed_ids or tweet_id in seen or not summary:
+            continue
+        try:
+            score = int(float(raw.get("ai_score") or 0))
+        except (TypeError, ValueError):
+            score = 0
+        title = str(raw.get("ai_title") or "").strip() or None
+        seen.add(tweet_id)
+        insights.append(
+            LLMInsightItem(
+                tweet_id=tweet_id,
+                ai_score=max(0, min(100, score)),
+                summary=summary,
+                ai_title=title,
+            )
+        )
+    return insights
+
+
+def parse_markdown_item_output(text: str, allowed_ids: set[str]) -> list[LLMInsightItem]:
+    insights: list[LLMInsightItem] = []
+    seen: set[str] = set()
+    for insight in parse_summary_response(text).insights:
+        if insight.tweet_id in allowed_ids and insight.tweet_id not in seen:
+            seen.add(insight.tweet_id)
+            insights.append(insight)
+    return insights
+
+
+class InsightStreamParser:
+    """流式增量解析器：按 token 片段喂入，每凑齐一整行洞察就立即产出 LLMInsightItem。
+
+    只有遇到换行才认为一行结束，避免把截断中的“观点”当成完整内容；
+    流结束时调用 finish() 处理最后一行（模型输出末尾常常没有换行）。
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._seen_ids: set[str] = set()
+        self.insights: list[LLMInsightItem] = []
+
+    def feed(self, chunk: str) -> list[LLMInsightItem]:
+        self._buffer += chunk
+        if "\n" not in self._buffer:
+            return []
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._consume(lines)
+
+    def finish(self) -> list[LLMInsightItem]:
+        lines, self._buffer = [self._buffer], ""
+        return self._consume(lines)
+
+    def _consume(self, lines: list[str]) -> list[LLMInsightItem]:
+        produced: list[LLMInsightItem] = []
+        for line in lines:
+            insight = parse_insight_line(line)
+            if insight is None or insight.tweet_id in self._seen_ids:
+                continue
+            self._seen_ids.add(insight.tweet_id)
+            produced.append(insight)
+        self.insights.extend(produced)
+        return produced
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：中日韩字符按 1 字 1 token，其余字符按 4 字符 1 token。"""
+    if not text:
+        return 0
+    cjk = sum(1 for char in text if "\u2e80" <= char <= "\u9fff" or "\uac00" <= char <= "\ud7af")
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+@dataclass
+class LLMUsage:
+    """一次 summarize / analyze_items 调用（含重试、分批、对冲请求）累计的 token 用量与 GLM 耗时。"""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    calls: int = 0
+    latency_ms: int = 0
+    # 是否收到过上游返回的 usage；没有时结果中的 token 字段保持为空，而不是填 0
+    reported: bool = False
+
+    def apply_to(self, result: ResultT) -> ResultT:
+        if self.reported:
+            result.prompt_tokens = self.prompt_tokens
+            result.completion_tokens = self.completion_tokens
+            result.total_tokens = self.total_tokens
+        if self.calls:
+            result.latency_ms = self.latency_ms
+        return result
+
+
+_usage_ctx_var: ContextVar[LLMUsage | None] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def _track_usage() -> Iterator[LLMUsage]:
+    usage = LLMUsage()
+    token = _usage_ctx_var.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_ctx_var.reset(token)
+
+
+def _record_usage(raw_usage: Any, model: str) -> None:
+    """记录 GLM 响应中的 usage（OpenAI 兼容字段）；对冲请求的两次调用都会计入，因为都真实计费。"""
+    if raw_usage is None:
+        return
+    prompt_tokens = int(getattr(raw_usage, "prompt_tokens", 0) or 0)
+    completion_tokens = int(getattr(raw_usage, "completion_tokens", 0) or 0)
+    total_tokens = int(getattr(raw_usage, "total_tokens", 0) or 0) or prompt_tokens + completion_tokens
+    LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+    usage = _usage_ctx_var.get()
+    if usage is None:
+        return
+    usage.prompt_tokens += prompt_tokens
+    usage.completion_tokens += completion_tokens
+    usage.total_tokens += total_tokens
+    usage.reported = True
+
+
+def _record_latency(seconds: float) -> None:
+    usage = _usage_ctx_var.get()
+    if usage is None:
+        return
+    usage.calls += 1
+    usage.latency_ms += int(seconds * 1000)
+
 
 class LLMService:
     """LLM 服务：构建 Prompt、调用 GLM、校验输出格式。
@@ -28,6 +235,9 @@ class LLMService:
     类似 Java 的 Service 层，封装了对大模型的调用逻辑。
     """
 
+    # 所有实例共享的 GLM 调用耗时窗口，用于估算请求对冲的触发时机（p95）
+    _latency = LatencyWindow(size=200)
+
     def __init__(self) -> None:
         self._settings = get_settings()
         # 构造函数中检查依赖
@@ -77,7 +287,11 @@ class LLMService:
             {"role": "user", "content": content},
         ]
 
-    async def summarize(self, items: Sequence[CrawlItem]) -> LLMSummaryResult:
+    async def summarize(
+        self,
+        items: Sequence[CrawlItem],
+        on_insight: InsightCallback | None = None,
+    ) -> LLMSummaryResult:
         """
         核心业务方法：生成内容总结。
         
@@ -86,7 +300,20 @@ class LLMService:
         2. 构建 Prompt
         3. 调用大模型 (带重试机制)
         4. 解析返回结果 (Markdown -> 对象)
+
+        Args:
+            items: 待分析的资讯
+            on_insight: 流式模式（GLM_STREAM_ENABLED）下每解析出一条洞察就回调一次，调用方可提前落库/组装摘要
         """
+        with _track_usage() as usage:
+            result = await self._summarize(items, on_insight=on_insight)
+        return usage.apply_to(result)
+
+    async def _summarize(
+        self,
+        items: Sequence[CrawlItem],
+        on_insight: InsightCallback | None = None,
+    ) -> LLMSummaryResult:
         if not items:
             # 快速失败 (Fast Return)
             return LLMSummaryResult(
@@ -113,25 +340,59 @@ class LLMService:
 
         last_error: str | None = None
         last_raw_response: str | None = None
+        breaker = circuit_breakers.get("glm")
         
         # 重试循环 (Retry Loop)
         for attempt in range(self._settings.GLM_MAX_RETRIES + 1):
+            blocked_reason = self._precheck_call(breaker=breaker, attempt=attempt, last_error=last_error)
+            if blocked_reason is not None:
+                return LLMSummaryResult(
+                    status="failed",
+                    summary_markdown="",
+                    highlights=[],
+                    model=self._settings.GLM_MODEL,
+                    prompt_text=prompt_text,
+                    raw_response_text=last_raw_response,
+                    failure_reason=blocked_reason,
+                )
             try:
-                # await: 异步调用，不会阻塞主线程
-                raw_content = await self._call_glm(api_key=api_key, messages=messages)
+                if self._settings.GLM_STREAM_ENABLED:
+                    with tracer.span("glm.stream", model=self._settings.GLM_MODEL, attempt=attempt + 1):
+                        partial = await self._summarize_streaming(
+                            api_key=api_key,
+                            messages=messages,
+                            on_insight=on_insight,
+                        )
+                    if partial.status == "degraded":
+                        # 流中途断开但已拿到部分洞察：直接返回已完成的部分，不再整批重试
+                        breaker.record_failure(partial.failure_reason)
+                        partial.prompt_text = prompt_text
+                        publish_run_event("llm_call_done", status=partial.status, attempt=attempt + 1, items=len(items))
+                        return partial
+                    raw_content = partial.raw_response_text or ""
+                else:
+                    # await: 异步调用，不会阻塞主线程
+                    raw_content = await self._call_glm(api_key=api_key, messages=messages)
+                breaker.record_success()
                 last_raw_response = raw_content
                 
                 # 解析 Markdown 结果
-                parsed = self._parse_summary_response(raw_content)
+                # 返回文本较长时解析放到进程池，避免长文本正则占住事件循环
+                parsed = await process_pool.run(
+                    parse_summary_response,
+                    raw_content,
+                    size=len(raw_content),
+                    min_size=self._settings.PROCESS_POOL_MIN_PARSE_CHARS,
+                )
                 parsed.model = self._settings.GLM_MODEL
                 parsed.prompt_text = prompt_text
                 parsed.raw_response_text = raw_content
+                publish_run_event("llm_call_done", status=parsed.status, attempt=attempt + 1, items=len(items))
                 return parsed
                 
             except Exception as e:
                 last_error = str(e)
-                # 简单的指数退避 (Exponential Backoff) 可以加在这里
-                await asyncio.sleep(1) 
+                await self._after_call_failure(breaker=breaker, attempt=attempt, error=last_error)
 
         # 重试耗尽，返回失败结果
         return LLMSummaryResult(
@@ -144,62 +405,519 @@ class LLMService:
             failure_reason=f"max_retries_exceeded: {last_error}",
         )
     
+    def build_item_messages(self, items: Sequence[CrawlItem]) -> list[dict[str, str]]:
+        """
+        构建逐条分析的 JSON 模式 Prompt：要求模型只输出 JSON，解析时不再依赖正则逐行抓取。
+        """
+        payload = [
+            {
+                "tweet_id": item.tweet_id,
+                "author": item.author_username,
+                "text": item.text,
+                "url": item.url,
+                "published_at": str(item.published_at) if item.published_at else None,
+            }
+            for item in items
+        ]
+        content = (
+            "请逐条分析以下推文的技术价值，只输出一个 JSON 对象，不要输出任何解释或 Markdown。\n"
+            "格式：\n"
+            '{"items": [{"tweet_id": "<输入中的 tweet_id>", "ai_score": <0-100整数>, '
+            '"summary": "<40-120字中文总结，说明可落地的技术要点>", "ai_title": "<不超过20字的中文标题>"}]}\n\n'
+            "要求：\n"
+            "1) 每条输入都必须输出一项，tweet_id 原样返回，不要编造输入中不存在的 ID。\n"
+            "2) ai_score 代表技术价值与可执行性。\n\n"
+            f"输入数据：\n{json.dumps(payload, ensure_ascii=False)}"
+        )
+        return [
+            {"role": "system", "content": "你是一个严谨的技术情报分析助手，只输出合法 JSON。"},
+            {"role": "user", "content": content},
+        ]
+
+    def prompt_fingerprint(self) -> str:
+        """
+        当前提示词模板 + 模型 + 输出格式的指纹，随分析结果一起落库。
+
+        用固定的探针条目渲染两套模板（JSON 与 Markdown 兜底），只有模板文本本身变化才会改变指纹。
+        """
+        probe = CrawlItem(
+            source="fingerprint",
+            tweet_id="0",
+            author_username="probe",
+            url="https://example.com/0",
+            text="probe",
+            published_at=None,
+            hotness=0,
+            raw_payload={},
+        )
+        material = json.dumps(
+            {
+                "model": self._settings.GLM_MODEL,
+                "output_mode": self._settings.LLM_OUTPUT_MODE,
+                "item_messages": self.build_item_messages([probe]),
+                "markdown_messages": self.build_messages([probe]),
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+    async def analyze_items(self, items: Sequence[CrawlItem]) -> LLMBatchItemAnalysisResult:
+        """
+        逐条分析资讯（AI 缓存与单条重分析使用）：按 LLM_ANALYZE_BATCH_SIZE 分批调用，合并结果。
+
+        LLM_OUTPUT_MODE=json 时使用 JSON 模式（response_format=json_object）并直接解析为结构化结果；
+        JSON 解析不出任何条目时，同一批次退回 Markdown 模板再请求一次（额外的一次请求，不占用 GLM_MAX_RETRIES）。
+
+        某批次输出缺少部分 ID（漏答/解析失败）时，只把缺失的条目并入下一批重新请求，
+        已成功分析的条目不再重复付费；每条最多请求 LLM_ITEM_MAX_ATTEMPTS 次。
+
+        返回结果附带本次（含重试、分批、对冲）实际消耗的 token 与 GLM 耗时。
+        """
+        with _track_usage() as usage:
+            result = await self._analyze_items(items)
+        return usage.apply_to(result)
+
+    async def _analyze_items(self, items: Sequence[CrawlItem]) -> LLMBatchItemAnalysisResult:
+        if not items:
+            return LLMBatchItemAnalysisResult(
+                status="degraded",
+                model=self._settings.GLM_MODEL,
+                failure_reason="no_input_items",
+            )
+
+        batch_size = max(1, self._settings.LLM_ANALYZE_BATCH_SIZE)
+        max_attempts = max(1, self._settings.LLM_ITEM_MAX_ATTEMPTS)
+        pending: deque[CrawlItem] = deque(items)
+        attempts: dict[str, int] = {}
+        insights: dict[str, LLMInsightItem] = {}
+        results: list[LLMBatchItemAnalysisResult] = []
+
+        while pending:
+            batch = [pending.popleft() for _ in range(min(batch_size, len(pending)))]
+            for item in batch:
+                attempts[item.tweet_id] = attempts.get(item.tweet_id, 0) + 1
+            result = await self._analyze_batch(batch)
+            results.append(result)
+            for insight in result.insights:
+                insights.setdefault(insight.tweet_id, insight)
+            if result.status == "failed":
+                # 整批失败（已在批内重试过 / 熔断 / 超出时间预算）：不再拆分重排，避免重复付费
+                continue
+            retry_items = [
+                item
+                for item in batch
+                if item.tweet_id not in insights and attempts[item.tweet_id] < max_attempts
+            ]
+            if retry_items:
+                publish_run_event("llm_items_requeued", count=len(retry_items))
+                pending.extend(retry_items)
+
+        missing_count = len([item for item in items if item.tweet_id not in insights])
+        status = "success"
+        failure_reason = None
+        if not insights:
+            status = "failed"
+            failure_reason = next(
+                (result.failure_reason for result in reversed(results) if result.failure_reason),
+                "no_valid_items_in_output",
+            )
+        elif missing_count:
+            status = "degraded"
+            failure_reason = f"missing_items_in_batch_output: {missing_count}"
+        return LLMBatchItemAnalysisResult(
+            status=status,
+            insights=[insights[item.tweet_id] for item in items if item.tweet_id in insights],
+            model=self._settings.GLM_MODEL,
+            prompt_text="\n\n".join(result.prompt_text for result in results if result.prompt_text),
+            raw_response_text="\n\n".join(result.raw_response_text for result in results if result.raw_response_text),
+            failure_reason=failure_reason,
+        )
+
+    async def _analyze_batch(self, items: list[CrawlItem]) -> LLMBatchItemAnalysisResult:
+        api_key = self._settings.ZAI_API_KEY
+        json_mode = self._settings.LLM_OUTPUT_MODE == "json"
+        messages = self.build_item_messages(items) if json_mode else self.build_messages(items)
+        prompt_text = self._messages_to_text(messages)
+        if not api_key:
+            return LLMBatchItemAnalysisResult(
+                status="failed",
+                model=self._settings.GLM_MODEL,
+                prompt_text=prompt_text,
+                failure_reason="missing_zai_api_key",
+            )
+
+        allowed_ids = {item.tweet_id for item in items}
+        last_error: str | None = None
+        last_raw_response: str | None = None
+        breaker = circuit_breakers.get("glm")
+        max_attempts = self._settings.GLM_MAX_RETRIES + 1
+        attempt = 0
+        while attempt < max_attempts:
+            blocked_reason = self._precheck_call(breaker=breaker, attempt=attempt, last_error=last_error)
+            if blocked_reason is not None:
+                return LLMBatchItemAnalysisResult(
+                    status="failed",
+                    model=self._settings.GLM_MODEL,
+                    prompt_text=prompt_text,
+                    raw_response_text=last_raw_response,
+                    failure_reason=blocked_reason,
+                )
+            try:
+                raw_content = await self._call_glm(
+                    api_key=api_key,
+                    messages=messages,
+                    response_format={"type": "json_object"} if json_mode else None,
+                )
+                breaker.record_success()
+            except Exception as e:
+                last_error = str(e)
+                await self._after_call_failure(breaker=breaker, attempt=attempt, error=last_error)
+                attempt += 1
+                continue
+
+            last_raw_response = raw_content
+            parser = parse_batch_item_output if json_mode else parse_markdown_item_output
+            insights = await process_pool.run(
+                parser,
+                raw_content,
+                allowed_ids,
+                size=len(raw_content),
+                min_size=self._settings.PROCESS_POOL_MIN_PARSE_CHARS,
+            )
+            if not insights and json_mode:
+                # JSON 解析失败：本批次退回 Markdown 模板，额外补一次请求，不占用重试次数
+                json_mode = False
+                max_attempts += 1
+                messages = self.build_messages(items)
+                prompt_text = self._messages_to_text(messages)
+                last_error = "json_output_unparseable"
+                publish_run_event("llm_call_failed", attempt=attempt + 1, error=last_error)
+                attempt += 1
+                continue
+            if not insights:
+                last_error = "no_valid_items_in_output"
+                publish_run_event("llm_call_failed", attempt=attempt + 1, error=last_error)
+                attempt += 1
+                continue
+
+            missing = len(allowed_ids - {insight.tweet_id for insight in insights})
+            status = "success" if missing == 0 else "degraded"
+            publish_run_event("llm_call_done", status=status, attempt=attempt + 1, items=len(items))
+            return LLMBatchItemAnalysisResult(
+                status=status,
+                insights=insights,
+                model=self._settings.GLM_MODEL,
+                prompt_text=prompt_text,
+                raw_response_text=raw_content,
+                failure_reason=f"missing_items_in_batch_output: {missing}" if missing else None,
+            )
+
+        return LLMBatchItemAnalysisResult(
+            status="failed",
+            model=self._settings.GLM_MODEL,
+            prompt_text=prompt_text,
+            raw_response_text=last_raw_response,
+            failure_reason=f"max_retries_exceeded: {last_error}",
+        )
+
     # 私有方法 (Private Methods) 以 _ 开头
     # Python 没有 private 关键字，这是一种约定
     def _messages_to_text(self, messages: list[dict[str, str]]) -> str:
         return json.dumps(messages, ensure_ascii=False)
 
-    async def _call_glm(self, api_key: str, messages: list[dict[str, str]]) -> str:
+    def _precheck_call(self, breaker: CircuitBreaker, attempt: int, last_error: str | None) -> str | None:
+        """调用前检查：时间预算用完或熔断打开时返回降级原因，否则返回 None。"""
+        # 整体时间预算用完：剩余分析直接降级，保证整次运行的最坏耗时有上限
+        budget = remaining_run_budget()
+        if budget is not None and budget <= 0:
+            publish_run_event("llm_call_failed", attempt=attempt + 1, error="run_deadline_exceeded")
+            return f"run_deadline_exceeded{f' ({last_error})' if last_error else ''}"
+        # 熔断打开时直接降级，不再逐个监控源等超时 + sleep 重试
+        if not breaker.allow():
+            publish_run_event("llm_call_failed", attempt=attempt + 1, error="circuit_open")
+            return f"circuit_open: glm{f' ({last_error})' if last_error else ''}"
+        return None
+
+    async def _after_call_failure(self, breaker: CircuitBreaker, attempt: int, error: str) -> None:
+        breaker.record_failure(error)
+        publish_run_event("llm_call_failed", attempt=attempt + 1, error=error)
+        if breaker.state == CircuitBreaker.OPEN:
+            # 已熔断：下一轮会直接降级，无需再等待
+            return
+        # 简单的指数退避 (Exponential Backoff) 可以加在这里
+        await asyncio.sleep(1)
+
+    async def _call_glm(
+        self,
+        api_key: str,
+        messages: list[dict[str, str]],
+        response_format: dict[str, str] | None = None,
+    ) -> str:
+        """
+        调用 GLM：单次调用不超过 GLM_TIMEOUT_SECONDS，且不超过本次运行剩余的时间预算；
+        开启对冲时，超过近期 p95 耗时仍未返回则补发一个请求，取先返回的结果。
+        """
+        timeout = self._call_timeout()
+        if timeout <= 0:
+            raise TimeoutError("run_deadline_exceeded")
+        hedge_delay = self._hedge_delay(timeout)
+        if hedge_delay is None:
+            request = self._timed_request(
+                api_key=api_key,
+                messages=messages,
+                timeout=timeout,
+                response_format=response_format,
+            )
+        else:
+            request = self._hedged_request(
+                api_key=api_key,
+                messages=messages,
+                timeout=timeout,
+                delay=hedge_delay,
+                response_format=response_format,
+            )
+        # 指标记录调用方感知的耗时（含对冲与超时），与仅统计成功请求的 p95 窗口不同
+        with tracer.span(
+            "glm.call",
+            model=self._settings.GLM_MODEL,
+            timeout_seconds=round(timeout, 1),
+            hedged=hedge_delay is not None,
+        ), UPSTREAM_REQUEST_SECONDS.time(upstream="glm"):
+            started = time.monotonic()
+            try:
+                return await asyncio.wait_for(request, timeout=timeout)
+            except asyncio.TimeoutError as exc:
+                raise TimeoutError(f"glm_timeout_after_{timeout:.1f}s") from exc
+            finally:
+                _record_latency(time.monotonic() - started)
+
+    async def _summarize_streaming(
+        self,
+        api_key: str,
+        messages: list[dict[str, str]],
+        on_insight: InsightCallback | None,
+    ) -> LLMSummaryResult:
+        """
+        流式调用：边接收边解析洞察行。
+        - 正常结束：返回 status=success，raw_response_text 为完整文本（由调用方统一解析）
+        - 中途失败但已有洞察：返回 status=degraded 的部分结果
+        - 中途失败且没有任何洞察：抛出异常，交给外层重试
+        """
+        timeout = self._call_timeout()
+        if timeout <= 0:
+            raise TimeoutError("run_deadline_exceeded")
+        parser = InsightStreamParser()
+        chunks: list[str] = []
+        deadline = time.monotonic() + timeout
+        started = time.monotonic()
+
+        async def _emit(produced: list[LLMInsightItem]) -> None:
+            for insight in produced:
+                publish_run_event("llm_insight", tweet_id=insight.tweet_id, ai_score=insight.ai_score)
+                if on_insight is not None:
+                    ret = on_insight(insight)
+                    if asyncio.iscoroutine(ret):
+                        await ret
+
+        stream = self._stream_glm(api_key=api_key, messages=messages, timeout=timeout)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(stream), timeout=max(0.0, deadline - time.monotonic()))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError as exc:
+                    raise TimeoutError(f"glm_timeout_after_{timeout:.1f}s") from exc
+                chunks.append(chunk)
+                await _emit(parser.feed(chunk))
+        except Exception as exc:
+            UPSTREAM_REQUEST_SECONDS.observe(time.monotonic() - started, upstream="glm_stream", status="error")
+            _record_latency(time.monotonic() - started)
+            if not parser.insights:
+                raise
+            return LLMSummaryResult(
+                status="degraded",
+                summary_markdown="".join(chunks),
+                insights=list(parser.insights),
+                model=self._settings.GLM_MODEL,
+                raw_response_text="".join(chunks),
+                failure_reason=f"stream_truncated: {exc}",
+            )
+        finally:
+            await stream.aclose()
+
+        await _emit(parser.finish())
+        LLMService._latency.record(time.monotonic() - started)
+        UPSTREAM_REQUEST_SECONDS.observe(time.monotonic() - started, upstream="glm_stream", status="ok")
+        _record_latency(time.monotonic() - started)
+        return LLMSummaryResult(status="success", raw_response_text="".join(chunks), insights=list(parser.insights))
+
+    async def _stream_glm(
+        self,
+        api_key: str,
+        messages: list[dict[str, str]],
+        timeout: float,
+    ) -> AsyncIterator[str]:
+        """
+        以 stream=True 调用 GLM，逐段产出文本增量。
+        SDK 的流式迭代是同步阻塞的，放到线程里消费，通过队列把增量交回事件循环。
+        """
+        client = ZhipuAiClient(
+            api_key=api_key,
+            base_url=self._settings.ZAI_BASE_URL or None,
+            timeout=timeout,
+            max_retries=0,
+        )
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[object] = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def _put(value: object) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, value)
+            except RuntimeError:
+                # 事件循环已关闭（进程退出中），丢弃剩余内容
+                stop.set()
+
+        def _produce() -> None:
+            try:
+                response = client.chat.completions.create(
+                    model=self._settings.GLM_MODEL,
+                    messages=messages,
+                    stream=True,
+                    temperature=0.1,
+                )
+                for chunk in response:
+                    if stop.is_set():
+                        break
+                    # 流式响应的 usage 只出现在最后一个分片中
+                    if getattr(chunk, "usage", None) is not None:
+                        _record_usage(chunk.usage, model=self._settings.GLM_MODEL)
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        _put(delta)
+            except BaseException as exc:  # noqa: BLE001
+                _put(exc)
+            finally:
+                _put(done)
+
+        producer = asyncio.ensure_future(asyncio.to_thread(_produce))
+        try:
+            while (value := await queue.get()) is not done:
+                if isinstance(value, BaseException):
+                    raise value
+                yield value  # type: ignore[misc]
+        finally:
+            # 调用方提前结束（超时/取消）时通知线程停止读取
+            stop.set()
+            producer.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    def _call_timeout(self) -> float:
+        timeout = max(0.1, self._settings.GLM_TIMEOUT_SECONDS)
+        budget = remaining_run_budget()
+        return timeout if budget is None else min(timeout, budget)
+
+    def _hedge_delay(self, timeout: float) -> float | None:
+        """返回对冲请求的发出时机（秒）；样本不足或 p95 已接近超时则不对冲。"""
+        if not self._settings.GLM_HEDGE_ENABLED:
+            return None
+        if len(self._latency) < max(1, self._settings.GLM_HEDGE_MIN_SAMPLES):
+            return None
+        delay = self._latency.quantile(self._settings.GLM_HEDGE_QUANTILE)
+        if delay is None or delay >= timeout:
+            return None
+        return delay
+
+    async def _hedged_request(
+        self,
+        api_key: str,
+        messages: list[dict[str, str]],
+        timeout: float,
+        delay: float,
+        response_format: dict[str, str] | None = None,
+    ) -> str:
+        def _start() -> asyncio.Task[str]:
+            return asyncio.create_task(
+                self._timed_request(
+                    api_key=api_key,
+                    messages=messages,
+                    timeout=timeout,
+                    response_format=response_format,
+                )
+            )
+
+        primary = _start()
+        pending: set[asyncio.Task[str]] = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if primary in done:
+                return primary.result()
+
+            publish_run_event("llm_call_hedged", delay=round(delay, 3))
+            hedge = _start()
+            pending.add(hedge)
+            last_exc: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_exc = task.exception()
+            assert last_exc is not None
+            raise last_exc
+        finally:
+            # 取消落后的请求（线程中的同步调用无法中断，其结果会被直接丢弃）
+            for task in pending:
+                task.cancel()
+
+    async def _timed_request(
+        self,
+        api_key: str,
+        messages: list[dict[str, str]],
+        timeout: float,
+        response_format: dict[str, str] | None = None,
+    ) -> str:
+        started = time.monotonic()
+        content = await self._request_glm(
+            api_key=api_key,
+            messages=messages,
+            timeout=timeout,
+            response_format=response_format,
+        )
+        LLMService._latency.record(time.monotonic() - started)
+        return content
+
+    async def _request_glm(
+        self,
+        api_key: str,
+        messages: list[dict[str, str]],
+        timeout: float,
+        response_format: dict[str, str] | None = None,
+    ) -> str:
         """调用智谱 GLM API 的底层实现。"""
-        # 实例化客户端
-        client = ZhipuAiClient(api_key=api_key)
+        # 实例化客户端：超时交给 SDK 的 HTTP 层，重试由 summarize 的重试循环统一控制（SDK 默认会再重试 3 次）
+        client = ZhipuAiClient(
+            api_key=api_key,
+            base_url=self._settings.ZAI_BASE_URL or None,
+            timeout=timeout,
+            max_retries=0,
+        )
         
         # 运行在线程池中，因为 ZhipuAiClient 可能是同步的库
         # asyncio.to_thread 是 Python 3.9+ 的特性，用于把同步阻塞代码放到异步线程池运行
+        options: dict[str, Any] = {}
+        if response_format is not None:
+            # JSON 模式：由模型侧约束输出为合法 JSON 对象
+            options["response_format"] = response_format
         response = await asyncio.to_thread(
             client.chat.completions.create,
             model=self._settings.GLM_MODEL,
             messages=messages,
             stream=False,
             temperature=0.1, # 低温度，让回答更确定、更严谨
+            **options,
         )
+        _record_usage(getattr(response, "usage", None), model=self._settings.GLM_MODEL)
         return response.choices[0].message.content or ""
-
-    def _parse_summary_response(self, text: str) -> LLMSummaryResult:
-        """
-        解析器：把大模型返回的非结构化 Markdown 文本，
-        通过正则 (Regex) 提取为结构化的 LLMSummaryResult 对象。
-        """
-        # 1. 提取综合评分
-        score_match = re.search(r"综合评分[:：]\s*(\d+)", text)
-        overall_score = int(score_match.group(1)) if score_match else 0
-
-        # 2. 提取每条洞察 (Insight)
-        insights: list[LLMInsightItem] = []
-        # 正则解释：
-        # ID:\s*(.*?): 匹配 ID: 后的内容，非贪婪匹配
-        # AI评分:\s*(\d+): 匹配分数
-        # 观点:\s*(.*): 匹配观点内容
-        pattern = re.compile(r"ID:\s*(.*?)\s*\|\s*AI评分:\s*(\d+)\s*\|\s*观点:\s*(.*)")
-        
-        for line in text.split("\n"):
-            line = line.strip()
-            if not line.startswith("-"):
-                continue
-                
-            match = pattern.search(line)
-            if match:
-                insights.append(
-                    LLMInsightItem(
-                        tweet_id=match.group(1).strip(),
-                        ai_score=int(match.group(2)),
-                        summary=match.group(3).strip(),
-                    )
-                )
-
-        return LLMSummaryResult(
-            status="success",
-            summary_markdown=text,
-            overall_score=overall_score,
-            insights=insights,
-        )
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import time
 from dataclasses import dataclass, field
 from urllib.parse import urlparse
 
 import httpx
 
 from core import app_now
+from core.circuit_breaker import circuit_breakers
+from core.metrics import WEBHOOK_DELIVERY_SECONDS
+from core.process_pool import process_pool
+from core.tracing import tracer
 from models import ChannelPlatform, PushChannel
 
 logger = logging.getLogger(__name__)
@@ -33,6 +39,151 @@ class DigestItem:
     ai_summary_list: list[str] = field(default_factory=list)
 
 
+_DIGEST_TITLE = "AI 技术资讯摘要"
+
+
+# 以下渲染函数均为模块级纯函数（入参/返回值可 pickle），条目较多时由 process_pool 提交到子进程执行
+def score_stars(score: int | None) -> str:
+    if score is None:
+        return "☆☆☆☆☆"
+    stars = max(0, min(5, round(score / 2)))
+    return "★" * stars + "☆" * (5 - stars)
+
+
+def render_digest_markdown(
+    source_name: str,
+    summary_markdown: str,
+    digest_items: list[DigestItem] | None,
+    now_text: str,
+) -> str:
+    if digest_items:
+        chunks = [
+            f"## 🚀 AI 技术情报速递\n> 🧭 监控源: `{source_name}`\n> 🕒 生成时间: `{now_text}`\n",
+        ]
+        for item in digest_items:
+            tags = "、".join(item.tags) if item.tags else "-"
+            score = item.score if item.score is not None else "-"
+            stars = score_stars(item.score)
+            ai_lines = item.ai_summary_list or ["AI 暂未给出提炼。"]
+            ai_text = "\n".join([f"  - {line}" for line in ai_lines[:3]])
+            chunks.append(
+                "\n".join(
+                    [
+                        f"# 🚀 [{item.title}]({item.url})",
+                        "",
+                        "**📊 资讯概览**",
+                        f"- **🔍 来源**：#{item.source}#",
+                        f"- **⭐️ AI 推荐度**：{stars} ({score}/10)",
+                        f"- **🏷️ 领域标签**：`#{tags}#`",
+                        f"- **🕒 发布于**：{item.publish_time}",
+                        "- **🤖 AI 核心提炼**：",
+                        ai_text,
+                        "",
+                        "---",
+                    ]
+                )
+            )
+        return "\n".join(chunks)
+
+    return (
+        f"## 🚀 AI 技术情报速递\n"
+        f"> 🧭 监控源: `{source_name}`\n"
+        f"> 🕒 生成时间: `{now_text}`\n\n"
+        f"---\n\n"
+        f"{summary_markdown}\n"
+    )
+
+
+def render_feishu_post_payload(markdown: str, title: str, digest_items: list[DigestItem]) -> dict:
+    if digest_items:
+        content_rows: list[list[dict[str, str]]] = []
+        for item in digest_items:
+            tags = "、".join(item.tags) if item.tags else "-"
+            score = item.score if item.score is not None else "-"
+            stars = score_stars(item.score)
+            content_rows.append([{"tag": "text", "text": "🚀 "}, {"tag": "a", "text": item.title, "href": item.url}])
+            content_rows.append([{"tag": "text", "text": "📊 资讯概览"}])
+            content_rows.append([{"tag": "text", "text": f"🔍 来源：#{item.source}#"}])
+            content_rows.append([{"tag": "text", "text": f"⭐️ AI 推荐度：{stars} ({score}/10)"}])
+            content_rows.append([{"tag": "text", "text": f"🏷️ 领域标签：#{tags}#"}])
+            content_rows.append([{"tag": "text", "text": f"🕒 发布于：{item.publish_time}"}])
+            content_rows.append([{"tag": "text", "text": "🤖 AI 核心提炼："}])
+            for line in (item.ai_summary_list or ["AI 暂未给出提炼。"])[:3]:
+                content_rows.append([{"tag": "text", "text": f"• {line}"}])
+            content_rows.append([{"tag": "text", "text": "----------------"}])
+        return {
+            "msg_type": "post",
+            "content": {
+                "post": {
+                    "zh_cn": {
+                        "title": title,
+                        "content": content_rows,
+                    }
+                }
+            },
+        }
+
+    lines = [line for line in markdown.splitlines() if line.strip()]
+    content_rows: list[list[dict[str, str]]] = []
+    for line in lines:
+        content_rows.append([{"tag": "text", "text": f"{line}\n"}])
+
+    return {
+        "msg_type": "post",
+        "content": {
+            "post": {
+                "zh_cn": {
+                    "title": title,
+                    "content": content_rows,
+                }
+            }
+        },
+    }
+
+
+def render_platform_payload(platform: str, markdown: str, digest_items: list[DigestItem]) -> dict:
+    if platform == ChannelPlatform.WECHAT.value:
+        return {
+            "msgtype": "markdown",
+            "markdown": {"content": markdown},
+        }
+
+    if platform == ChannelPlatform.FEISHU.value:
+        return render_feishu_post_payload(markdown=markdown, title=_DIGEST_TITLE, digest_items=digest_items)
+
+    if platform == ChannelPlatform.DINGTALK.value:
+        return {
+            "msgtype": "markdown",
+            "markdown": {
+                "title": _DIGEST_TITLE,
+                "text": markdown,
+            },
+        }
+
+    raise ValueError(f"unsupported_platform: {platform}")
+
+
+def render_channel_payload(
+    platform: str,
+    source_name: str,
+    summary_markdown: str,
+    digest_items: list[DigestItem],
+    now_text: str,
+) -> dict:
+    """渲染单个渠道的完整请求体（Markdown + 平台格式），作为进程池的一个任务。"""
+    markdown = render_digest_markdown(
+        source_name=source_name,
+        summary_markdown=summary_markdown,
+        digest_items=digest_items,
+        now_text=now_text,
+    )
+    return render_platform_payload(platform=platform, markdown=markdown, digest_items=digest_items)
+
+
+def _channel_platform(channel: PushChannel) -> str:
+    return channel.platform.value if isinstance(channel.platform, ChannelPlatform) else str(channel.platform)
+
+
 class NotifyService:
     """Webhook 推送服务，支持企业微信/飞书/钉钉。"""
 
@@ -42,42 +193,11 @@ class NotifyService:
         summary_markdown: str,
         digest_items: list[DigestItem] | None = None,
     ) -> str:
-        now_text = app_now().strftime("%Y-%m-%d %H:%M")
-        if digest_items:
-            chunks = [
-                f"## 🚀 AI 技术情报速递\n> 🧭 监控源: `{source_name}`\n> 🕒 生成时间: `{now_text}`\n",
-            ]
-            for item in digest_items:
-                tags = "、".join(item.tags) if item.tags else "-"
-                score = item.score if item.score is not None else "-"
-                stars = self._score_stars(item.score)
-                ai_lines = item.ai_summary_list or ["AI 暂未给出提炼。"]
-                ai_text = "\n".join([f"  - {line}" for line in ai_lines[:3]])
-                chunks.append(
-                    "\n".join(
-                        [
-                            f"# 🚀 [{item.title}]({item.url})",
-                            "",
-                            "**📊 资讯概览**",
-                            f"- **🔍 来源**：#{item.source}#",
-                            f"- **⭐️ AI 推荐度**：{stars} ({score}/10)",
-                            f"- **🏷️ 领域标签**：`#{tags}#`",
-                            f"- **🕒 发布于**：{item.publish_time}",
-                            "- **🤖 AI 核心提炼**：",
-                            ai_text,
-                            "",
-                            "---",
-                        ]
-                    )
-                )
-            return "\n".join(chunks)
-
-        return (
-            f"## 🚀 AI 技术情报速递\n"
-            f"> 🧭 监控源: `{source_name}`\n"
-            f"> 🕒 生成时间: `{now_text}`\n\n"
-            f"---\n\n"
-            f"{summary_markdown}\n"
+        return render_digest_markdown(
+            source_name=source_name,
+            summary_markdown=summary_markdown,
+            digest_items=digest_items,
+            now_text=app_now().strftime("%Y-%m-%d %H:%M"),
         )
 
     async def notify_channels(
@@ -91,109 +211,57 @@ class NotifyService:
             return []
 
         timeout = httpx.Timeout(15.0)
-        results: list[NotifyResult] = []
+        now_text = app_now().strftime("%Y-%m-%d %H:%M")
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            tasks = []
-            for channel in channels:
-                # 飞书渠道只推送前10条（默认 digest_items 已按热度降序）。
-                channel_items = digest_items or []
-                platform = channel.platform.value if isinstance(channel.platform, ChannelPlatform) else str(channel.platform)
-                if platform == ChannelPlatform.FEISHU.value:
-                    channel_items = channel_items[:10]
-
-                markdown = self.build_markdown(
-                    source_name=source_name,
-                    summary_markdown=summary_markdown,
-                    digest_items=channel_items,
+        renders = []
+        for channel in channels:
+            # 飞书渠道只推送前10条（默认 digest_items 已按热度降序）。
+            channel_items = digest_items or []
+            platform = _channel_platform(channel)
+            if platform == ChannelPlatform.FEISHU.value:
+                channel_items = channel_items[:10]
+            renders.append(
+                process_pool.run(
+                    render_channel_payload,
+                    platform,
+                    source_name,
+                    summary_markdown,
+                    channel_items,
+                    now_text,
+                    size=len(channel_items),
                 )
-                payload = self._build_payload(channel=channel, markdown=markdown, digest_items=channel_items)
-                tasks.append(self._send_one(client=client, channel=channel, payload=payload))
-
-            if tasks:
-                results = list(await asyncio.gather(*tasks))
+            )
+        payloads = list(await asyncio.gather(*renders))
 
-        return results
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            tasks = [
+                self._send_one(client=client, channel=channel, payload=payload)
+                for channel, payload in zip(channels, payloads)
+            ]
+            return list(await asyncio.gather(*tasks))
 
     def _build_payload(self, channel: PushChannel, markdown: str, digest_items: list[DigestItem]) -> dict:
-        platform = channel.platform.value if isinstance(channel.platform, ChannelPlatform) else str(channel.platform)
-        title = "AI 技术资讯摘要"
-
-        if platform == ChannelPlatform.WECHAT.value:
-            return {
-                "msgtype": "markdown",
-                "markdown": {"content": markdown},
-            }
-
-        if platform == ChannelPlatform.FEISHU.value:
-            return self._build_feishu_post_payload(markdown=markdown, title=title, digest_items=digest_items)
-
-        if platform == ChannelPlatform.DINGTALK.value:
-            return {
-                "msgtype": "markdown",
-                "markdown": {
-                    "title": title,
-                    "text": markdown,
-                },
-            }
-
-        raise ValueError(f"unsupported_platform: {platform}")
+        return render_platform_payload(platform=_channel_platform(channel), markdown=markdown, digest_items=digest_items)
 
     def _build_feishu_post_payload(self, markdown: str, title: str, digest_items: list[DigestItem]) -> dict:
-        if digest_items:
-            content_rows: list[list[dict[str, str]]] = []
-            for item in digest_items:
-                tags = "、".join(item.tags) if item.tags else "-"
-                score = item.score if item.score is not None else "-"
-                stars = self._score_stars(item.score)
-                content_rows.append([{"tag": "text", "text": "🚀 "}, {"tag": "a", "text": item.title, "href": item.url}])
-                content_rows.append([{"tag": "text", "text": "📊 资讯概览"}])
-                content_rows.append([{"tag": "text", "text": f"🔍 来源：#{item.source}#"}])
-                content_rows.append([{"tag": "text", "text": f"⭐️ AI 推荐度：{stars} ({score}/10)"}])
-                content_rows.append([{"tag": "text", "text": f"🏷️ 领域标签：#{tags}#"}])
-                content_rows.append([{"tag": "text", "text": f"🕒 发布于：{item.publish_time}"}])
-                content_rows.append([{"tag": "text", "text": "🤖 AI 核心提炼："}])
-                for line in (item.ai_summary_list or ["AI 暂未给出提炼。"])[:3]:
-                    content_rows.append([{"tag": "text", "text": f"• {line}"}])
-                content_rows.append([{"tag": "text", "text": "----------------"}])
-            return {
-                "msg_type": "post",
-                "content": {
-                    "post": {
-                        "zh_cn": {
-                            "title": title,
-                            "content": content_rows,
-                        }
-                    }
-                },
-            }
-
-        lines = [line for line in markdown.splitlines() if line.strip()]
-        content_rows: list[list[dict[str, str]]] = []
-        for line in lines:
-            content_rows.append([{"tag": "text", "text": f"{line}\n"}])
-
-        return {
-            "msg_type": "post",
-            "content": {
-                "post": {
-                    "zh_cn": {
-                        "title": title,
-                        "content": content_rows,
-                    }
-                }
-            },
-        }
+        return render_feishu_post_payload(markdown=markdown, title=title, digest_items=digest_items)
 
     @staticmethod
     def _score_stars(score: int | None) -> str:
-        if score is None:
-            return "☆☆☆☆☆"
-        stars = max(0, min(5, round(score / 2)))
-        return "★" * stars + "☆" * (5 - stars)
+        return score_stars(score)
 
     async def _send_one(self, client: httpx.AsyncClient, channel: PushChannel, payload: dict) -> NotifyResult:
         webhook_for_log = self._mask_webhook_url(channel.webhook_url)
+        # 每个 Webhook 地址独立熔断：一个失效的机器人不影响其他渠道，也不再每次都等满超时
+        breaker = circuit_breakers.get(self._breaker_name(channel.webhook_url))
+        if not breaker.allow():
+            logger.warning("webhook_send_skipped channel=%s webhook=%s reason=circuit_open", channel.name, webhook_for_log)
+            return NotifyResult(
+                channel_id=channel.id,
+                channel_name=channel.name,
+                success=False,
+                error=f"circuit_open: {breaker.name}",
+            )
         logger.info(
             "webhook_send_start channel=%s platform=%s webhook=%s payload_keys=%s",
             channel.name,
@@ -201,37 +269,61 @@ class NotifyService:
             webhook_for_log,
             list(payload.keys()),
         )
-        try:
-            resp = await client.post(channel.webhook_url, json=payload)
-            resp.raise_for_status()
-            body_preview = resp.text[:500] if resp.text else ""
-            logger.info(
-                "webhook_send_done channel=%s platform=%s webhook=%s status=%s response=%s",
-                channel.name,
-                channel.platform,
-                webhook_for_log,
-                resp.status_code,
-                body_preview,
-            )
-            return NotifyResult(
-                channel_id=channel.id,
-                channel_name=channel.name,
-                success=True,
-                status_code=resp.status_code,
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.exception(
-                "webhook_send_failed channel=%s platform=%s webhook=%s",
-                channel.name,
-                channel.platform,
-                webhook_for_log,
-            )
-            return NotifyResult(
-                channel_id=channel.id,
-                channel_name=channel.name,
-                success=False,
-                error=str(exc),
-            )
+        platform = str(getattr(channel.platform, "value", channel.platform))
+        with tracer.span("webhook.send", platform=platform, channel_id=channel.id) as span:
+            started = time.perf_counter()
+            try:
+                resp = await client.post(channel.webhook_url, json=payload)
+                resp.raise_for_status()
+                WEBHOOK_DELIVERY_SECONDS.observe(time.perf_counter() - started, platform=platform, status="ok")
+                breaker.record_success()
+                body_preview = resp.text[:500] if resp.text else ""
+                logger.info(
+                    "webhook_send_done channel=%s platform=%s webhook=%s status=%s response=%s",
+                    channel.name,
+                    channel.platform,
+                    webhook_for_log,
+                    resp.status_code,
+                    body_preview,
+                )
+                return NotifyResult(
+                    channel_id=channel.id,
+                    channel_name=channel.name,
+                    success=True,
+                    status_code=resp.status_code,
+                )
+            except Exception as exc:  # noqa: BLE001
+                WEBHOOK_DELIVERY_SECONDS.observe(time.perf_counter() - started, platform=platform, status="error")
+                span.set_error(exc)
+                # 异常文本带完整请求地址（含 key / access_token），熔断器只记录不含密钥的错误类型
+                breaker.record_failure(self._breaker_error(exc))
+                logger.exception(
+                    "webhook_send_failed channel=%s platform=%s webhook=%s",
+                    channel.name,
+                    channel.platform,
+                    webhook_for_log,
+                )
+                return NotifyResult(
+                    channel_id=channel.id,
+                    channel_name=channel.name,
+                    success=False,
+                    error=str(exc),
+                )
+
+    @classmethod
+    def _breaker_name(cls, url: str) -> str:
+        """
+        熔断器按完整 URL 的哈希区分：企业微信 / 钉钉的机器人只在查询参数（key / access_token）上不同，
+        脱敏后的地址会让同平台所有机器人共用一个熔断器。名称会出现在 /health/circuits，只含脱敏地址与哈希前缀。
+        """
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+        return f"webhook:{cls._mask_webhook_url(url)}#{digest}"
+
+    @staticmethod
+    def _breaker_error(exc: Exception) -> str:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return f"http_{exc.response.status_code}"
+        return type(exc).__name__
 
     @staticmethod
     def _mask_webhook_url(url: str) -> str:
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
-from dataclasses import dataclass
+import time
+import uuid
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core import app_now, get_settings, to_app_tz
+from core.metrics import PIPELINE_RUN_SECONDS, PIPELINE_SOURCE_RUNS, PIPELINE_STAGE_SECONDS
+from core.request_context import run_deadline_ctx_var, run_id_ctx_var
+from core.tracing import Span, current_span_ctx_var, tracer
 from db.session import SessionLocal
 from models import (
     ContentAIAnalysis,
@@ -22,10 +32,15 @@ from models import (
     SourceChannelBinding,
 )
 from schemas import CrawlItem, LLMInsightItem
+from services.adaptive_polling_service import AdaptivePollingService
 from services.content_filter_service import ContentFilterService
 from services.crawler_service import CrawlerService
 from services.llm_service import LLMService
 from services.notify_service import DigestItem, NotifyService
+from services.run_checkpoint_service import RunCheckpointService, SourceCheckpoint
+from services.run_item_registry import RunItemRegistry, SharedItemResult
+from services.run_event_bus import publish_run_event
+from services.run_lock_service import RunLease, RunLockService
 from services.scoring_service import ScoringService
 
 logger = logging.getLogger(__name__)
@@ -44,6 +59,9 @@ class SourceRunResult:
     cleaned_items: int
     notify_success_count: int
     error: str | None = None
+    # 本次新增入库的资讯条数与平均热度（自适应调度据此调整抓取频率）
+    new_items: int = 0
+    avg_hotness: float = 0.0
 
 
 @dataclass
@@ -51,6 +69,52 @@ class BatchRunResult:
     total_sources: int
     success_count: int
     failed_count: int
+    results: list[SourceRunResult] = field(default_factory=list)
+    # 因其他进程/任务正在执行，或去重窗口内已推送完成而跳过的监控源数量
+    skipped_count: int = 0
+    skipped_reason: str | None = None
+
+
+@dataclass
+class SourceRunContext:
+    """单个监控源在各阶段之间传递的中间结果（分阶段流水线中跨 worker 传递）。"""
+
+    source: MonitorSource
+    total_items: int = 0
+    cleaned: list[CrawlItem] = field(default_factory=list)
+    enriched_items: list[CrawlItem] = field(default_factory=list)
+    new_items: int = 0
+    summary_markdown: str = ""
+    digest_items: list[DigestItem] = field(default_factory=list)
+    error: str | None = None
+    lease: RunLease | None = None
+    # 批处理运行 ID 与续跑检查点；单独调用 run_source 时为空，不记录检查点
+    run_id: str | None = None
+    checkpoint: SourceCheckpoint | None = None
+    # 批处理内按 tweet_id 去重：同一条推文只落库、分析一次，再分发到各监控源的摘要
+    registry: RunItemRegistry | None = None
+    # 监控源级追踪 Span：分阶段流水线中各阶段在不同 worker 任务里执行，阶段 Span 都挂在它下面
+    span: Span | None = None
+
+
+@contextmanager
+def _stage_scope(ctx: SourceRunContext, stage: str) -> Iterator[None]:
+    """阶段计时：同时记录阶段耗时指标，并在监控源 Span 下创建阶段 Span。"""
+    token = current_span_ctx_var.set(ctx.span) if ctx.span is not None else None
+    try:
+        with tracer.span(f"pipeline.{stage}", source_id=ctx.source.id), PIPELINE_STAGE_SECONDS.time(stage=stage):
+            yield
+    finally:
+        if token is not None:
+            current_span_ctx_var.reset(token)
+
+
+def _end_source_span(ctx: SourceRunContext) -> None:
+    if ctx.span is None:
+        return
+    if ctx.error is not None:
+        ctx.span.set_error(ctx.error)
+    tracer.end_span(ctx.span)
 
 
 class PipelineService:
@@ -67,6 +131,9 @@ class PipelineService:
         llm_service: LLMService | None = None,
         notify_service: NotifyService | None = None,
         scoring_service: ScoringService | None = None,
+        run_lock_service: RunLockService | None = None,
+        checkpoint_service: RunCheckpointService | None = None,
+        adaptive_service: AdaptivePollingService | None = None,
     ) -> None:
         self._settings = get_settings()
         self._crawler = crawler_service or CrawlerService()
@@ -74,80 +141,589 @@ class PipelineService:
         self._llm = llm_service or LLMService()
         self._notify = notify_service or NotifyService()
         self._scoring = scoring_service or ScoringService()
+        self._locks = run_lock_service or RunLockService()
+        self._checkpoints = checkpoint_service or RunCheckpointService()
+        self._adaptive = adaptive_service or AdaptivePollingService()
 
-    async def run_source(self, session: AsyncSession, source: MonitorSource) -> SourceRunResult:
+    async def run_source(
+        self,
+        session: AsyncSession,
+        source: MonitorSource,
+        run_id: str | None = None,
+        checkpoint: SourceCheckpoint | None = None,
+        registry: RunItemRegistry | None = None,
+    ) -> SourceRunResult:
         """
-        处理单个监控源的全流程。
+        处理单个监控源的全流程（按阶段顺序执行）。
         
         Args:
             session: 数据库会话
             source: 监控源配置对象
+            run_id: 批处理运行 ID，传入时记录各阶段检查点
+            checkpoint: 续跑时该监控源已完成的检查点
+            registry: 批处理内共享的推文去重表
         """
+        ctx = await self._stage_crawl(source, run_id=run_id, checkpoint=checkpoint, registry=registry)
+        ctx = await self._stage_analyze(session=session, ctx=ctx)
+        return await self._stage_notify(session=session, ctx=ctx)
+
+    async def _stage_crawl(
+        self,
+        source: MonitorSource,
+        run_id: str | None = None,
+        checkpoint: SourceCheckpoint | None = None,
+        registry: RunItemRegistry | None = None,
+    ) -> SourceRunContext:
+        """阶段 1：抓取 -> 清洗 -> 评分（只访问外部 API，不占用数据库会话）。"""
+        ctx = SourceRunContext(source=source, run_id=run_id, checkpoint=checkpoint, registry=registry)
+        ctx.span = tracer.start_span("pipeline.source", source_id=source.id, source_type=source.type, value=source.value)
         logger.info("source_run_start source_id=%s type=%s value=%s", source.id, source.type, source.value)
+        publish_run_event("source_start", source_id=source.id, type=source.type, value=source.value)
+        if checkpoint is not None and checkpoint.items is not None:
+            # 续跑：直接复用上次保存的抓取结果（已清洗+评分），不再请求抓取 API
+            ctx.total_items = len(checkpoint.items)
+            ctx.cleaned = list(checkpoint.items)
+            ctx.enriched_items = list(checkpoint.items)
+            publish_run_event("crawled", source_id=source.id, count=ctx.total_items, resumed=True)
+            return ctx
         try:
             # 1. 抓取 (Crawl)
-            if source.type == "author":
-                crawl_result = await self._crawler.crawl_by_author(user_name=source.value)
-            elif source.type == "keyword":
-                crawl_result = await self._crawler.crawl_by_keyword(keyword=source.value, query_type="Top")
-            else:
-                raise ValueError(f"unsupported_source_type: {source.type}")
+            with _stage_scope(ctx, "crawl"):
+                if source.type == "author":
+                    crawl_result = await self._crawler.crawl_by_author(user_name=source.value)
+                elif source.type == "keyword":
+                    crawl_result = await self._crawler.crawl_by_keyword(keyword=source.value, query_type="Top")
+                else:
+                    raise ValueError(f"unsupported_source_type: {source.type}")
 
-            total_items = len(crawl_result.items)
+            ctx.total_items = len(crawl_result.items)
+            publish_run_event("crawled", source_id=source.id, count=ctx.total_items)
             
             # 2. 清洗 (Filter)
-            cleaned = self._filter.clean_items(crawl_result.items)
+            with _stage_scope(ctx, "filter"):
+                ctx.cleaned = self._filter.clean_items(crawl_result.items)
+            publish_run_event("cleaned", source_id=source.id, count=len(ctx.cleaned))
             
             # 3. 评分 (Score)
-            enriched_items = self._scoring.attach_hotness(cleaned)
+            with _stage_scope(ctx, "score"):
+                ctx.enriched_items = self._scoring.attach_hotness(ctx.cleaned)
+            await self._save_checkpoint(ctx, "crawled", items=ctx.enriched_items)
+        except Exception as e:
+            await self._mark_failed(ctx, e)
+        return ctx
+
+    async def _stage_analyze(self, session: AsyncSession, ctx: SourceRunContext) -> SourceRunContext:
+        """阶段 2：落库 -> AI 分析 -> 生成报告。"""
+        if ctx.error is not None or self._checkpoint_reached(ctx, "notified"):
+            return ctx
+        source = ctx.source
+        try:
+            # 同一次运行中其他监控源已认领的推文，由对方落库+分析，这里只等待结果
+            if ctx.registry is not None:
+                owned, shared = ctx.registry.claim(source.id, ctx.enriched_items)
+            else:
+                owned, shared = ctx.enriched_items, {}
+            try:
+                # 4. 落库 (Persist)
+                # 这一步很重要：先把内容存下来，防止后续步骤失败导致数据丢失
+                # 落库前先统计“真正新增”的条数，作为自适应调度的产出指标
+                with _stage_scope(ctx, "persist"):
+                    ctx.new_items = await self._count_new_items(session=session, items=owned)
+                    content_map = await self._upsert_content_items(session=session, items=owned)
+                publish_run_event(
+                    "persisted",
+                    source_id=source.id,
+                    count=len(content_map),
+                    new_items=ctx.new_items,
+                    shared=len(shared),
+                )
+                await self._save_checkpoint(ctx, "persisted")
 
-            # 4. 落库 (Persist)
-            # 这一步很重要：先把内容存下来，防止后续步骤失败导致数据丢失
-            content_map = await self._upsert_content_items(session=session, items=enriched_items)
+                # 5. AI 分析 (Analyze)
+                # 关键点：优先读 content_ai_analyses 表，只有缺失/文本变化才真正调用大模型
+                # 这是一个典型的“缓存优先”策略；续跑时已分析过的条目也因此直接复用，不会重复调用大模型
+                with _stage_scope(ctx, "analyze"):
+                    ai_insight_map = await self._build_ai_insight_map(
+                        session=session,
+                        source=source,
+                        items=owned,
+                        content_map=content_map,
+                    )
+            except BaseException:
+                if ctx.registry is not None:
+                    ctx.registry.abandon(owned)
+                raise
+            if ctx.registry is not None:
+                ctx.registry.resolve(owned, content_map=content_map, ai_insight_map=ai_insight_map)
+            if shared:
+                await self._merge_shared_items(
+                    session=session,
+                    ctx=ctx,
+                    shared=shared,
+                    content_map=content_map,
+                    ai_insight_map=ai_insight_map,
+                )
+            publish_run_event("analyzed", source_id=source.id, insights=len(ai_insight_map))
             
-            # 5. AI 分析 (Analyze)
-            # 关键点：优先读 content_ai_analyses 表，只有缺失/文本变化才真正调用大模型
-            # 这是一个典型的“缓存优先”策略
-            ai_insight_map = await self._build_ai_insight_map(
-                session=session,
+            # 6. 生成报告 (Summarize)
+            ctx.summary_markdown = self._build_summary_markdown(items=ctx.enriched_items, ai_insight_map=ai_insight_map)
+            ctx.digest_items = self._build_digest_items(
                 source=source,
-                items=enriched_items,
-                content_map=content_map,
+                items=ctx.enriched_items,
+                ai_insight_map=ai_insight_map,
             )
-            
-            # 6. 生成报告 (Summarize)
-            summary_markdown = self._build_summary_markdown(items=enriched_items, ai_insight_map=ai_insight_map)
-            digest_items = self._build_digest_items(source=source, items=enriched_items, ai_insight_map=ai_insight_map)
-
-            # 7. 推送 (Notify)
-            channels = await self._load_active_channels(session=session, source_id=source.id)
-            notify_results = await self._notify.notify_channels(
-                channels=channels,
-                source_name=source.value,
-                summary_markdown=summary_markdown,
-                digest_items=digest_items,
+            await self._save_checkpoint(ctx, "analyzed")
+        except Exception as e:
+            await self._mark_failed(ctx, e)
+        return ctx
+
+    async def _merge_shared_items(
+        self,
+        session: AsyncSession,
+        ctx: SourceRunContext,
+        shared: dict[str, asyncio.Future[SharedItemResult | None]],
+        content_map: dict[str, ContentItem],
+        ai_insight_map: dict[str, LLMInsightItem],
+    ) -> None:
+        """等待其他监控源处理的共享推文，把结果并入本监控源；对方失败的条目自行补处理。"""
+        fallback: list[CrawlItem] = []
+        items_by_id = {item.tweet_id: item for item in ctx.enriched_items}
+        for tweet_id, future in shared.items():
+            shared_result = await future
+            if shared_result is None:
+                fallback.append(items_by_id[tweet_id])
+                continue
+            if shared_result.content is not None:
+                content_map[tweet_id] = shared_result.content
+            if shared_result.insight is not None:
+                ai_insight_map[tweet_id] = shared_result.insight
+
+        if fallback:
+            fallback_content = await self._upsert_content_items(session=session, items=fallback)
+            content_map.update(fallback_content)
+            ai_insight_map.update(
+                await self._build_ai_insight_map(
+                    session=session,
+                    source=ctx.source,
+                    items=fallback,
+                    content_map=fallback_content,
+                )
             )
-            
-            # TODO: 记录 PushLog (省略了代码)
-            
+
+    async def _stage_notify(self, session: AsyncSession, ctx: SourceRunContext) -> SourceRunResult:
+        """阶段 3：推送 -> 汇总结果。"""
+        source = ctx.source
+        if ctx.error is None and self._checkpoint_reached(ctx, "notified"):
+            # 续跑：上次已推送成功，避免重复推送
+            publish_run_event("notified", source_id=source.id, resumed=True)
+            _end_source_span(ctx)
             return SourceRunResult(
                 source_id=source.id,
                 status=PushStatus.SUCCESS,
-                total_items=total_items,
-                cleaned_items=len(cleaned),
-                notify_success_count=len([r for r in notify_results if r]),
-            )
-            
-        except Exception as e:
-            logger.error("source_run_failed source_id=%s error=%s", source.id, e, exc_info=True)
-            return SourceRunResult(
-                source_id=source.id,
-                status=PushStatus.FAILED,
-                total_items=0,
-                cleaned_items=0,
+                total_items=ctx.total_items,
+                cleaned_items=len(ctx.cleaned),
                 notify_success_count=0,
-                error=str(e),
+                avg_hotness=self._average_hotness(ctx.enriched_items),
+            )
+        if ctx.error is None:
+            try:
+                # 7. 推送 (Notify)
+                with _stage_scope(ctx, "notify"):
+                    channels = await self._load_active_channels(session=session, source_id=source.id)
+                    notify_results = await self._notify.notify_channels(
+                        channels=channels,
+                        source_name=source.value,
+                        summary_markdown=ctx.summary_markdown,
+                        digest_items=ctx.digest_items,
+                    )
+                notify_success_count = len([r for r in notify_results if r.success])
+                publish_run_event(
+                    "notified",
+                    source_id=source.id,
+                    channels=len(channels),
+                    success=notify_success_count,
+                )
+
+                # TODO: 记录 PushLog (省略了代码)
+                await self._save_checkpoint(ctx, "notified")
+                _end_source_span(ctx)
+
+                return SourceRunResult(
+                    source_id=source.id,
+                    status=PushStatus.SUCCESS,
+                    total_items=ctx.total_items,
+                    cleaned_items=len(ctx.cleaned),
+                    notify_success_count=notify_success_count,
+                    new_items=ctx.new_items,
+                    avg_hotness=self._average_hotness(ctx.enriched_items),
+                )
+            except Exception as e:
+                await self._mark_failed(ctx, e)
+
+        _end_source_span(ctx)
+        return SourceRunResult(
+            source_id=source.id,
+            status=PushStatus.FAILED,
+            total_items=0,
+            cleaned_items=0,
+            notify_success_count=0,
+            error=ctx.error,
+        )
+
+    async def _mark_failed(self, ctx: SourceRunContext, exc: Exception) -> None:
+        logger.error("source_run_failed source_id=%s error=%s", ctx.source.id, exc, exc_info=True)
+        publish_run_event("source_failed", source_id=ctx.source.id, error=str(exc))
+        ctx.error = str(exc)
+        # 只记录错误，保留已完成的阶段，续跑时从失败的阶段继续
+        await self._save_checkpoint(ctx, None, error=ctx.error)
+
+    async def _save_checkpoint(
+        self,
+        ctx: SourceRunContext,
+        stage: str | None,
+        items: list[CrawlItem] | None = None,
+        error: str | None = None,
+    ) -> None:
+        if ctx.run_id is None:
+            return
+        try:
+            await self._checkpoints.save(
+                run_id=ctx.run_id,
+                source_id=ctx.source.id,
+                stage=stage,
+                items=items,
+                error=error,
             )
+        except Exception:  # noqa: BLE001
+            # 检查点只是续跑的辅助信息，写入失败不影响本次执行结果
+            logger.exception("run_checkpoint_save_failed source_id=%s stage=%s", ctx.source.id, stage)
+
+    @staticmethod
+    def _checkpoint_reached(ctx: SourceRunContext, stage: str) -> bool:
+        return ctx.checkpoint is not None and ctx.checkpoint.reached(stage)
+
+    async def run_all_active_sources(
+        self,
+        source_ids: list[int] | None = None,
+        resume_run_id: str | None = None,
+        due_only: bool = False,
+        skip_recent: bool = False,
+    ) -> BatchRunResult:
+        """
+        全局批处理：遍历 is_active=true 的监控源逐个执行。
+
+        Args:
+            source_ids: 只执行指定的监控源，None 表示全部
+            resume_run_id: 从指定运行的检查点续跑：已抓取的直接复用抓取结果，已推送的跳过
+            due_only: 自适应调度：持有全局锁后按数据库中的轮询状态只执行到期的监控源
+            skip_recent: 定时任务去重：跳过 PIPELINE_DEDUP_WINDOW_MINUTES 内已被其他运行推送完成的监控源
+        """
+        # worker 会把 job_id 设为 run_id；定时任务没有外部 ID 时这里生成一个，便于事件/日志串联
+        token = run_id_ctx_var.set(uuid.uuid4().hex) if run_id_ctx_var.get() == "-" else None
+        # 整体时间预算：各阶段 worker 任务在此之后创建，会继承该截止时间
+        deadline_seconds = self._settings.PIPELINE_RUN_DEADLINE_SECONDS
+        deadline_token = run_deadline_ctx_var.set(time.monotonic() + deadline_seconds if deadline_seconds > 0 else None)
+        try:
+            # 全局锁：多副本/多 worker 同时触发时只有一个真正执行，其余直接跳过
+            lease = await self._locks.acquire("pipeline:run_all")
+            if lease is None:
+                result = BatchRunResult(
+                    total_sources=0,
+                    success_count=0,
+                    failed_count=0,
+                    skipped_reason="run_lock_busy",
+                )
+            else:
+                try:
+                    with tracer.span(
+                        "pipeline.run",
+                        run_id=run_id_ctx_var.get(),
+                        resume_from=resume_run_id,
+                        source_count=len(source_ids) if source_ids is not None else None,
+                    ), PIPELINE_RUN_SECONDS.time():
+                        result = await self._run_while_leased(
+                            lease,
+                            self._run_sources(
+                                source_ids=source_ids,
+                                resume_run_id=resume_run_id,
+                                due_only=due_only,
+                                skip_recent=skip_recent,
+                            ),
+                        )
+                finally:
+                    await self._locks.release(lease)
+            publish_run_event(
+                "run_done",
+                total_sources=result.total_sources,
+                success_count=result.success_count,
+                failed_count=result.failed_count,
+                skipped_count=result.skipped_count,
+                skipped_reason=result.skipped_reason,
+            )
+            return result
+        finally:
+            run_deadline_ctx_var.reset(deadline_token)
+            if token is not None:
+                run_id_ctx_var.reset(token)
+
+    @staticmethod
+    async def _run_while_leased(lease: RunLease, batch: Coroutine[Any, Any, BatchRunResult]) -> BatchRunResult:
+        """
+        在租约有效期内执行批处理：续约失败（租约已被其他进程接管）时立即取消本次运行，
+        避免两个进程同时抓取、重复推送；已完成推送的监控源由检查点记录，可用 resume_run_id 续跑。
+        """
+        task = asyncio.create_task(batch)
+        try:
+            await asyncio.wait({task, lease.heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        if task.cancelled():
+            logger.error("batch_run_cancelled reason=run_lock_lost lock=%s", lease.name)
+            return BatchRunResult(total_sources=0, success_count=0, failed_count=0, skipped_reason="run_lock_lost")
+        return task.result()
+
+    async def _run_sources(
+        self,
+        source_ids: list[int] | None,
+        resume_run_id: str | None = None,
+        due_only: bool = False,
+        skip_recent: bool = False,
+    ) -> BatchRunResult:
+        async with SessionLocal() as session:
+            stmt = select(MonitorSource).where(MonitorSource.is_active.is_(True)).order_by(MonitorSource.id)
+            if source_ids is not None:
+                if not source_ids:
+                    return BatchRunResult(total_sources=0, success_count=0, failed_count=0)
+                stmt = stmt.where(MonitorSource.id.in_(source_ids))
+            sources = list((await session.execute(stmt)).scalars().all())
+        if due_only:
+            # 在全局锁内读取轮询状态：其他进程刚完成的运行已写回数据库，这里不会重复选中
+            sources = self._adaptive.due_sources(sources, now=app_now())
+            if not sources:
+                return BatchRunResult(total_sources=0, success_count=0, failed_count=0)
+            logger.info("adaptive_due_sources source_ids=%s", [source.id for source in sources])
+
+        run_id = run_id_ctx_var.get()
+        recent_ids: set[int] = set()
+        window_minutes = self._settings.PIPELINE_DEDUP_WINDOW_MINUTES
+        if skip_recent and window_minutes > 0 and resume_run_id is None:
+            # 多副本先后拿到全局锁时，后者跳过前者刚推送完成的监控源，不再重复抓取与推送
+            recent_ids = await self._checkpoints.recently_notified(
+                [source.id for source in sources],
+                since=app_now() - timedelta(minutes=window_minutes),
+                exclude_run_id=run_id,
+            )
+            if recent_ids:
+                logger.info("batch_run_dedup_skipped source_ids=%s", sorted(recent_ids))
+                sources = [source for source in sources if source.id not in recent_ids]
+        checkpoints = await self._checkpoints.start_run(run_id=run_id, resume_from=resume_run_id)
+        registry = RunItemRegistry()
+
+        if self._settings.PIPELINE_STAGED_ENABLED and len(sources) > 1:
+            results, skipped_count = await self._run_sources_staged(
+                sources,
+                run_id=run_id,
+                checkpoints=checkpoints,
+                registry=registry,
+            )
+        else:
+            results, skipped_count = await self._run_sources_sequential(
+                sources,
+                run_id=run_id,
+                checkpoints=checkpoints,
+                registry=registry,
+            )
+        if registry.shared_hits:
+            logger.info("batch_run_dedup shared_items=%s", registry.shared_hits)
+
+        skipped_count += len(recent_ids)
+        success_count = len([r for r in results if r.status == PushStatus.SUCCESS])
+        for result in results:
+            PIPELINE_SOURCE_RUNS.inc(status=PushStatus(result.status).value)
+        # 每次运行（定时、自适应、手动）都记录轮询状态，自适应调度据此计算下次到期时间
+        try:
+            await self._adaptive.record_runs(results, finished_at=app_now())
+        except Exception:  # noqa: BLE001
+            logger.exception("adaptive_record_failed run_id=%s", run_id)
+        # 有失败的监控源时保持 failed 状态，可通过 resume_run_id 续跑
+        await self._checkpoints.finish_run(run_id=run_id, status="done" if success_count == len(results) else "failed")
+        logger.info(
+            "batch_run_done total_sources=%s success=%s failed=%s skipped=%s",
+            len(results),
+            success_count,
+            len(results) - success_count,
+            skipped_count,
+        )
+        return BatchRunResult(
+            total_sources=len(results),
+            success_count=success_count,
+            failed_count=len(results) - success_count,
+            results=results,
+            skipped_count=skipped_count,
+        )
+
+    async def _run_sources_sequential(
+        self,
+        sources: list[MonitorSource],
+        run_id: str | None = None,
+        checkpoints: dict[int, SourceCheckpoint] | None = None,
+        registry: RunItemRegistry | None = None,
+    ) -> tuple[list[SourceRunResult], int]:
+        checkpoints = checkpoints or {}
+        results: list[SourceRunResult] = []
+        skipped_count = 0
+        async with SessionLocal() as session:
+            for source in sources:
+                # 单源锁：防止自适应调度与手动执行等不同入口重复抓取同一个监控源
+                async with self._locks.hold(f"pipeline:source:{source.id}") as acquired:
+                    if not acquired:
+                        skipped_count += 1
+                        continue
+                    results.append(
+                        await self.run_source(
+                            session=session,
+                            source=source,
+                            run_id=run_id,
+                            checkpoint=checkpoints.get(source.id),
+                            registry=registry,
+                        )
+                    )
+        return results, skipped_count
+
+    async def _run_sources_staged(
+        self,
+        sources: list[MonitorSource],
+        run_id: str | None = None,
+        checkpoints: dict[int, SourceCheckpoint] | None = None,
+        registry: RunItemRegistry | None = None,
+    ) -> tuple[list[SourceRunResult], int]:
+        """
+        分阶段流水线：抓取 / 分析 / 推送三个阶段各自是一组 worker，阶段间用有界队列连接。
+
+        - 监控源 B 抓取时，A 可以在做 AI 分析、C 可以在推送，总耗时趋近于最慢阶段而非各阶段之和
+        - 下游处理不过来时 put 会阻塞上游（背压），内存中同时存在的监控源数据量有上限
+        - 单源锁在抓取前获取、推送结束后释放，跨阶段持有
+        """
+        checkpoints = checkpoints or {}
+        queue_size = max(1, self._settings.PIPELINE_STAGE_QUEUE_SIZE)
+        source_queue: asyncio.Queue[MonitorSource | None] = asyncio.Queue()
+        analyze_queue: asyncio.Queue[SourceRunContext | None] = asyncio.Queue(maxsize=queue_size)
+        notify_queue: asyncio.Queue[SourceRunContext | None] = asyncio.Queue(maxsize=queue_size)
+        results: dict[int, SourceRunResult] = {}
+        skipped_ids: set[int] = set()
+        # 已获取、尚未在推送阶段释放的单源锁：异常/取消收尾时统一释放，不等 TTL 过期
+        held_leases: dict[int, RunLease] = {}
+
+        async def crawl_worker() -> None:
+            while (source := await source_queue.get()) is not None:
+                try:
+                    lease = await self._locks.acquire(f"pipeline:source:{source.id}")
+                except Exception:  # noqa: BLE001
+                    logger.exception("source_lock_acquire_failed source_id=%s", source.id)
+                    lease = None
+                if lease is None:
+                    skipped_ids.add(source.id)
+                    continue
+                held_leases[source.id] = lease
+                ctx = await self._stage_crawl(
+                    source,
+                    run_id=run_id,
+                    checkpoint=checkpoints.get(source.id),
+                    registry=registry,
+                )
+                ctx.lease = lease
+                await analyze_queue.put(ctx)
+
+        async def analyze_worker() -> None:
+            while (ctx := await analyze_queue.get()) is not None:
+                # worker 内任何异常都只记到当前监控源上，不能让 worker 退出，否则上游 put 会永久阻塞
+                try:
+                    async with SessionLocal() as session:
+                        ctx = await self._stage_analyze(session=session, ctx=ctx)
+                except Exception as e:  # noqa: BLE001
+                    await self._mark_failed(ctx, e)
+                await notify_queue.put(ctx)
+
+        async def notify_worker() -> None:
+            while (ctx := await notify_queue.get()) is not None:
+                try:
+                    async with SessionLocal() as session:
+                        results[ctx.source.id] = await self._stage_notify(session=session, ctx=ctx)
+                except Exception as e:  # noqa: BLE001
+                    await self._mark_failed(ctx, e)
+                    _end_source_span(ctx)
+                    results[ctx.source.id] = SourceRunResult(
+                        source_id=ctx.source.id,
+                        status=PushStatus.FAILED,
+                        total_items=0,
+                        cleaned_items=0,
+                        notify_success_count=0,
+                        error=ctx.error,
+                    )
+                finally:
+                    if ctx.lease is not None:
+                        held_leases.pop(ctx.source.id, None)
+                        await self._locks.release(ctx.lease)
+
+        stages = [
+            (crawl_worker, self._settings.PIPELINE_CRAWL_CONCURRENCY, source_queue),
+            (analyze_worker, self._settings.PIPELINE_ANALYZE_CONCURRENCY, analyze_queue),
+            (notify_worker, self._settings.PIPELINE_NOTIFY_CONCURRENCY, notify_queue),
+        ]
+        stage_tasks = [
+            [asyncio.create_task(worker()) for _ in range(max(1, concurrency))] for worker, concurrency, _ in stages
+        ]
+        for source in sources:
+            source_queue.put_nowait(source)
+
+        # 按阶段顺序收尾：上游全部结束后，再向下游每个 worker 投递一个结束标记 None
+        try:
+            for (_, _, queue), tasks in zip(stages, stage_tasks):
+                for _ in tasks:
+                    await queue.put(None)
+                await asyncio.gather(*tasks)
+        finally:
+            # 批处理被取消（worker 停止、租约丢失）或某个 worker 异常退出时，下游收不到结束标记，
+            # 会永久阻塞在 queue.get()：取消全部阶段任务，并释放仍在途监控源的单源锁。
+            # shield：收尾期间再次被取消也要把锁释放完
+            await asyncio.shield(self._teardown_stages([task for tasks in stage_tasks for task in tasks], held_leases))
+
+        ordered = [results[source.id] for source in sources if source.id in results]
+        return ordered, len(skipped_ids)
+
+    async def _teardown_stages(self, tasks: list[asyncio.Task], held_leases: dict[int, RunLease]) -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for lease in list(held_leases.values()):
+            await self._locks.release(lease)
+        held_leases.clear()
+
+    async def trigger_run_now(self, resume_run_id: str | None = None) -> BatchRunResult:
+        """手动立即执行入口：与定时任务共用同一批处理逻辑，不影响调度器的下次执行。"""
+        return await self.run_all_active_sources(resume_run_id=resume_run_id)
+
+    @staticmethod
+    async def _count_new_items(session: AsyncSession, items: list[CrawlItem]) -> int:
+        """统计本批次中尚未落库的资讯条数。"""
+        tweet_ids = {item.tweet_id for item in items if item.tweet_id}
+        if not tweet_ids:
+            return 0
+        stmt = select(ContentItem.external_id).where(
+            ContentItem.platform == "twitter",
+            ContentItem.external_id.in_(tweet_ids),
+        )
+        existing = set((await session.execute(stmt)).scalars().all())
+        return len(tweet_ids - existing)
+
+    @staticmethod
+    def _average_hotness(items: list[CrawlItem]) -> float:
+        if not items:
+            return 0.0
+        return sum(item.hotness or 0 for item in items) / len(items)
 
     # --- 以下是私有辅助方法，仅保留签名 ---
     
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import app_now, get_settings
+from db.session import SessionLocal
+from models import PipelineRun, PipelineRunSource
+from schemas import CrawlItem
+
+logger = logging.getLogger(__name__)
+
+# 阶段检查点顺序：后面的阶段隐含前面的阶段都已完成
+CHECKPOINT_STAGES = ("crawled", "persisted", "analyzed", "notified")
+
+
+@dataclass
+class SourceCheckpoint:
+    """单个监控源在某次运行中已完成到的阶段，以及抓取阶段保存下来的数据。"""
+
+    stage: str
+    items: list[CrawlItem] | None = None
+
+    def reached(self, stage: str) -> bool:
+        if self.stage not in CHECKPOINT_STAGES:
+            return False
+        return CHECKPOINT_STAGES.index(self.stage) >= CHECKPOINT_STAGES.index(stage)
+
+
+class RunCheckpointService:
+    """运行检查点：记录每个监控源完成到哪个阶段，进程崩溃/部分失败后可从断点续跑。
+
+    - 同一个 run_id 再次执行（如 worker 崩溃后任务被重新入队）会自动沿用已有检查点
+    - 指定 resume_from 时，把旧运行中已完成的检查点复制到新运行，再跳过这些阶段
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None) -> None:
+        self._settings = get_settings()
+        self._session_factory = session_factory or SessionLocal
+
+    async def start_run(self, run_id: str, resume_from: str | None = None) -> dict[int, SourceCheckpoint]:
+        """创建（或重新打开）运行记录，返回可复用的检查点：source_id -> SourceCheckpoint。"""
+        async with self._session_factory() as session:
+            await self._prune_expired(session)
+            run = await session.get(PipelineRun, run_id)
+            if run is None:
+                run = PipelineRun(id=run_id, status="running", resumed_from=resume_from, created_at=app_now())
+                session.add(run)
+                if resume_from and resume_from != run_id:
+                    await self._copy_checkpoints(session, from_run_id=resume_from, to_run_id=run_id)
+            else:
+                run.status = "running"
+                run.finished_at = None
+            await session.commit()
+            checkpoints = await self._load_checkpoints(session, run_id)
+
+        if checkpoints:
+            logger.info("run_resumed run_id=%s resume_from=%s sources=%s", run_id, resume_from, len(checkpoints))
+        return checkpoints
+
+    async def save(
+        self,
+        run_id: str,
+        source_id: int,
+        stage: str | None,
+        items: list[CrawlItem] | None = None,
+        error: str | None = None,
+    ) -> None:
+        """
+        记录检查点。stage=None 表示只记录错误、保留已完成的阶段，续跑时从失败的下一阶段继续。
+        """
+        async with self._session_factory() as session:
+            stmt = select(PipelineRunSource).where(
+                PipelineRunSource.run_id == run_id,
+                PipelineRunSource.source_id == source_id,
+            )
+            row = (await session.execute(stmt)).scalar_one_or_none()
+            if row is None:
+                row = PipelineRunSource(run_id=run_id, source_id=source_id, stage=stage or "failed")
+                session.add(row)
+            elif stage is not None and not SourceCheckpoint(stage=row.stage).reached(stage):
+                # 续跑时会重新经过已完成的阶段，只前进不回退
+                row.stage = stage
+            if items is not None:
+                row.crawl_items = json.dumps([item.model_dump(mode="json") for item in items], ensure_ascii=False)
+            row.error = error
+            row.updated_at = app_now()
+            await session.commit()
+
+    async def recently_notified(self, source_ids: list[int], since: datetime, exclude_run_id: str | None = None) -> set[int]:
+        """since 之后已在其他运行中推送完成（检查点到达 notified）的监控源。"""
+        if not source_ids:
+            return set()
+        stmt = select(PipelineRunSource.source_id).where(
+            PipelineRunSource.source_id.in_(source_ids),
+            PipelineRunSource.stage == "notified",
+            PipelineRunSource.updated_at >= since,
+        )
+        if exclude_run_id is not None:
+            stmt = stmt.where(PipelineRunSource.run_id != exclude_run_id)
+        async with self._session_factory() as session:
+            return set((await session.execute(stmt)).scalars().all())
+
+    async def finish_run(self, run_id: str, status: str) -> None:
+        async with self._session_factory() as session:
+            run = await session.get(PipelineRun, run_id)
+            if run is None:
+                return
+            run.status = status
+            run.finished_at = app_now()
+            await session.commit()
+
+    async def describe_run(self, session: AsyncSession, run_id: str) -> dict[str, Any] | None:
+        """查询运行记录与各监控源的阶段（API 展示用，不返回抓取数据本身）。"""
+        run = await session.get(PipelineRun, run_id)
+        if run is None:
+            return None
+        stmt = (
+            select(PipelineRunSource)
+            .where(PipelineRunSource.run_id == run_id)
+            .order_by(PipelineRunSource.source_id)
+        )
+        rows = (await session.execute(stmt)).scalars().all()
+        return {
+            "run_id": run.id,
+            "status": run.status,
+            "resumed_from": run.resumed_from,
+            "created_at": run.created_at.isoformat() if run.created_at else None,
+            "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+            "sources": [
+                {
+                    "source_id": row.source_id,
+                    "stage": row.stage,
+                    "error": row.error,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                }
+                for row in rows
+            ],
+        }
+
+    async def _load_checkpoints(self, session: AsyncSession, run_id: str) -> dict[int, SourceCheckpoint]:
+        stmt = select(PipelineRunSource).where(PipelineRunSource.run_id == run_id)
+        checkpoints: dict[int, SourceCheckpoint] = {}
+        for row in (await session.execute(stmt)).scalars().all():
+            if row.stage not in CHECKPOINT_STAGES:
+                continue
+            checkpoints[row.source_id] = SourceCheckpoint(stage=row.stage, items=self._load_items(row.crawl_items))
+        return checkpoints
+
+    async def _copy_checkpoints(self, session: AsyncSession, from_run_id: str, to_run_id: str) -> None:
+        stmt = select(PipelineRunSource).where(
+            PipelineRunSource.run_id == from_run_id,
+            PipelineRunSource.stage.in_(CHECKPOINT_STAGES),
+        )
+        for row in (await session.execute(stmt)).scalars().all():
+            session.add(
+                PipelineRunSource(
+                    run_id=to_run_id,
+                    source_id=row.source_id,
+                    stage=row.stage,
+                    crawl_items=row.crawl_items,
+                    updated_at=app_now(),
+                )
+            )
+
+    async def _prune_expired(self, session: AsyncSession) -> None:
+        """清理过期运行记录：抓取数据体积较大，只保留最近几天用于续跑。"""
+        deadline = app_now() - timedelta(days=max(1, self._settings.PIPELINE_RUN_RETENTION_DAYS))
+        expired_ids = select(PipelineRun.id).where(PipelineRun.created_at < deadline)
+        await session.execute(delete(PipelineRunSource).where(PipelineRunSource.run_id.in_(expired_ids)))
+        await session.execute(delete(PipelineRun).where(PipelineRun.created_at < deadline))
+
+    @staticmethod
+    def _load_items(value: str | None) -> list[CrawlItem] | None:
+        if not value:
+            return None
+        try:
+            return [CrawlItem.model_validate(item) for item in json.loads(value)]
+        except ValueError:
+            logger.warning("run_checkpoint_items_invalid")
+            return None
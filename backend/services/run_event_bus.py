@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from core.request_context import run_id_ctx_var
+
+
+@dataclass
+class RunEvent:
+    """一次运行中的阶段事件（crawled / cleaned / analyzed / notified ...）。"""
+
+    run_id: str
+    stage: str
+    source_id: int | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    ts: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class RunEventBus:
+    """进程内发布/订阅：PipelineService 发布阶段事件，SSE 接口订阅并推给前端。
+
+    - 每个 run 保留最近一段事件历史，订阅晚于运行开始时也能补齐已发生的阶段
+    - 订阅队列有界，消费过慢时丢弃最旧事件，避免拖慢流水线
+    """
+
+    TERMINAL_STAGES = frozenset({"run_done", "run_failed"})
+
+    def __init__(self, history_size: int = 200, max_runs: int = 50, queue_size: int = 200) -> None:
+        self._history_size = history_size
+        self._max_runs = max_runs
+        self._queue_size = queue_size
+        self._history: OrderedDict[str, deque[RunEvent]] = OrderedDict()
+        self._subscribers: dict[str, set[asyncio.Queue[RunEvent]]] = {}
+
+    def publish(self, event: RunEvent) -> None:
+        history = self._history.get(event.run_id)
+        if history is None:
+            history = deque(maxlen=self._history_size)
+            self._history[event.run_id] = history
+            while len(self._history) > self._max_runs:
+                self._history.popitem(last=False)
+        history.append(event)
+
+        for queue in self._subscribers.get(event.run_id, set()):
+            self._put_drop_oldest(queue, event)
+
+    def subscribe(self, run_id: str) -> asyncio.Queue[RunEvent]:
+        queue: asyncio.Queue[RunEvent] = asyncio.Queue(maxsize=self._queue_size)
+        for event in self._history.get(run_id, ()):
+            self._put_drop_oldest(queue, event)
+        self._subscribers.setdefault(run_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, run_id: str, queue: asyncio.Queue[RunEvent]) -> None:
+        subscribers = self._subscribers.get(run_id)
+        if not subscribers:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            self._subscribers.pop(run_id, None)
+
+    @staticmethod
+    def _put_drop_oldest(queue: asyncio.Queue[RunEvent], event: RunEvent) -> None:
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(event)
+
+
+# 进程级单例：同一进程内的 worker 与 API 共用
+run_event_bus = RunEventBus()
+
+
+def publish_run_event(stage: str, source_id: int | None = None, **data: Any) -> None:
+    """向当前运行（run_id_ctx_var）发布事件；不在运行上下文中时直接忽略。"""
+    run_id = run_id_ctx_var.get()
+    if run_id == "-":
+        return
+    run_event_bus.publish(RunEvent(run_id=run_id, stage=stage, source_id=source_id, data=data))
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from models import ContentItem
+from schemas import CrawlItem, LLMInsightItem
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SharedItemResult:
+    """某条推文由“归属监控源”落库+分析后的结果，供同一次运行中的其他监控源复用。"""
+
+    content: ContentItem | None
+    insight: LLMInsightItem | None
+
+
+class RunItemRegistry:
+    """单次批处理内的推文去重表（按 tweet_id）。
+
+    多个监控源抓到同一条推文时（关键词重叠、作者源 + 命中该作者的关键词源），
+    第一个认领的监控源负责落库与 AI 分析，其余监控源等待其结果后直接用于各自的推送摘要。
+
+    归属方总是先处理并发布自己认领的条目、再等待别人的条目，因此不会相互等待形成死锁。
+    """
+
+    def __init__(self) -> None:
+        self._futures: dict[str, asyncio.Future[SharedItemResult | None]] = {}
+        self._owners: dict[str, int] = {}
+        self.shared_hits = 0
+
+    def claim(
+        self,
+        source_id: int,
+        items: list[CrawlItem],
+    ) -> tuple[list[CrawlItem], dict[str, asyncio.Future[SharedItemResult | None]]]:
+        """
+        认领条目：返回 (本监控源需要自己处理的条目, 由其他监控源处理、需要等待的 tweet_id -> future)。
+        调用过程中没有 await，认领操作在事件循环内是原子的。
+        """
+        loop = asyncio.get_running_loop()
+        owned: list[CrawlItem] = []
+        shared: dict[str, asyncio.Future[SharedItemResult | None]] = {}
+        for item in items:
+            tweet_id = item.tweet_id
+            owner = self._owners.get(tweet_id)
+            if owner is None:
+                self._owners[tweet_id] = source_id
+                self._futures[tweet_id] = loop.create_future()
+                owned.append(item)
+            elif owner != source_id and tweet_id not in shared:
+                shared[tweet_id] = self._futures[tweet_id]
+        self.shared_hits += len(shared)
+        return owned, shared
+
+    def resolve(
+        self,
+        items: list[CrawlItem],
+        content_map: dict[str, ContentItem],
+        ai_insight_map: dict[str, LLMInsightItem],
+    ) -> None:
+        """发布归属条目的处理结果。"""
+        for item in items:
+            future = self._futures.get(item.tweet_id)
+            if future is not None and not future.done():
+                future.set_result(
+                    SharedItemResult(
+                        content=content_map.get(item.tweet_id),
+                        insight=ai_insight_map.get(item.tweet_id),
+                    )
+                )
+
+    def abandon(self, items: list[CrawlItem]) -> None:
+        """归属方处理失败：通知等待方自行处理这些条目（结果为 None）。"""
+        for item in items:
+            future = self._futures.get(item.tweet_id)
+            if future is not None and not future.done():
+                future.set_result(None)
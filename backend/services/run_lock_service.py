@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import get_settings
+from db.session import SessionLocal
+from models import RunLock
+
+logger = logging.getLogger(__name__)
+
+
+class RunLockBackend(ABC):
+    """运行锁后端接口：acquire/renew/release 三个原子操作，便于替换为 Redis 等实现。"""
+
+    @abstractmethod
+    async def acquire(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        """尝试获取锁：锁不存在、已过期或本来就归 owner 持有时返回 True。"""
+
+    @abstractmethod
+    async def renew(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        """续约：仅当锁仍归 owner 持有时延长过期时间。"""
+
+    @abstractmethod
+    async def release(self, name: str, owner: str) -> None:
+        """释放锁：只删除自己持有的锁，避免误删已被他人接管的锁。"""
+
+
+class InMemoryRunLockBackend(RunLockBackend):
+    """进程内锁：单进程部署或单元测试使用。"""
+
+    def __init__(self) -> None:
+        self._locks: dict[str, tuple[str, float]] = {}
+        self._mutex = asyncio.Lock()
+
+    async def acquire(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        async with self._mutex:
+            now = time.monotonic()
+            current = self._locks.get(name)
+            if current is not None and current[0] != owner and current[1] > now:
+                return False
+            self._locks[name] = (owner, now + ttl_seconds)
+            return True
+
+    async def renew(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        async with self._mutex:
+            current = self._locks.get(name)
+            if current is None or current[0] != owner:
+                return False
+            self._locks[name] = (owner, time.monotonic() + ttl_seconds)
+            return True
+
+    async def release(self, name: str, owner: str) -> None:
+        async with self._mutex:
+            current = self._locks.get(name)
+            if current is not None and current[0] == owner:
+                self._locks.pop(name, None)
+
+
+class DatabaseRunLockBackend(RunLockBackend):
+    """基于 run_locks 表的租约锁：多个 uvicorn worker / 多副本共享同一数据库即可互斥。"""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None) -> None:
+        self._session_factory = session_factory or SessionLocal
+
+    async def acquire(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        now = self._utcnow()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        async with self._session_factory() as session:
+            # 1) 抢占已过期（或本来就是自己）的锁：单条 UPDATE，依赖数据库行级原子性
+            stmt = (
+                update(RunLock)
+                .where(RunLock.name == name, or_(RunLock.expires_at < now, RunLock.owner == owner))
+                .values(owner=owner, expires_at=expires_at, heartbeat_at=now)
+            )
+            result = await session.execute(stmt)
+            if result.rowcount:
+                await session.commit()
+                return True
+
+            # 2) 锁不存在则插入；主键冲突说明被其他进程抢先持有
+            session.add(RunLock(name=name, owner=owner, expires_at=expires_at, heartbeat_at=now, created_at=now))
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                return False
+            return True
+
+    async def renew(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        now = self._utcnow()
+        async with self._session_factory() as session:
+            stmt = (
+                update(RunLock)
+                .where(RunLock.name == name, RunLock.owner == owner)
+                .values(expires_at=now + timedelta(seconds=ttl_seconds), heartbeat_at=now)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+            return bool(result.rowcount)
+
+    async def release(self, name: str, owner: str) -> None:
+        async with self._session_factory() as session:
+            await session.execute(delete(RunLock).where(RunLock.name == name, RunLock.owner == owner))
+            await session.commit()
+
+    @staticmethod
+    def _utcnow() -> datetime:
+        # SQLite 不保存时区信息，统一用 UTC 才能保证字符串比较与时间先后一致。
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class RunLease:
+    """已持有的租约：释放时需要 owner 校验，并停止后台续约任务。
+
+    heartbeat 任务只在续约失败（锁已被他人接管）时自行结束，调用方可等待它来感知租约丢失。
+    """
+
+    name: str
+    owner: str
+    heartbeat: asyncio.Task
+
+
+class RunLockService:
+    """运行锁服务：获取租约并在持有期间后台续约，退出时自动释放。
+
+    用法：
+        async with lock_service.hold("pipeline:run_all") as acquired:
+            if not acquired:
+                return  # 其他进程正在执行
+    """
+
+    def __init__(self, backend: RunLockBackend | None = None) -> None:
+        self._settings = get_settings()
+        self._backend = backend or self._build_backend(self._settings.RUN_LOCK_BACKEND)
+        self._instance_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    @contextlib.asynccontextmanager
+    async def hold(self, name: str) -> AsyncIterator[bool]:
+        lease = await self.acquire(name)
+        if lease is None:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            await self.release(lease)
+
+    async def acquire(self, name: str) -> RunLease | None:
+        """
+        获取租约并启动后台续约；锁被占用时返回 None。
+        适用于持有期跨越多个任务的场景（如分阶段流水线），需自行调用 release。
+        """
+        # 每次获取使用独立 owner，避免同一进程内两次并发执行互相“重入”。
+        owner = f"{self._instance_id}:{uuid.uuid4().hex[:8]}"
+        ttl_seconds = max(1, self._settings.RUN_LOCK_TTL_SECONDS)
+        acquired = await self._backend.acquire(name=name, owner=owner, ttl_seconds=ttl_seconds)
+        if not acquired:
+            logger.info("run_lock_busy name=%s", name)
+            return None
+        heartbeat = asyncio.create_task(self._heartbeat(name=name, owner=owner, ttl_seconds=ttl_seconds))
+        return RunLease(name=name, owner=owner, heartbeat=heartbeat)
+
+    async def release(self, lease: RunLease) -> None:
+        lease.heartbeat.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await lease.heartbeat
+        try:
+            await self._backend.release(name=lease.name, owner=lease.owner)
+        except Exception:  # noqa: BLE001
+            # 释放失败不影响业务结果，租约到期后会自动失效。
+            logger.exception("run_lock_release_failed name=%s", lease.name)
+
+    async def _heartbeat(self, name: str, owner: str, ttl_seconds: int) -> None:
+        interval = max(1, min(self._settings.RUN_LOCK_HEARTBEAT_SECONDS, ttl_seconds // 2 or 1))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self._backend.renew(name=name, owner=owner, ttl_seconds=ttl_seconds)
+            except Exception:  # noqa: BLE001
+                logger.exception("run_lock_renew_failed name=%s", name)
+                continue
+            if not renewed:
+                logger.warning("run_lock_lost name=%s owner=%s", name, owner)
+                return
+
+    @staticmethod
+    def _build_backend(kind: str) -> RunLockBackend:
+        if kind == "memory":
+            return InMemoryRunLockBackend()
+        if kind == "database":
+            return DatabaseRunLockBackend()
+        raise ValueError(f"unsupported_run_lock_backend: {kind}")
@@ -5,17 +5,31 @@ from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from core import get_settings
+from services.analysis_backfill_service import AnalysisBackfillService
 from services.pipeline_service import PipelineService
 
 logger = logging.getLogger(__name__)
 
 
 class SchedulerService:
-    """APScheduler 封装：负责注册和管理定时任务。"""
+    """APScheduler 封装：负责注册和管理定时任务。
 
-    def __init__(self, pipeline_service: PipelineService | None = None) -> None:
+    - daily 模式：每天 08:30 全量执行一次
+    - adaptive 模式：周期性巡检，只执行“到期”的监控源，间隔由 AdaptivePollingService 动态调整（状态保存在数据库）
+    - 可选的分析回填：周期性重新分析提示词指纹过期的旧结果（受每小时 token 预算限制）
+    """
+
+    def __init__(
+        self,
+        pipeline_service: PipelineService | None = None,
+        backfill_service: AnalysisBackfillService | None = None,
+    ) -> None:
+        self._settings = get_settings()
         self._pipeline = pipeline_service or PipelineService()
+        self._backfill = backfill_service
         self._scheduler = AsyncIOScheduler(timezone=ZoneInfo("Asia/Shanghai"))
         self._started = False
 
@@ -23,15 +37,38 @@ class SchedulerService:
         if self._started:
             return
 
-        self._scheduler.add_job(
-            self._run_daily_job,
-            trigger=CronTrigger(hour=8, minute=30),
-            id="daily_pipeline_job",
-            replace_existing=True,
-        )
+        if self._settings.SCHEDULER_MODE == "adaptive":
+            tick_seconds = max(10, self._settings.ADAPTIVE_TICK_SECONDS)
+            self._scheduler.add_job(
+                self._run_adaptive_tick,
+                trigger=IntervalTrigger(seconds=tick_seconds),
+                id="adaptive_pipeline_job",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+            logger.info("scheduler_started job=adaptive_pipeline_job tick_seconds=%s", tick_seconds)
+        else:
+            self._scheduler.add_job(
+                self._run_daily_job,
+                trigger=CronTrigger(hour=8, minute=30),
+                id="daily_pipeline_job",
+                replace_existing=True,
+            )
+            logger.info("scheduler_started job=daily_pipeline_job cron=08:30")
+        if self._settings.ANALYSIS_BACKFILL_ENABLED:
+            interval_minutes = max(1, self._settings.ANALYSIS_BACKFILL_INTERVAL_MINUTES)
+            self._scheduler.add_job(
+                self._run_backfill_job,
+                trigger=IntervalTrigger(minutes=interval_minutes),
+                id="analysis_backfill_job",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+            logger.info("scheduler_started job=analysis_backfill_job interval_minutes=%s", interval_minutes)
         self._scheduler.start()
         self._started = True
-        logger.info("scheduler_started job=daily_pipeline_job cron=08:30")
 
     async def shutdown(self) -> None:
         if not self._started:
@@ -42,4 +79,16 @@ class SchedulerService:
 
     async def _run_daily_job(self) -> None:
         logger.info("scheduler_job_triggered job=daily_pipeline_job")
-        await self._pipeline.run_all_active_sources()
+        # 每个副本都会触发每日任务：拿到全局锁较晚的副本跳过已推送完成的监控源
+        await self._pipeline.run_all_active_sources(skip_recent=True)
+
+    async def _run_adaptive_tick(self) -> None:
+        # 到期筛选与运行结果的记录都在 pipeline:run_all 租约内完成，多个进程/副本共享数据库中的轮询状态
+        batch = await self._pipeline.run_all_active_sources(due_only=True)
+        if batch.total_sources:
+            logger.info("scheduler_job_done job=adaptive_pipeline_job sources=%s", batch.total_sources)
+
+    async def _run_backfill_job(self) -> None:
+        if self._backfill is None:
+            self._backfill = AnalysisBackfillService()
+        await self._backfill.run_once()
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import time
 from typing import Any
 
 import httpx
 
 from core import get_settings
+from core.circuit_breaker import circuit_breakers
+from core.metrics import UPSTREAM_REQUEST_SECONDS
+from core.tracing import tracer
+from core.single_flight import SingleFlight
 
 
 class TwitterApiClient:
     """TwitterAPI.io 客户端（基础封装）。"""
 
+    # 进程内所有实例共享：定时任务、手动执行、多个监控源同时请求同一时间线/查询时只发一次 HTTP
+    _flight: SingleFlight | None = None
+
     def __init__(self) -> None:
         settings = get_settings()
         api_key = settings.TWITTERAPI_IO_API_KEY
@@ -18,20 +26,57 @@ class TwitterApiClient:
 
         self._base_url = settings.TWITTERAPI_IO_BASE_URL.rstrip("/")
         self._headers = {"x-api-key": api_key}
+        if TwitterApiClient._flight is None:
+            TwitterApiClient._flight = SingleFlight(
+                name="twitterapi",
+                ttl_seconds=settings.TWITTERAPI_CACHE_TTL_SECONDS,
+                max_entries=settings.TWITTERAPI_CACHE_MAX_ENTRIES,
+            )
 
     async def _get(self, path: str, params: dict[str, str | int]) -> dict[str, Any]:
+        """GET 请求（带请求合并与短 TTL 缓存）：相同 (path, params) 的并发请求共享一次 HTTP 调用。"""
+        key = (self._base_url, path, tuple(sorted(params.items())))
+        return await self._flight.do(key, lambda: self._request(path, params))
+
+    async def _request(self, path: str, params: dict[str, str | int]) -> dict[str, Any]:
         """通用 GET 请求封装，统一鉴权头、超时和错误处理。"""
         url = f"{self._base_url}{path}"
         timeout = httpx.Timeout(20.0)
+        # 上游整体故障时快速失败，不再让每个监控源都等满超时
+        breaker = circuit_breakers.get("twitterapi")
+        breaker.check()
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(
-                url,
-                headers=self._headers,
-                params=params,
-            )
-            response.raise_for_status()
-            return response.json()
+        with tracer.span("twitterapi.request", path=path) as span:
+            started = time.perf_counter()
+            try:
+                async with httpx.AsyncClient(timeout=timeout) as client:
+                    response = await client.get(
+                        url,
+                        headers=self._headers,
+                        params=params,
+                    )
+                    response.raise_for_status()
+                    data = response.json()
+            except httpx.HTTPStatusError as exc:
+                # 4xx（如 quotes 路径 404）说明上游可用，只有 429/5xx 计入熔断
+                status_code = exc.response.status_code
+                span.set_attribute("http.status_code", status_code)
+                UPSTREAM_REQUEST_SECONDS.observe(
+                    time.perf_counter() - started, upstream="twitterapi", status=f"http_{status_code}"
+                )
+                if status_code == 429 or status_code >= 500:
+                    breaker.record_failure(f"http_{status_code}")
+                else:
+                    breaker.record_success()
+                raise
+            except Exception as exc:
+                UPSTREAM_REQUEST_SECONDS.observe(time.perf_counter() - started, upstream="twitterapi", status="error")
+                breaker.record_failure(type(exc).__name__)
+                raise
+            UPSTREAM_REQUEST_SECONDS.observe(time.perf_counter() - started, upstream="twitterapi", status="ok")
+            span.set_attribute("http.status_code", response.status_code)
+            breaker.record_success()
+            return data
 
     async def fetch_user_followings(self, username: str) -> dict[str, Any]:
         """鉴权连通性 Demo 接口。"""
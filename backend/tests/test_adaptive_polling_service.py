@@ -0,0 +1,107 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core import app_now
+from db.base import Base
+from models import MonitorSource
+from services.adaptive_polling_service import AdaptivePollingService
+
+
+class _S:
+    ADAPTIVE_BASE_INTERVAL_MINUTES = 120
+    ADAPTIVE_MIN_INTERVAL_MINUTES = 30
+    ADAPTIVE_MAX_INTERVAL_MINUTES = 480
+    ADAPTIVE_HISTORY_SIZE = 3
+    ADAPTIVE_TARGET_NEW_ITEMS = 5
+
+
+def _service() -> AdaptivePollingService:
+    service = AdaptivePollingService.__new__(AdaptivePollingService)
+    service._settings = _S()
+    service._states = {}
+    return service
+
+
+def test_new_source_is_due_immediately() -> None:
+    service = _service()
+    now = datetime(2026, 2, 15, 8, 0)
+    assert service.select_due_sources([1, 2], now=now) == [1, 2]
+
+
+def test_high_yield_shortens_interval_within_bounds() -> None:
+    service = _service()
+    now = datetime(2026, 2, 15, 8, 0)
+    for _ in range(5):
+        interval = service.record_run(source_id=1, new_items=40, avg_hotness=90, finished_at=now)
+    assert interval == 30
+
+    assert service.select_due_sources([1], now=now + timedelta(minutes=10)) == []
+    assert service.select_due_sources([1], now=now + timedelta(minutes=31)) == [1]
+
+
+def test_zero_yield_lengthens_interval_up_to_max() -> None:
+    service = _service()
+    now = datetime(2026, 2, 15, 8, 0)
+    assert service.record_run(source_id=1, new_items=0, avg_hotness=0, finished_at=now) == 240
+    assert service.record_run(source_id=1, new_items=0, avg_hotness=0, finished_at=now) == 480
+    assert service.record_run(source_id=1, new_items=0, avg_hotness=0, finished_at=now) == 480
+
+
+def test_failed_run_keeps_interval() -> None:
+    service = _service()
+    now = datetime(2026, 2, 15, 8, 0)
+    assert service.record_run(source_id=1, new_items=0, avg_hotness=0, finished_at=now, success=False) == 120
+    assert service.select_due_sources([1], now=now + timedelta(minutes=60)) == []
+
+
+@dataclass
+class _Result:
+    source_id: int
+    status: str
+    new_items: int = 0
+    avg_hotness: float = 0.0
+
+
+@pytest.mark.asyncio
+async def test_polling_state_is_shared_through_database() -> None:
+    fd, db_path = tempfile.mkstemp(prefix="adaptive_polling_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        async with session_factory() as session:
+            session.add_all([MonitorSource(type="author", value=f"u{i}", is_active=True) for i in (1, 2)])
+            await session.commit()
+
+        async def _load() -> list[MonitorSource]:
+            async with session_factory() as session:
+                return list(await session.scalars(select(MonitorSource).order_by(MonitorSource.id)))
+
+        before = {source.id: source.updated_at for source in await _load()}
+        finished_at = app_now()
+        await AdaptivePollingService(session_factory=session_factory).record_runs(
+            [_Result(source_id=1, status="success", new_items=0)],
+            finished_at=finished_at,
+        )
+
+        # 另一个进程（新实例，没有内存状态）也能看到这次运行：源 1 未到期，从未运行的源 2 到期
+        other = AdaptivePollingService(session_factory=session_factory)
+        sources = await _load()
+        assert [s.id for s in other.due_sources(sources, now=finished_at + timedelta(minutes=1))] == [2]
+        assert other.get_interval_minutes(1) == other._clamp_interval(other._settings.ADAPTIVE_BASE_INTERVAL_MINUTES * 2)
+        later = finished_at + timedelta(minutes=other.get_interval_minutes(1) + 1)
+        assert [s.id for s in other.due_sources(sources, now=later)] == [1, 2]
+        # 轮询状态不影响监控源列表的 updated_at（ETag）
+        assert {source.id: source.updated_at for source in sources} == before
+    finally:
+        await engine.dispose()
+        os.remove(db_path)
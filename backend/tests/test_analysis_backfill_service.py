@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.base import Base
+from db.init_db import _ensure_columns
+from models import ContentAIAnalysis, ContentItem, MonitorSource, PushLog, PushLogItem, PushStatus
+from schemas import LLMBatchItemAnalysisResult, LLMInsightItem
+import services.analysis_backfill_service as backfill_module
+from core import app_now
+from services.analysis_backfill_service import AnalysisBackfillService
+from services.content_analysis_service import ContentAnalysisService
+from services.run_lock_service import InMemoryRunLockBackend, RunLockService
+
+
+class _FakeLLM:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.batches: list[list[str]] = []
+
+    def prompt_fingerprint(self) -> str:
+        return "fp-new"
+
+    async def analyze_items(self, items):
+        self.batches.append([item.tweet_id for item in items])
+        if self.fail:
+            return LLMBatchItemAnalysisResult(
+                status="failed",
+                model="glm-test",
+                prompt_text="p" * 400,
+                failure_reason="max_retries_exceeded: boom",
+            )
+        return LLMBatchItemAnalysisResult(
+            status="success",
+            insights=[
+                LLMInsightItem(tweet_id=item.tweet_id, ai_score=90, summary=f"新摘要 {item.tweet_id}", ai_title=None)
+                for item in items
+            ],
+            model="glm-test",
+            prompt_text="p" * 400,
+            raw_response_text="r" * 400,
+        )
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    fd, db_path = tempfile.mkstemp(prefix="backfill_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield factory
+    await engine.dispose()
+    os.remove(db_path)
+
+
+async def _seed(factory, rows: list[tuple[str, int, int, str | None]], status: str = "success") -> None:
+    """rows: (external_id, hotness, 发布距今小时数, 已有分析的指纹)"""
+    now = datetime.now()
+    async with factory() as session:
+        for external_id, hotness, hours_ago, fingerprint in rows:
+            item = ContentItem(
+                platform="twitter",
+                source_type="author_timeline",
+                external_id=external_id,
+                author_name="openai",
+                url=f"https://x.com/openai/status/{external_id}",
+                title="标题",
+                content_text=f"正文 {external_id}",
+                content_hash=f"hash-{external_id}",
+                published_at=now - timedelta(hours=hours_ago),
+                raw_payload="{}",
+                hotness=hotness,
+                created_at=now,
+                updated_at=now,
+            )
+            session.add(item)
+            await session.flush()
+            session.add(
+                ContentAIAnalysis(
+                    content_item_id=item.id,
+                    model="glm-old",
+                    ai_score=50,
+                    summary="旧摘要",
+                    content_hash="x",
+                    prompt_fingerprint=fingerprint,
+                    status=status,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        await session.commit()
+
+
+async def _attach_source(factory, external_ids: list[str]) -> None:
+    """让资讯能追溯到监控源（经由推送日志条目），回填调用才会写入 llm_call_logs。"""
+    async with factory() as session:
+        source = MonitorSource(type="author", value="openai", is_active=True)
+        session.add(source)
+        await session.flush()
+        push_log = PushLog(source_id=source.id, status=PushStatus.SUCCESS, created_at=datetime.now())
+        session.add(push_log)
+        await session.flush()
+        for external_id in external_ids:
+            session.add(
+                PushLogItem(
+                    push_log_id=push_log.id,
+                    tweet_id=external_id,
+                    source="author_timeline",
+                    author_username="openai",
+                    url=f"https://x.com/openai/status/{external_id}",
+                    text=f"正文 {external_id}",
+                    hotness=50,
+                    created_at=datetime.now(),
+                )
+            )
+        await session.commit()
+
+
+def _build_service(
+    factory,
+    llm: _FakeLLM,
+    monkeypatch,
+    tokens_per_hour: int,
+    lock_service: RunLockService | None = None,
+) -> AnalysisBackfillService:
+    analysis = ContentAnalysisService(llm_service=llm)  # type: ignore[arg-type]
+    monkeypatch.setattr(analysis._settings, "LLM_ANALYZE_BATCH_SIZE", 2)
+    monkeypatch.setattr(analysis._settings, "ANALYSIS_BACKFILL_TOKENS_PER_HOUR", tokens_per_hour)
+    return AnalysisBackfillService(
+        analysis_service=analysis,
+        session_factory=factory,
+        lock_service=lock_service or RunLockService(backend=InMemoryRunLockBackend()),
+    )
+
+
+@pytest.mark.asyncio
+async def test_backfill_reanalyzes_stale_rows_by_priority(session_factory, monkeypatch) -> None:
+    await _seed(
+        session_factory,
+        [
+            ("cold", 10, 1, None),
+            ("hot-old", 90, 48, "fp-old"),
+            ("hot-new", 90, 1, "fp-old"),
+            ("fresh", 95, 1, "fp-new"),
+        ],
+    )
+    llm = _FakeLLM()
+    service = _build_service(session_factory, llm, monkeypatch, tokens_per_hour=100000)
+
+    stats = await service.run_once()
+
+    assert llm.batches == [["hot-new", "hot-old"], ["cold"]]
+    assert stats["analyzed"] == 3
+    async with session_factory() as session:
+        rows = (await session.execute(select(ContentAIAnalysis))).scalars().all()
+    assert {row.prompt_fingerprint for row in rows} == {"fp-new"}
+    assert await service.run_once() == {"batches": 0, "analyzed": 0, "failed": 0, "tokens": 0}
+
+
+@pytest.mark.asyncio
+async def test_backfill_stops_when_hourly_budget_is_spent(session_factory, monkeypatch) -> None:
+    await _seed(session_factory, [(f"t-{index}", 50, index, None) for index in range(6)])
+    llm = _FakeLLM()
+    # 每批约 200 token，预算只够一批
+    service = _build_service(session_factory, llm, monkeypatch, tokens_per_hour=250)
+
+    first = await service.run_once()
+    second = await service.run_once()
+
+    assert first["batches"] == 1
+    assert second["batches"] == 0
+    assert len(llm.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_budget_is_shared_across_processes_via_call_logs(session_factory, monkeypatch) -> None:
+    ids = [f"t-{index}" for index in range(6)]
+    await _seed(session_factory, [(external_id, 50, index, None) for index, external_id in enumerate(ids)])
+    await _attach_source(session_factory, ids)
+    first_llm, second_llm = _FakeLLM(), _FakeLLM()
+    # 两个实例模拟两个副本：各自的进程内状态互不可见，预算只能从调用日志读取
+    first = _build_service(session_factory, first_llm, monkeypatch, tokens_per_hour=250)
+    second = _build_service(session_factory, second_llm, monkeypatch, tokens_per_hour=250)
+
+    assert (await first.run_once())["batches"] == 1
+    assert (await second.run_once())["batches"] == 0
+    assert second_llm.batches == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_skips_when_another_process_holds_the_lease(session_factory, monkeypatch) -> None:
+    await _seed(session_factory, [("a", 50, 1, None)])
+    locks = RunLockService(backend=InMemoryRunLockBackend())
+    llm = _FakeLLM()
+    service = _build_service(session_factory, llm, monkeypatch, tokens_per_hour=100000, lock_service=locks)
+
+    lease = await locks.acquire("pipeline:backfill")
+    try:
+        assert await service.run_once() == {"batches": 0, "analyzed": 0, "failed": 0, "tokens": 0}
+    finally:
+        await locks.release(lease)
+    assert llm.batches == []
+    assert (await service.run_once())["analyzed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_retries_failed_rows_with_current_fingerprint(session_factory, monkeypatch) -> None:
+    await _seed(session_factory, [("failed", 50, 1, "fp-new")], status="failed")
+    await _seed(session_factory, [("ok", 60, 1, "fp-new")])
+    llm = _FakeLLM()
+    service = _build_service(session_factory, llm, monkeypatch, tokens_per_hour=100000)
+
+    stats = await service.run_once()
+
+    assert llm.batches == [["failed"]]
+    assert stats["analyzed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_failure_keeps_existing_analysis(session_factory, monkeypatch) -> None:
+    await _seed(session_factory, [("a", 50, 1, "fp-old"), ("b", 40, 1, "fp-old"), ("c", 30, 1, "fp-old")])
+    llm = _FakeLLM(fail=True)
+    service = _build_service(session_factory, llm, monkeypatch, tokens_per_hour=100000)
+
+    stats = await service.run_once()
+
+    # 同一轮内不重复请求同一批失败的条目
+    assert llm.batches == [["a", "b"], ["c"]]
+    assert stats["failed"] == 3
+    async with session_factory() as session:
+        rows = (await session.execute(select(ContentAIAnalysis))).scalars().all()
+    assert {(row.summary, row.prompt_fingerprint) for row in rows} == {("旧摘要", "fp-old")}
+
+
+@pytest.mark.asyncio
+async def test_backfill_backs_off_and_caps_failing_rows(session_factory, monkeypatch) -> None:
+    await _seed(session_factory, [("broken", 50, 1, "fp-new")], status="failed")
+    # 单条重分析接口记录的 degraded 已有模型结果，指纹未过期时不回填
+    await _seed(session_factory, [("degraded", 60, 1, "fp-new")], status="degraded")
+    llm = _FakeLLM(fail=True)
+    service = _build_service(session_factory, llm, monkeypatch, tokens_per_hour=100000)
+    monkeypatch.setattr(service._settings, "ANALYSIS_BACKFILL_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(service._settings, "ANALYSIS_BACKFILL_INTERVAL_MINUTES", 10)
+    clock = {"now": app_now()}
+    monkeypatch.setattr(backfill_module, "app_now", lambda: clock["now"])
+
+    assert (await service.run_once())["failed"] == 1
+    # 退避期内（第一次失败后 10 分钟）不再选中
+    clock["now"] += timedelta(minutes=5)
+    assert (await service.run_once())["batches"] == 0
+    clock["now"] += timedelta(minutes=6)
+    assert (await service.run_once())["failed"] == 1
+    # 达到次数上限后不再回填
+    clock["now"] += timedelta(days=1)
+    assert (await service.run_once())["batches"] == 0
+    assert llm.batches == [["broken"], ["broken"]]
+
+    async with session_factory() as session:
+        row = (
+            await session.execute(
+                select(ContentAIAnalysis).join(ContentItem).where(ContentItem.external_id == "broken")
+            )
+        ).scalar_one()
+    assert row.backfill_attempts == 2
+    assert row.status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_ensure_columns_adds_missing_nullable_column(session_factory) -> None:
+    async with session_factory() as session:
+        await session.execute(text("DROP INDEX idx_content_ai_analyses_prompt_fingerprint"))
+        await session.execute(text("ALTER TABLE content_ai_analyses DROP COLUMN prompt_fingerprint"))
+        await session.commit()
+        engine = session.bind
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_ensure_columns)
+        columns = [row[1] for row in (await conn.execute(text("PRAGMA table_info(content_ai_analyses)"))).all()]
+
+    assert "prompt_fingerprint" in columns
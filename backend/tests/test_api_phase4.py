@@ -2,19 +2,24 @@ from __future__ import annotations
 
 import os
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from core import app_now, get_settings
 from db.base import Base
 from db.session import get_db
 from main import app
-from models import ContentItem, PushLog, PushLogItem, PushStatus
+from models import ContentAIAnalysis, ContentItem, LLMCallLog, MonitorSource, PushLog, PushLogItem, PushStatus
 from routers import contents as contents_router_module
+from routers import jobs as jobs_router_module
 from schemas import LLMBatchItemAnalysisResult, LLMInsightItem
+from schemas.content import ContentAnalysisInfo, ContentListItem
+from services.run_event_bus import RunEvent, run_event_bus
 
 
 @pytest_asyncio.fixture
@@ -105,6 +110,11 @@ async def test_phase4_api_flow(test_client, monkeypatch: pytest.MonkeyPatch) ->
     assert run_now.status_code == 200
     assert run_now.json()["message"] == "accepted"
     assert run_now.json()["data"]["status"] == "accepted"
+    job_id = run_now.json()["data"]["job_id"]
+
+    run_now_status = await client.get(f"/api/jobs/run-now/{job_id}")
+    assert run_now_status.status_code == 200
+    assert run_now_status.json()["data"]["status"] == "queued"
 
     async with session_factory() as db:
         push_log = PushLog(
@@ -179,6 +189,16 @@ async def test_phase4_api_flow(test_client, monkeypatch: pytest.MonkeyPatch) ->
     analyze_content_404 = await client.post("/api/contents/99999/analyze")
     assert analyze_content_404.status_code == 404
 
+    # 单条重分析记录整批的状态：有结果但整批降级时不记为 success
+    async def _fake_degraded_items(items):
+        result = await _fake_analyze_items(items)
+        return result.model_copy(update={"status": "degraded", "failure_reason": "hedged_partial_output"})
+
+    monkeypatch.setattr(contents_router_module._llm_service, "analyze_items", _fake_degraded_items)
+    degraded = (await client.post(f"/api/contents/{content_item.id}/analyze")).json()["data"]["ai"]
+    assert degraded["status"] == "degraded"
+    assert degraded["failure_reason"] == "hedged_partial_output"
+
     list_logs = await client.get("/api/logs?page=1&page_size=10&status=success")
     assert list_logs.status_code == 200
     assert list_logs.json()["data"]["meta"]["total"] == 1
@@ -202,3 +222,211 @@ async def test_phase4_api_flow(test_client, monkeypatch: pytest.MonkeyPatch) ->
     delete_channel = await client.delete(f"/api/channels/{channel_id}")
     assert delete_channel.status_code == 200
     assert delete_channel.json()["data"]["deleted"] is True
+
+
+@pytest.mark.asyncio
+async def test_run_now_events_stream_stage_events(test_client, monkeypatch: pytest.MonkeyPatch) -> None:
+    client, _ = test_client
+
+    run_now = await client.post("/api/jobs/run-now")
+    job_id = run_now.json()["data"]["job_id"]
+
+    run_event_bus.publish(RunEvent(run_id=job_id, stage="crawled", source_id=1, data={"count": 12}))
+    run_event_bus.publish(RunEvent(run_id=job_id, stage="run_done", data={"total_sources": 1}))
+
+    async def _fake_load_job_state(_job_id):
+        return {"job_id": _job_id, "status": "done"}
+
+    monkeypatch.setattr(jobs_router_module, "_load_job_state", _fake_load_job_state)
+
+    resp = await client.get(f"/api/jobs/run-now/{job_id}/events")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    body = resp.text
+    assert body.index("event: job_status") < body.index("event: crawled") < body.index("event: run_done")
+    assert '"count": 12' in body
+    assert body.rstrip().endswith('"status": "done"}')
+
+
+@pytest.mark.asyncio
+async def test_dashboard_reports_real_token_usage(test_client) -> None:
+    client, session_factory = test_client
+    now = app_now()
+
+    async with session_factory() as db:
+        source = MonitorSource(type="author", value="karpathy", is_active=True)
+        db.add(source)
+        await db.flush()
+        for created_at, total_tokens, latency_ms in (
+            (now, 1200, 800),
+            (now, 800, 400),
+            (now - timedelta(days=1), 500, 600),
+            # 旧数据没有 usage，只计调用次数
+            (now - timedelta(days=1), None, None),
+        ):
+            db.add(
+                LLMCallLog(
+                    source_id=source.id,
+                    model="glm-test",
+                    prompt_text="p",
+                    status="success",
+                    call_type="reanalyze",
+                    prompt_tokens=total_tokens - 100 if total_tokens else None,
+                    completion_tokens=100 if total_tokens else None,
+                    total_tokens=total_tokens,
+                    latency_ms=latency_ms,
+                    created_at=created_at,
+                )
+            )
+        await db.commit()
+
+    overview = (await client.get("/api/dashboard/overview")).json()["data"]
+    assert overview["token_estimate"] == 2000
+    assert overview["token_usage_today"] == {
+        "calls": 2,
+        "prompt_tokens": 1800,
+        "completion_tokens": 200,
+        "total_tokens": 2000,
+        "avg_latency_ms": 600,
+    }
+
+    usage = (await client.get("/api/dashboard/token-usage?days=2")).json()["data"]
+    assert [(day["calls"], day["total_tokens"]) for day in usage["daily"]] == [(2, 500), (2, 2000)]
+    assert usage["daily"][-1]["date"] == now.date().isoformat()
+    assert len(usage["sources"]) == 1
+    assert usage["sources"][0]["source_value"] == "karpathy"
+    assert usage["sources"][0]["total_tokens"] == 2500
+    assert usage["sources"][0]["calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_answer_conditional_requests(test_client, monkeypatch: pytest.MonkeyPatch) -> None:
+    client, session_factory = test_client
+
+    source_id = (await client.post("/api/sources", json={"type": "author", "value": "karpathy"})).json()["data"]["id"]
+    first = await client.get("/api/sources?page=1&page_size=10")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert "last-modified" in first.headers
+
+    cached = await client.get("/api/sources?page=1&page_size=10", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # 筛选条件不同，ETag 不同
+    filtered = await client.get("/api/sources?page=1&page_size=10&type=author")
+    assert filtered.headers["etag"] != etag
+
+    # 修改后旧 ETag 失效
+    await client.put(f"/api/sources/{source_id}", json={"remark": "changed"})
+    refreshed = await client.get("/api/sources?page=1&page_size=10", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["data"]["items"][0]["remark"] == "changed"
+
+    contents = await client.get("/api/contents?page=1&page_size=20")
+    contents_etag = contents.headers["etag"]
+    assert (await client.get("/api/contents?page=1&page_size=20", headers={"If-None-Match": contents_etag})).status_code == 304
+    async with session_factory() as db:
+        db.add(
+            ContentItem(
+                platform="twitter",
+                source_type="author",
+                external_id="t-1",
+                author_name="karpathy",
+                url="https://x.com/karpathy/status/1",
+                content_text="new",
+                content_hash="h-1",
+            )
+        )
+        await db.commit()
+    contents = await client.get("/api/contents?page=1&page_size=20", headers={"If-None-Match": contents_etag})
+    assert contents.status_code == 200
+    assert contents.json()["data"]["meta"]["total"] == 1
+
+    overview = await client.get("/api/dashboard/overview")
+    assert (
+        await client.get("/api/dashboard/overview", headers={"If-None-Match": overview.headers["etag"]})
+    ).status_code == 304
+
+    monkeypatch.setattr(get_settings(), "HTTP_CACHE_ENABLED", False)
+    uncached = await client.get("/api/sources?page=1&page_size=10", headers={"If-None-Match": etag})
+    assert uncached.status_code == 200
+    assert "etag" not in uncached.headers
+
+
+@pytest.mark.asyncio
+async def test_content_list_matches_pydantic_serialization(test_client) -> None:
+    client, session_factory = test_client
+
+    async with session_factory() as db:
+        analyzed = ContentItem(
+            platform="twitter",
+            source_type="author",
+            external_id="t-1",
+            author_name="karpathy",
+            url="https://x.com/karpathy/status/1",
+            title="标题",
+            content_text="正文",
+            content_hash="h-1",
+            hotness=12,
+            published_at=datetime(2026, 1, 2, 8, 30, 15, 123456),
+        )
+        pending = ContentItem(
+            platform="twitter",
+            source_type="author",
+            external_id="t-2",
+            author_name="karpathy",
+            url="https://x.com/karpathy/status/2",
+            content_text="正文",
+            content_hash="h-2",
+        )
+        db.add_all([analyzed, pending])
+        await db.flush()
+        db.add(
+            ContentAIAnalysis(
+                content_item_id=analyzed.id,
+                model="glm-test",
+                ai_score=80,
+                summary="摘要",
+                content_hash="h-1",
+                status="degraded",
+                failure_reason="hedged_partial_output",
+            )
+        )
+        await db.commit()
+
+    items = (await client.get("/api/contents?page=1&page_size=10")).json()["data"]["items"]
+
+    # 列表接口直接构造 dict，输出必须与按 ContentListItem 校验后序列化的结果逐字段一致
+    async with session_factory() as db:
+        expected = {}
+        for content_item in await db.scalars(select(ContentItem)):
+            analysis = await db.scalar(
+                select(ContentAIAnalysis).where(ContentAIAnalysis.content_item_id == content_item.id)
+            )
+            ai = ContentAnalysisInfo.model_validate(analysis, from_attributes=True) if analysis else None
+            model = ContentListItem.model_validate(
+                {**{name: getattr(content_item, name) for name in ContentListItem.model_fields if name != "ai"}, "ai": ai}
+            )
+            expected[content_item.id] = model.model_dump(mode="json")
+    assert len(items) == 2
+    assert {item["id"]: item for item in items} == expected
+
+
+@pytest.mark.asyncio
+async def test_source_updated_at_uses_one_clock(test_client) -> None:
+    client, session_factory = test_client
+
+    source_id = (await client.post("/api/sources", json={"type": "author", "value": "karpathy"})).json()["data"]["id"]
+    async with session_factory() as db:
+        created_at = (await db.get(MonitorSource, source_id)).updated_at
+    await client.put(f"/api/sources/{source_id}", json={"remark": "changed"})
+    async with session_factory() as db:
+        updated_at = (await db.get(MonitorSource, source_id)).updated_at
+
+    # 创建与修改都按 app_now 写入：两者可直接比较，且修改时间不会早于创建时间
+    now = app_now().replace(tzinfo=None)
+    assert abs(now - created_at.replace(tzinfo=None)) < timedelta(minutes=1)
+    assert created_at < updated_at
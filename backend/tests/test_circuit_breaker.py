@@ -0,0 +1,36 @@
+import time
+
+from core.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+
+
+def test_breaker_opens_after_threshold_and_half_open_probe_recovers(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(name="glm", failure_threshold=2, recovery_seconds=30)
+
+    breaker.record_failure("timeout")
+    assert breaker.allow() is True
+    breaker.record_failure("timeout")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is False
+
+    now[0] += 31
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is True
+    # 探测进行中，其他调用仍被拒绝
+    assert breaker.allow() is False
+    breaker.record_failure("timeout")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] += 31
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["total_rejected"] == 2
+
+
+def test_registry_reuses_breaker_per_name() -> None:
+    registry = CircuitBreakerRegistry()
+    assert registry.get("webhook:https://a") is registry.get("webhook:https://a")
+    assert registry.get("webhook:https://b") is not registry.get("webhook:https://a")
+    assert [item["name"] for item in registry.snapshot()] == ["webhook:https://a", "webhook:https://b"]
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core import app_now
+from db.base import Base
+from models import ContentAIAnalysis, ContentItem, PipelineJob
+from schemas import LLMBatchItemAnalysisResult, LLMInsightItem
+from services.content_analysis_service import ContentAnalysisService
+from services.job_queue_service import JobQueueService
+from services.job_worker import JobWorker
+from services.pipeline_service import BatchRunResult
+
+
+class _FakePipeline:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def trigger_run_now(self, resume_run_id: str | None = None) -> BatchRunResult:
+        self.calls += 1
+        return BatchRunResult(total_sources=2, success_count=2, failed_count=0)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    fd, db_path = tempfile.mkstemp(prefix="job_queue_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield factory
+    await engine.dispose()
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_claim_next_is_exclusive(session_factory) -> None:
+    queue = JobQueueService()
+    async with session_factory() as session:
+        job = await queue.enqueue(session=session, kind="run_all")
+
+    async with session_factory() as session:
+        claimed = await queue.claim_next(session=session, worker_id="w1")
+    async with session_factory() as session:
+        second = await queue.claim_next(session=session, worker_id="w2")
+
+    assert claimed is not None
+    assert claimed.id == job.id
+    assert claimed.status == "running"
+    assert claimed.attempts == 1
+    assert second is None
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_job_and_records_result(session_factory) -> None:
+    pipeline = _FakePipeline()
+    queue = JobQueueService()
+    worker = JobWorker(pipeline_service=pipeline, job_queue=queue, session_factory=session_factory)  # type: ignore[arg-type]
+
+    async with session_factory() as session:
+        job = await queue.enqueue(session=session, kind="run_all")
+        unknown = await queue.enqueue(session=session, kind="unknown_kind")
+
+    assert await worker.run_once() is True
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    async with session_factory() as session:
+        done = queue.to_dict(await queue.get(session=session, job_id=job.id))
+        failed = queue.to_dict(await queue.get(session=session, job_id=unknown.id))
+
+    assert pipeline.calls == 1
+    assert done["status"] == "done"
+    assert done["result"]["success_count"] == 2
+    assert failed["status"] == "failed"
+    assert "unsupported_job_kind" in failed["error"]
+
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_and_finish_are_owned_by_claimer(session_factory) -> None:
+    queue = JobQueueService()
+    async with session_factory() as session:
+        job = await queue.enqueue(session=session, kind="run_all")
+        await queue.claim_next(session=session, worker_id="w1")
+
+    async def _age(job_id: str) -> None:
+        async with session_factory() as session:
+            await session.execute(
+                update(PipelineJob).where(PipelineJob.id == job_id).values(updated_at=app_now() - timedelta(hours=1))
+            )
+            await session.commit()
+
+    # 心跳刷新 updated_at：长任务不会被判定为僵死
+    await _age(job.id)
+    async with session_factory() as session:
+        assert await queue.heartbeat(session=session, job_id=job.id, worker_id="w1") is True
+        assert await queue.requeue_stale(session=session) == 0
+
+    # 心跳中断后任务被重新入队并由 w2 领取：w1 的结果与心跳都不再生效
+    await _age(job.id)
+    async with session_factory() as session:
+        assert await queue.requeue_stale(session=session) == 1
+        assert (await queue.claim_next(session=session, worker_id="w2")).id == job.id
+        assert await queue.heartbeat(session=session, job_id=job.id, worker_id="w1") is False
+        assert await queue.mark_done(session=session, job_id=job.id, worker_id="w1", result={"by": "w1"}) is False
+        assert await queue.mark_done(session=session, job_id=job.id, worker_id="w2", result={"by": "w2"}) is True
+        assert await queue.mark_failed(session=session, job_id=job.id, worker_id="w2", error="late") is False
+
+    async with session_factory() as session:
+        done = queue.to_dict(await queue.get(session=session, job_id=job.id))
+    assert done["status"] == "done"
+    assert done["result"] == {"by": "w2"}
+
+class _FakeLLM:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def prompt_fingerprint(self) -> str:
+        return "fp-test"
+
+    async def analyze_items(self, items):
+        self.batches.append([item.tweet_id for item in items])
+        # 模拟模型漏掉最后一条
+        return LLMBatchItemAnalysisResult(
+            status="degraded",
+            insights=[
+                LLMInsightItem(tweet_id=item.tweet_id, ai_score=80, summary=f"摘要 {item.tweet_id}", ai_title=None)
+                for item in items
+                if item.tweet_id != "t-5"
+            ],
+            model="glm-test",
+            prompt_text="prompt",
+            raw_response_text="{}",
+            failure_reason="missing_items_in_batch_output: 1",
+        )
+
+
+@pytest.mark.asyncio
+async def test_worker_reanalyzes_contents_in_batches(session_factory, monkeypatch) -> None:
+    llm = _FakeLLM()
+    analysis_service = ContentAnalysisService(llm_service=llm)  # type: ignore[arg-type]
+    monkeypatch.setattr(analysis_service._settings, "LLM_ANALYZE_BATCH_SIZE", 2)
+    queue = JobQueueService()
+    worker = JobWorker(
+        pipeline_service=_FakePipeline(),  # type: ignore[arg-type]
+        job_queue=queue,
+        session_factory=session_factory,
+        content_analysis_service=analysis_service,
+    )
+    progress: list[dict] = []
+    original_report = worker.report_progress
+
+    async def _record(job_id, data):
+        progress.append(dict(data))
+        await original_report(job_id, data)
+
+    monkeypatch.setattr(worker, "report_progress", _record)
+
+    now = datetime.now()
+    async with session_factory() as session:
+        rows = [
+            ContentItem(
+                platform="twitter",
+                source_type="author_timeline",
+                external_id=f"t-{index}",
+                author_name="openai",
+                url=f"https://x.com/openai/status/{index}",
+                title=None,
+                content_text=f"正文 {index}",
+                content_hash=f"hash-{index}",
+                published_at=now,
+                raw_payload="{}",
+                hotness=50,
+                created_at=now,
+                updated_at=now,
+            )
+            for index in range(1, 6)
+        ]
+        session.add_all(rows)
+        await session.commit()
+        content_ids = [row.id for row in rows]
+        job = await queue.enqueue(session=session, kind="content_reanalyze", payload={"content_ids": content_ids})
+
+    assert await worker.run_once() is True
+
+    async with session_factory() as session:
+        done = queue.to_dict(await queue.get(session=session, job_id=job.id))
+        analyses = (await session.execute(select(ContentAIAnalysis))).scalars().all()
+
+    assert llm.batches == [["t-1", "t-2"], ["t-3", "t-4"], ["t-5"]]
+    assert [item["done"] for item in progress[1:]] == [2, 4, 5]
+    assert done["status"] == "done"
+    assert done["result"]["success"] == 4
+    assert done["result"]["failed"] == 1
+    statuses = {row.content_item_id: row.status for row in analyses}
+    assert statuses[content_ids[-1]] == "failed"
+    assert sum(1 for status in statuses.values() if status == "success") == 4
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+import core.json_response as json_response_module
+from core.json_response import FastJSONResponse, json_dumps
+from models import ChannelPlatform, PushStatus
+from schemas import PushChannelResponse
+
+
+def _sample() -> dict:
+    channel = PushChannelResponse(
+        id=1,
+        platform=ChannelPlatform.FEISHU,
+        webhook_url="https://open.feishu.cn/open-apis/bot/v2/hook/abc",
+        name="飞书",
+    )
+    return {
+        "code": 0,
+        "message": "ok",
+        "data": {
+            "created_at": datetime(2026, 1, 2, 8, 30, 15, 123456),
+            "aware": datetime(2026, 1, 2, 8, 30, tzinfo=timezone(timedelta(hours=8))),
+            "status": PushStatus.SUCCESS,
+            "channel": channel,
+            "channel_dump": channel.model_dump(),
+            "ratio": Decimal("0.25"),
+            "count": Decimal("3"),
+            "tags": ["大模型", "RAG"],
+            "empty": None,
+        },
+    }
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps_matches_jsonable_encoder(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_response_module, "orjson", None)
+    elif json_response_module.orjson is None:
+        pytest.skip("orjson not installed")
+
+    content = _sample()
+    assert json.loads(json_dumps(content)) == jsonable_encoder(content)
+    # 中文不转义
+    assert "大模型".encode("utf-8") in json_dumps(content)
+
+
+def test_fast_json_response_rejects_unknown_types() -> None:
+    with pytest.raises(TypeError):
+        FastJSONResponse({"value": object()})
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps_writes_utc_like_pydantic(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_response_module, "orjson", None)
+    elif json_response_module.orjson is None:
+        pytest.skip("orjson not installed")
+
+    values = [
+        datetime(2026, 1, 2, 8, 30, 15, 123456, tzinfo=timezone.utc),
+        datetime(2026, 1, 2, 8, 30, tzinfo=timezone(timedelta(0))),
+        datetime(2026, 1, 2, 8, 30, tzinfo=timezone(timedelta(hours=8))),
+        datetime(2026, 1, 2, 8, 30),
+    ]
+    assert json.loads(json_dumps(values)) == TypeAdapter(list[datetime]).dump_python(values, mode="json")
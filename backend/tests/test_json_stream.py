@@ -0,0 +1,33 @@
+from core.json_stream import JsonItemsStreamDecoder, decode_json_items
+
+
+def test_stream_decoder_emits_each_array_element_once_complete() -> None:
+    decoder = JsonItemsStreamDecoder()
+    assert decoder.feed('好的：[{"tweet_id": "1", "summary": "a') == []
+    assert decoder.feed('"}, {"tweet_id": "2"') == [{"tweet_id": "1", "summary": "a"}]
+    assert decoder.feed(', "summary": "b"}]') == [{"tweet_id": "2", "summary": "b"}]
+    assert decoder.finish() == []
+    assert len(decoder.items) == 2
+
+
+def test_decode_json_items_accepts_single_object_without_array() -> None:
+    assert decode_json_items('{"tweet_id": "1", "summary": "a"}') == [{"tweet_id": "1", "summary": "a"}]
+    assert decode_json_items("no json here") == []
+
+
+def test_decode_json_items_ignores_brackets_inside_strings() -> None:
+    assert decode_json_items('{"tweet_id":"1","summary":"用 [RAG] 做检索"}') == [
+        {"tweet_id": "1", "summary": "用 [RAG] 做检索"}
+    ]
+    assert decode_json_items('[{"tweet_id":"1","summary":"a] [b"}]') == [{"tweet_id": "1", "summary": "a] [b"}]
+
+
+def test_decode_json_items_finds_wrapper_list_after_other_keys() -> None:
+    text = '```json\n{"note":"见[1]","meta":{"items":[0]},"items":[{"tweet_id":"1"},{"tweet_id":"2"}]}\n```'
+    assert decode_json_items(text) == [{"tweet_id": "1"}, {"tweet_id": "2"}]
+
+    decoder = JsonItemsStreamDecoder()
+    assert decoder.feed('{"note":"见[1]", "items": [{"tweet_id":"1"}, {"tweet') == [{"tweet_id": "1"}]
+    # 截断：保留已完整的元素
+    assert decoder.finish() == []
+    assert decoder.items == [{"tweet_id": "1"}]
@@ -1,7 +1,14 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
 import pytest
 
-from schemas import CrawlItem
-from services.llm_service import LLMService
+import services.llm_service as llm_service_module
+from core.circuit_breaker import circuit_breakers
+from core.request_context import run_deadline_ctx_var
+from schemas import CrawlItem, LLMBatchItemAnalysisResult, LLMInsightItem
+from services.llm_service import InsightStreamParser, LLMService, parse_batch_item_output
 
 
 def _sample_items() -> list[CrawlItem]:
@@ -44,12 +51,11 @@ def test_validate_summary_extracts_insights_and_scores() -> None:
 
 
 def test_parse_batch_item_output_success() -> None:
-    service = LLMService()
     text = (
         '[{"tweet_id":"1","ai_score":88,"summary":"这条资讯强调了异步队列在高并发任务调度中的价值。",'
         '"ai_title":"异步队列在高并发下的调度价值"}]'
     )
-    insights = service._parse_batch_item_output(text, allowed_ids={"1", "2"})
+    insights = parse_batch_item_output(text, allowed_ids={"1", "2"})
     assert len(insights) == 1
     assert insights[0].tweet_id == "1"
     assert insights[0].ai_score == 88
@@ -63,3 +69,267 @@ async def test_summarize_failed_without_api_key(monkeypatch: pytest.MonkeyPatch)
     result = await service.summarize(_sample_items())
     assert result.status == "failed"
     assert result.failure_reason == "missing_zai_api_key"
+
+
+@pytest.mark.asyncio
+async def test_summarize_fails_fast_when_glm_circuit_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    circuit_breakers.reset()
+    service = LLMService()
+    service._settings.ZAI_API_KEY = "x"
+    calls = 0
+
+    async def _broken_glm(api_key, messages):
+        nonlocal calls
+        calls += 1
+        raise TimeoutError("glm_timeout")
+
+    async def _no_sleep(_seconds):
+        return None
+
+    monkeypatch.setattr(service, "_call_glm", _broken_glm)
+    monkeypatch.setattr(llm_service_module.asyncio, "sleep", _no_sleep)
+    threshold = service._settings.CIRCUIT_FAILURE_THRESHOLD
+    for _ in range(threshold):
+        await service.summarize(_sample_items())
+    calls_before_open = calls
+
+    result = await service.summarize(_sample_items())
+    circuit_breakers.reset()
+    assert calls == calls_before_open
+    assert result.status == "failed"
+    assert result.failure_reason.startswith("circuit_open: glm")
+
+
+@pytest.mark.asyncio
+async def test_call_glm_hedges_after_p95_and_cancels_loser(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = LLMService()
+    monkeypatch.setattr(service._settings, "GLM_HEDGE_ENABLED", True)
+    monkeypatch.setattr(service._settings, "GLM_HEDGE_MIN_SAMPLES", 1)
+    monkeypatch.setattr(service._settings, "GLM_TIMEOUT_SECONDS", 5)
+    monkeypatch.setattr(LLMService, "_latency", llm_service_module.LatencyWindow(size=10))
+    LLMService._latency.record(0.01)
+    calls = 0
+    cancelled = 0
+
+    async def _request(api_key, messages, timeout, **kwargs):
+        nonlocal calls, cancelled
+        calls += 1
+        try:
+            # 第一次请求卡住（长尾），对冲请求很快返回
+            await asyncio.sleep(10 if calls == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return f"answer-{calls}"
+
+    monkeypatch.setattr(service, "_request_glm", _request)
+    assert await service._call_glm(api_key="x", messages=[]) == "answer-2"
+    await asyncio.sleep(0)
+    assert (calls, cancelled) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_summarize_stops_when_run_deadline_exhausted(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = LLMService()
+    service._settings.ZAI_API_KEY = "x"
+
+    async def _never_called(api_key, messages):
+        raise AssertionError("glm should not be called after run deadline")
+
+    monkeypatch.setattr(service, "_call_glm", _never_called)
+    token = run_deadline_ctx_var.set(time.monotonic() - 1)
+    try:
+        result = await service.summarize(_sample_items())
+    finally:
+        run_deadline_ctx_var.reset(token)
+    assert result.status == "failed"
+    assert result.failure_reason == "run_deadline_exceeded"
+
+
+def test_insight_stream_parser_emits_completed_lines_only() -> None:
+    parser = InsightStreamParser()
+    assert parser.feed("## 🔍 关键洞察\n- ID: 1001 | AI评分: 9") == []
+    produced = parser.feed("5 | 观点: 新推理架构更稳定。\n- ID: 1002 | AI评分: 90 | 观点: 工具调用")
+    assert [item.tweet_id for item in produced] == ["1001"]
+    assert produced[0].ai_score == 95
+    assert [item.summary for item in parser.finish()] == ["工具调用"]
+
+
+@pytest.mark.asyncio
+async def test_summarize_streaming_keeps_partial_insights_when_stream_breaks(monkeypatch: pytest.MonkeyPatch) -> None:
+    circuit_breakers.reset()
+    service = LLMService()
+    monkeypatch.setattr(service._settings, "ZAI_API_KEY", "x")
+    monkeypatch.setattr(service._settings, "GLM_STREAM_ENABLED", True)
+    received: list[str] = []
+
+    async def _stream(api_key, messages, timeout):
+        yield "- ID: 1 | AI评分: 80 | 观点: 第一条已经完整。\n"
+        yield "- ID: 2 | AI评分: 7"
+        raise ConnectionError("stream_reset")
+
+    async def _on_insight(insight):
+        received.append(insight.tweet_id)
+
+    monkeypatch.setattr(service, "_stream_glm", _stream)
+    result = await service.summarize(_sample_items(), on_insight=_on_insight)
+    circuit_breakers.reset()
+
+    assert received == ["1"]
+    assert result.status == "degraded"
+    assert [item.tweet_id for item in result.insights] == ["1"]
+    assert result.failure_reason.startswith("stream_truncated")
+
+
+def test_parse_batch_item_output_tolerates_fences_wrapper_and_truncation() -> None:
+    text = (
+        "```json\n"
+        '{"items": [{"tweet_id": "1", "ai_score": 120, "summary": "完整条目", "ai_title": "标题"},'
+        ' {"tweet_id": "9", "ai_score": 50, "summary": "不在输入中"},'
+        ' {"tweet_id": "2", "ai_score": 70, "summ'
+    )
+    insights = parse_batch_item_output(text, allowed_ids={"1", "2"})
+    assert [(item.tweet_id, item.ai_score) for item in insights] == [("1", 100)]
+
+
+@pytest.mark.asyncio
+async def test_analyze_items_falls_back_to_markdown_when_json_unparseable(monkeypatch: pytest.MonkeyPatch) -> None:
+    circuit_breakers.reset()
+    service = LLMService()
+    monkeypatch.setattr(service._settings, "ZAI_API_KEY", "x")
+    monkeypatch.setattr(service._settings, "LLM_OUTPUT_MODE", "json")
+    formats: list[object] = []
+
+    async def _glm(api_key, messages, response_format=None):
+        formats.append(response_format)
+        if response_format is not None:
+            return "抱歉，无法输出 JSON"
+        return "## 🔍 关键洞察\n- ID: 1 | AI评分: 77 | 观点: Markdown 兜底解析成功。\n"
+
+    monkeypatch.setattr(service, "_call_glm", _glm)
+    result = await service.analyze_items(_sample_items())
+    circuit_breakers.reset()
+
+    assert formats == [{"type": "json_object"}, None]
+    assert result.status == "success"
+    assert [(item.tweet_id, item.ai_score) for item in result.insights] == [("1", 77)]
+
+
+@pytest.mark.asyncio
+async def test_markdown_fallback_does_not_consume_retry_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    circuit_breakers.reset()
+    service = LLMService()
+    monkeypatch.setattr(service._settings, "ZAI_API_KEY", "x")
+    monkeypatch.setattr(service._settings, "LLM_OUTPUT_MODE", "json")
+    monkeypatch.setattr(service._settings, "GLM_MAX_RETRIES", 0)
+    formats: list[object] = []
+
+    async def _glm(api_key, messages, response_format=None):
+        formats.append(response_format)
+        if response_format is not None:
+            return "not json"
+        return "## 🔍 关键洞察\n- ID: 1 | AI评分: 66 | 观点: 无重试次数时仍会走 Markdown 兜底。\n"
+
+    monkeypatch.setattr(service, "_call_glm", _glm)
+    result = await service.analyze_items(_sample_items())
+    circuit_breakers.reset()
+
+    assert formats == [{"type": "json_object"}, None]
+    assert result.status == "success"
+
+
+@pytest.mark.asyncio
+async def test_analyze_items_requeues_only_missing_ids_with_attempt_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = LLMService()
+    monkeypatch.setattr(service._settings, "LLM_ANALYZE_BATCH_SIZE", 2)
+    monkeypatch.setattr(service._settings, "LLM_ITEM_MAX_ATTEMPTS", 2)
+    items = [
+        CrawlItem(source="demo", tweet_id=str(i), author_username="a", url=f"https://x.com/a/status/{i}", text=f"t{i}")
+        for i in range(1, 4)
+    ]
+    requested: list[list[str]] = []
+
+    async def _batch(batch):
+        ids = [item.tweet_id for item in batch]
+        requested.append(ids)
+        # "2" 第一次被漏答、第二次才返回；"3" 始终漏答
+        answered = [tweet_id for tweet_id in ids if tweet_id == "1" or (tweet_id == "2" and len(requested) > 1)]
+        return LLMBatchItemAnalysisResult(
+            status="success" if answered == ids else "degraded",
+            insights=[LLMInsightItem(tweet_id=tweet_id, ai_score=60, summary="ok") for tweet_id in answered],
+        )
+
+    monkeypatch.setattr(service, "_analyze_batch", _batch)
+    result = await service.analyze_items(items)
+
+    assert requested == [["1", "2"], ["3", "2"], ["3"]]
+    assert [item.tweet_id for item in result.insights] == ["1", "2"]
+    assert result.status == "degraded"
+    assert result.failure_reason == "missing_items_in_batch_output: 1"
+
+
+def test_prompt_fingerprint_changes_with_model_and_template(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = LLMService()
+    original = service.prompt_fingerprint()
+    assert service.prompt_fingerprint() == original
+
+    monkeypatch.setattr(service._settings, "GLM_MODEL", "glm-other")
+    by_model = service.prompt_fingerprint()
+    assert by_model != original
+
+    original_build = service.build_item_messages
+    monkeypatch.setattr(
+        service,
+        "build_item_messages",
+        lambda items: [*original_build(items), {"role": "user", "content": "补充要求"}],
+    )
+    assert service.prompt_fingerprint() not in (original, by_model)
+
+
+@pytest.mark.asyncio
+async def test_analyze_items_accumulates_reported_usage_across_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    circuit_breakers.reset()
+    service = LLMService()
+    monkeypatch.setattr(service._settings, "ZAI_API_KEY", "x")
+    monkeypatch.setattr(service._settings, "LLM_OUTPUT_MODE", "markdown")
+    monkeypatch.setattr(service._settings, "GLM_HEDGE_ENABLED", False)
+    monkeypatch.setattr(service._settings, "LLM_ITEM_MAX_ATTEMPTS", 2)
+    items = [
+        CrawlItem(source="demo", tweet_id=str(i), author_username="a", url=f"https://x.com/a/status/{i}", text=f"t{i}")
+        for i in (1, 2)
+    ]
+    calls = 0
+
+    async def _request(api_key, messages, timeout, response_format=None):
+        nonlocal calls
+        calls += 1
+        llm_service_module._record_usage(
+            SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120),
+            model="glm-test",
+        )
+        # 第一次漏答 "2"，重试时补上
+        tweet_id = "1" if calls == 1 else "2"
+        return f"## 🔍 关键洞察\n- ID: {tweet_id} | AI评分: 70 | 观点: ok。\n"
+
+    monkeypatch.setattr(service, "_request_glm", _request)
+    result = await service.analyze_items(items)
+    circuit_breakers.reset()
+
+    assert calls == 2
+    assert [item.tweet_id for item in result.insights] == ["1", "2"]
+    assert (result.prompt_tokens, result.completion_tokens, result.total_tokens) == (200, 40, 240)
+    assert result.latency_ms is not None and result.latency_ms >= 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_items_leaves_tokens_empty_without_reported_usage(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = LLMService()
+
+    async def _batch(batch):
+        return LLMBatchItemAnalysisResult(insights=[LLMInsightItem(tweet_id="1", ai_score=60, summary="ok")])
+
+    monkeypatch.setattr(service, "_analyze_batch", _batch)
+    result = await service.analyze_items(_sample_items())
+
+    assert result.total_tokens is None
+    assert result.latency_ms is None
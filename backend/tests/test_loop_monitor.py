@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from core.loop_monitor import LoopMonitor
+from core.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG_SECONDS
+
+
+def _blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_records_lag_and_blocking_stack(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.WARNING, logger="core.loop_monitor")
+    monitor = LoopMonitor()
+    blocked_before = EVENT_LOOP_BLOCKED.get()
+    lag_samples_before = EVENT_LOOP_LAG_SECONDS.count()
+    monitor.start(interval=0.01, threshold_ms=50)
+    try:
+        await asyncio.sleep(0.05)
+        _blocking_call(0.2)
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["running"] is False
+    assert snapshot["blocked_count"] == 1
+    assert snapshot["max_lag_ms"] >= 100
+    block = snapshot["recent_blocks"][0]
+    assert block["where"].startswith("_blocking_call (tests/test_loop_monitor.py:")
+    # 调用栈只进日志，不出现在快照（/health/loop）中
+    assert "stack" not in block
+    blocked_logs = [record.getMessage() for record in caplog.records if "event_loop_blocked" in record.getMessage()]
+    assert len(blocked_logs) == 1 and "_blocking_call" in blocked_logs[0]
+    assert block["duration_ms"] >= 100
+    assert EVENT_LOOP_BLOCKED.get() == blocked_before + 1
+    assert EVENT_LOOP_LAG_SECONDS.count() > lag_samples_before
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_ignores_short_callbacks() -> None:
+    monitor = LoopMonitor()
+    monitor.start(interval=0.01, threshold_ms=200)
+    try:
+        for _ in range(5):
+            _blocking_call(0.02)
+            await asyncio.sleep(0.01)
+    finally:
+        monitor.stop()
+
+    assert monitor.snapshot()["blocked_count"] == 0
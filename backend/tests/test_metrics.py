@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from core.metrics import HTTP_REQUEST_SECONDS, MetricsRegistry
+from main import app
+
+
+def test_counter_and_gauge_render_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo counter.", ("result",))
+    gauge = registry.gauge("demo_inflight", "Demo gauge.")
+    counter.inc(result="hit")
+    counter.inc(2, result="hit")
+    counter.inc(result='mi"ss')
+    gauge.set(3)
+    gauge.dec()
+
+    text = registry.render()
+
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{result="hit"} 3' in text
+    assert 'demo_total{result="mi\\"ss"} 1' in text
+    assert "demo_inflight 2" in text
+    with pytest.raises(ValueError):
+        counter.inc(result="hit", extra="x")
+    with pytest.raises(ValueError):
+        counter.inc(-1, result="hit")
+
+
+def test_histogram_buckets_are_cumulative_and_time_records_status() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo histogram.", ("stage", "status"), buckets=(0.1, 1))
+    histogram.observe(0.05, stage="crawl", status="ok")
+    histogram.observe(0.5, stage="crawl", status="ok")
+    histogram.observe(5, stage="crawl", status="ok")
+    with pytest.raises(RuntimeError):
+        with histogram.time(stage="crawl"):
+            raise RuntimeError("boom")
+
+    text = registry.render()
+
+    assert 'demo_seconds_bucket{stage="crawl",status="ok",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="crawl",status="ok",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="crawl",status="ok",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="crawl",status="ok"} 3' in text
+    assert histogram.count(stage="crawl", status="error") == 1
+    # 同名同定义重复注册返回同一实例，定义不同则报错
+    assert registry.histogram("demo_seconds", "x", ("stage", "status")) is histogram
+    with pytest.raises(ValueError):
+        registry.counter("demo_seconds", "x")
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_http_latency_by_route_template() -> None:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        before = HTTP_REQUEST_SECONDS.count(method="GET", route="/health", status="200")
+        await client.get("/health")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert HTTP_REQUEST_SECONDS.count(method="GET", route="/health", status="200") == before + 1
+    assert "# TYPE pipeline_stage_duration_seconds histogram" in response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
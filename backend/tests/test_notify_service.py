@@ -1,5 +1,8 @@
+import httpx
 import pytest
 
+from core import get_settings
+from core.circuit_breaker import circuit_breakers
 from models import ChannelPlatform, PushChannel
 from services.notify_service import DigestItem, NotifyService
 
@@ -112,3 +115,32 @@ async def test_notify_channels_limit_feishu_to_top_10(monkeypatch: pytest.Monkey
 
     wechat_text = payload_map["wechat"]["markdown"]["content"]
     assert wechat_text.count("# 🚀 [") == 12
+
+
+@pytest.mark.asyncio
+async def test_webhook_breaker_is_per_url_and_hides_secrets(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "CIRCUIT_FAILURE_THRESHOLD", 1)
+    circuit_breakers.reset()
+    service = NotifyService()
+    base = "https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key="
+    dead = PushChannel(id=1, platform=ChannelPlatform.WECHAT, webhook_url=base + "dead-secret", name="dead", is_active=True)
+    alive = PushChannel(id=2, platform=ChannelPlatform.WECHAT, webhook_url=base + "alive-secret", name="alive", is_active=True)
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500 if "dead" in str(request.url) else 200, json={"errcode": 0})
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+            assert not (await service._send_one(client=client, channel=dead, payload={})).success
+            # 同平台的另一个机器人只在 key 上不同，不受失效机器人的熔断影响
+            assert (await service._send_one(client=client, channel=alive, payload={})).success
+            skipped = await service._send_one(client=client, channel=dead, payload={})
+        assert skipped.error.startswith("circuit_open: webhook:")
+
+        snapshot = {item["name"]: item for item in circuit_breakers.snapshot()}
+        assert len(snapshot) == 2
+        assert sorted(item["state"] for item in snapshot.values()) == ["closed", "open"]
+        assert "http_500" in [item["last_error"] for item in snapshot.values()]
+        assert "secret" not in repr(snapshot) and "secret" not in skipped.error
+    finally:
+        circuit_breakers.reset()
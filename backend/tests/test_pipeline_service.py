@@ -1,8 +1,13 @@
+import asyncio
+
 import pytest
 
 from models import MonitorSource, PushStatus
 from schemas import CrawlBatchResult, CrawlItem, LLMInsightItem
-from services.pipeline_service import PipelineService
+from services.pipeline_service import PipelineService, SourceRunContext, SourceRunResult
+from services.run_checkpoint_service import SourceCheckpoint
+from services.run_item_registry import RunItemRegistry
+from services.run_lock_service import InMemoryRunLockBackend, RunLease, RunLockService
 
 
 class _FakeCrawler:
@@ -176,3 +181,210 @@ def test_apply_ai_generated_title_from_summary_when_title_missing() -> None:
     PipelineService._apply_ai_generated_title_if_missing(content_item=content, insight=insight)  # type: ignore[arg-type]
     assert content.title is not None
     assert content.title.startswith("[AI生成] ")
+
+
+@pytest.mark.asyncio
+async def test_staged_run_overlaps_stages_and_keeps_source_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    locks = RunLockService(backend=InMemoryRunLockBackend())
+    service = PipelineService(
+        crawler_service=_FakeCrawler(),
+        filter_service=_FakeFilter(),
+        llm_service=_FakeLLM(),
+        notify_service=_FakeNotify(),
+        run_lock_service=locks,
+    )
+    monkeypatch.setattr(service._settings, "PIPELINE_CRAWL_CONCURRENCY", 1)
+    monkeypatch.setattr(service._settings, "PIPELINE_ANALYZE_CONCURRENCY", 1)
+    monkeypatch.setattr(service._settings, "PIPELINE_NOTIFY_CONCURRENCY", 1)
+    monkeypatch.setattr(service._settings, "PIPELINE_STAGE_QUEUE_SIZE", 1)
+
+    timeline: list[tuple[str, int]] = []
+
+    async def _crawl(source, **kwargs):
+        timeline.append(("crawl", source.id))
+        await asyncio.sleep(0.01)
+        return SourceRunContext(source=source, total_items=source.id)
+
+    async def _analyze(session, ctx):
+        timeline.append(("analyze_start", ctx.source.id))
+        await asyncio.sleep(0.05)
+        timeline.append(("analyze_end", ctx.source.id))
+        return ctx
+
+    async def _notify(session, ctx):
+        return SourceRunResult(
+            source_id=ctx.source.id,
+            status=PushStatus.SUCCESS,
+            total_items=ctx.total_items,
+            cleaned_items=0,
+            notify_success_count=0,
+        )
+
+    monkeypatch.setattr(service, "_stage_crawl", _crawl)
+    monkeypatch.setattr(service, "_stage_analyze", _analyze)
+    monkeypatch.setattr(service, "_stage_notify", _notify)
+
+    sources = [MonitorSource(id=i, type="author", value=f"u{i}", is_active=True, remark=None) for i in (1, 2, 3, 4)]
+    busy = await locks.acquire("pipeline:source:4")
+    try:
+        results, skipped = await service._run_sources_staged(sources)
+    finally:
+        await locks.release(busy)
+
+    assert [r.source_id for r in results] == [1, 2, 3]
+    assert skipped == 1
+    # 源 2 的抓取发生在源 1 的 AI 分析结束之前（阶段重叠）
+    assert timeline.index(("crawl", 2)) < timeline.index(("analyze_end", 1))
+
+
+@pytest.mark.asyncio
+async def test_run_source_resume_skips_crawl_and_notified_push() -> None:
+    class _FailingCrawler(_FakeCrawler):
+        async def crawl_by_author(self, user_name: str, cursor: str | None = None) -> CrawlBatchResult:
+            raise AssertionError("crawl should be skipped on resume")
+
+    service = PipelineService(
+        crawler_service=_FailingCrawler(),
+        filter_service=_FakeFilter(),
+        llm_service=_FakeLLM(),
+        notify_service=_FakeNotify(),
+    )
+    item = CrawlItem(source="author_timeline", tweet_id="1", author_username="a", url="https://x.com/a/status/1", text="hello")
+    source = MonitorSource(id=1, type="author", value="karpathy", is_active=True, remark=None)
+
+    result = await service.run_source(
+        session=_FakeSession(),
+        source=source,
+        checkpoint=SourceCheckpoint(stage="notified", items=[item]),
+    )
+    assert result.status == PushStatus.SUCCESS
+    assert result.total_items == 1
+    assert result.notify_success_count == 0
+
+
+@pytest.mark.asyncio
+async def test_overlapping_sources_share_persist_and_analysis(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _OverlapCrawler(_FakeCrawler):
+        async def crawl_by_keyword(self, keyword: str, query_type: str = "Latest", cursor: str | None = None):
+            items = await self.crawl_by_author(user_name="karpathy")
+            items.items.append(
+                CrawlItem(source="search", tweet_id="2", author_username="b", url="https://x.com/b/status/2", text="x")
+            )
+            return items
+
+    service = PipelineService(
+        crawler_service=_OverlapCrawler(),
+        filter_service=_FakeFilter(),
+        llm_service=_FakeLLM(),
+        notify_service=_FakeNotify(),
+    )
+    analyzed: list[str] = []
+    summaries: dict[int, set[str]] = {}
+
+    async def _count_new_items(session, items):
+        return len(items)
+
+    async def _upsert(session, items):
+        await asyncio.sleep(0.01)
+        return {item.tweet_id: object() for item in items}
+
+    async def _ai_map(session, source, items, content_map):
+        analyzed.extend(item.tweet_id for item in items)
+        return {item.tweet_id: LLMInsightItem(tweet_id=item.tweet_id, ai_score=80, summary="s") for item in items}
+
+    def _summary(items, ai_insight_map):
+        summaries[len(summaries)] = set(ai_insight_map)
+        return ""
+
+    async def _no_channels(session, source_id):
+        return []
+
+    monkeypatch.setattr(service, "_count_new_items", _count_new_items)
+    monkeypatch.setattr(service, "_upsert_content_items", _upsert)
+    monkeypatch.setattr(service, "_build_ai_insight_map", _ai_map)
+    monkeypatch.setattr(service, "_build_summary_markdown", _summary)
+    monkeypatch.setattr(service, "_load_active_channels", _no_channels)
+
+    registry = RunItemRegistry()
+    author = MonitorSource(id=1, type="author", value="karpathy", is_active=True, remark=None)
+    keyword = MonitorSource(id=2, type="keyword", value="fastapi", is_active=True, remark=None)
+    results = await asyncio.gather(
+        service.run_source(session=_FakeSession(), source=author, registry=registry),
+        service.run_source(session=_FakeSession(), source=keyword, registry=registry),
+    )
+
+    assert [r.status for r in results] == [PushStatus.SUCCESS, PushStatus.SUCCESS]
+    assert sorted(analyzed) == ["1", "2"]
+    assert registry.shared_hits == 1
+    assert [r.new_items for r in results] == [1, 1]
+    assert sorted(map(sorted, summaries.values())) == [["1"], ["1", "2"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_cancelled_when_run_lease_is_lost() -> None:
+    cancelled = asyncio.Event()
+
+    async def _batch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    # 续约任务自行结束即表示租约已被其他进程接管
+    lease = RunLease(name="pipeline:run_all", owner="o", heartbeat=asyncio.create_task(asyncio.sleep(0)))
+    result = await PipelineService._run_while_leased(lease, _batch())
+
+    assert cancelled.is_set()
+    assert result.skipped_reason == "run_lock_lost"
+    assert result.total_sources == 0
+
+
+@pytest.mark.asyncio
+async def test_staged_run_teardown_releases_leases_when_cancelled(monkeypatch: pytest.MonkeyPatch) -> None:
+    locks = RunLockService(backend=InMemoryRunLockBackend())
+    service = PipelineService(
+        crawler_service=_FakeCrawler(),
+        filter_service=_FakeFilter(),
+        llm_service=_FakeLLM(),
+        notify_service=_FakeNotify(),
+        run_lock_service=locks,
+    )
+    analyzing = asyncio.Event()
+
+    async def _crawl(source, **kwargs):
+        return SourceRunContext(source=source)
+
+    async def _analyze(session, ctx):
+        analyzing.set()
+        await asyncio.sleep(10)
+        return ctx
+
+    monkeypatch.setattr(service, "_stage_crawl", _crawl)
+    monkeypatch.setattr(service, "_stage_analyze", _analyze)
+    sources = [MonitorSource(id=i, type="author", value=f"u{i}", is_active=True, remark=None) for i in (1, 2, 3)]
+
+    # 取消：阻塞中的下游 worker 被一并取消，持有的单源锁全部释放
+    task = asyncio.create_task(service._run_sources_staged(sources))
+    await asyncio.wait_for(analyzing.wait(), timeout=1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    for source in sources:
+        lease = await locks.acquire(f"pipeline:source:{source.id}")
+        assert lease is not None
+        await locks.release(lease)
+
+    # 抓取 worker 在 _stage_crawl 的异常处理之外出错：异常向上抛出，而不是永久等待下游的结束标记
+    async def _failing_crawl(source, **kwargs):
+        if source.id == 3:
+            raise RuntimeError("tracer_failed")
+        return SourceRunContext(source=source)
+
+    monkeypatch.setattr(service, "_stage_crawl", _failing_crawl)
+    with pytest.raises(RuntimeError, match="tracer_failed"):
+        await asyncio.wait_for(service._run_sources_staged(sources), timeout=2)
+    for source in sources:
+        lease = await locks.acquire(f"pipeline:source:{source.id}")
+        assert lease is not None
+        await locks.release(lease)
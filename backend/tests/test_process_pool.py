@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core.metrics import PROCESS_POOL_TASKS
+from core.process_pool import ProcessPool
+from services.llm_service import parse_batch_item_output, parse_summary_response
+from services.notify_service import DigestItem, render_channel_payload
+
+
+def _exit_in_child(parent_pid: int) -> str:
+    # 模拟子进程崩溃；回退到父进程就地执行时正常返回
+    if os.getpid() != parent_pid:
+        os._exit(1)
+    return "inline"
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_small_batches_inline() -> None:
+    pool = ProcessPool()
+    pool.configure(workers=2, min_batch=10)
+    before = PROCESS_POOL_TASKS.get(task="parse_summary_response", mode="inline")
+    text = "综合评分: 80"
+
+    # 按文本长度计量时使用调用方给的阈值，而不是条目数阈值
+    parsed = await pool.run(parse_summary_response, text, size=len(text), min_size=1000)
+    assert parsed.overall_score == 80
+    assert PROCESS_POOL_TASKS.get(task="parse_summary_response", mode="inline") == before + 1
+    # 未按需创建进程池
+    assert pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_process_pool_offloads_large_batches_and_survives_broken_pool() -> None:
+    pool = ProcessPool()
+    pool.configure(workers=1, min_batch=2)
+    items = [
+        DigestItem(title=f"标题 {index}", url=f"https://x.com/a/status/{index}", source="a", score=8, tags=["AI"])
+        for index in range(3)
+    ]
+    text = '[{"tweet_id":"1","ai_score":88,"summary":"要点"},{"tweet_id":"2","ai_score":70,"summary":"要点"}]'
+    try:
+        payload = await pool.run(render_channel_payload, "feishu", "src", "", items, "2026-01-01 08:30", size=len(items))
+        assert payload == render_channel_payload("feishu", "src", "", items, "2026-01-01 08:30")
+        insights = await pool.run(parse_batch_item_output, text, {"1", "2"}, size=len(text), min_size=10)
+        assert [(item.tweet_id, item.ai_score) for item in insights] == [("1", 88), ("2", 70)]
+
+        fallback_before = PROCESS_POOL_TASKS.get(task="_exit_in_child", mode="fallback")
+        assert await pool.run(_exit_in_child, os.getpid(), size=2) == "inline"
+        assert PROCESS_POOL_TASKS.get(task="_exit_in_child", mode="fallback") == fallback_before + 1
+        # 进程池已重建，后续任务仍在子进程执行
+        assert await pool.run(render_channel_payload, "feishu", "src", "", items, "2026-01-01 08:30", size=len(items)) == payload
+    finally:
+        pool.shutdown()
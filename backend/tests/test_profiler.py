@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from core import get_settings
+from core.profiler import Profiler
+from main import app
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def _busy_worker(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        _spin(0.01)
+        await asyncio.sleep(0)
+
+
+async def _waiting_worker(stop: asyncio.Event) -> None:
+    await stop.wait()
+
+
+async def _allocating_worker(stop: asyncio.Event, sink: list[bytes]) -> None:
+    while not stop.is_set():
+        sink.append(bytes(64 * 1024))
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_profiler_samples_stacks_tasks_and_allocations() -> None:
+    stop = asyncio.Event()
+    sink: list[bytes] = []
+    workers = [
+        asyncio.create_task(_busy_worker(stop), name="busy"),
+        asyncio.create_task(_waiting_worker(stop), name="waiting"),
+        asyncio.create_task(_allocating_worker(stop, sink), name="allocating"),
+    ]
+    try:
+        result = await Profiler().run(seconds=0.5, interval_ms=5, task_interval_ms=20)
+    finally:
+        stop.set()
+        await asyncio.gather(*workers)
+
+    assert result.samples > 0
+    assert "_spin (tests/test_profiler.py:" in result.folded("cpu")
+    # 折叠栈每行形如 "a;b;c 次数"
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in result.folded("cpu").splitlines())
+    assert "_waiting_worker (tests/test_profiler.py:" in result.folded("tasks")
+    assert {"busy", "waiting", "allocating"} <= {task["name"] for task in result.task_dump}
+    assert result.memory_traced
+    assert any("tests/test_profiler.py:" in frame for item in result.top_allocations for frame in item["traceback"])
+    # 由剖析器开启的 tracemalloc 在结束后关闭
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_is_protected(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", False)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.get("/internal/profile", params={"seconds": 0.1})
+        assert response.status_code == 404
+
+        monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+        response = await client.get("/internal/profile", params={"seconds": 0.1}, headers={"X-API-Key": "wrong"})
+        assert response.status_code == 401
+
+        headers = {"X-API-Key": settings.API_KEY}
+        response = await client.get(
+            "/internal/profile", params={"seconds": settings.PROFILING_MAX_SECONDS + 1}, headers=headers
+        )
+        assert response.status_code == 422
+
+        response = await client.get(
+            "/internal/profile",
+            params={"seconds": 0.2, "interval_ms": 5, "format": "folded", "kind": "tasks", "memory": "false"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+        response = await client.get("/internal/profile", params={"seconds": 0.2, "interval_ms": 5}, headers=headers)
+        data = response.json()["data"]
+        assert data["samples"] > 0
+        assert data["memory"]["traced"] is True
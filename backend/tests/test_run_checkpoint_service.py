@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core import app_now
+from db.base import Base
+from schemas import CrawlItem
+from services.run_checkpoint_service import RunCheckpointService
+
+
+@pytest.mark.asyncio
+async def test_resume_copies_completed_stages_and_crawl_items() -> None:
+    fd, db_path = tempfile.mkstemp(prefix="run_checkpoint_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        service = RunCheckpointService(session_factory=session_factory)
+        item = CrawlItem(source="author_timeline", tweet_id="1", author_username="a", url="https://x.com/a/status/1", text="hello")
+
+        assert await service.start_run("run-1") == {}
+        await service.save("run-1", source_id=1, stage="crawled", items=[item])
+        await service.save("run-1", source_id=1, stage="persisted")
+        await service.save("run-1", source_id=1, stage=None, error="llm_timeout")
+        await service.save("run-1", source_id=2, stage="notified")
+        await service.save("run-1", source_id=3, stage=None, error="crawl_failed")
+        await service.finish_run("run-1", status="failed")
+
+        checkpoints = await service.start_run("run-2", resume_from="run-1")
+        assert set(checkpoints) == {1, 2}
+        assert checkpoints[1].stage == "persisted"
+        assert checkpoints[1].reached("crawled") and not checkpoints[1].reached("analyzed")
+        assert [i.tweet_id for i in checkpoints[1].items] == ["1"]
+        assert checkpoints[2].reached("notified")
+
+        # 续跑重新经过已完成阶段时不回退
+        await service.save("run-2", source_id=1, stage="crawled")
+        async with session_factory() as session:
+            run = await service.describe_run(session, "run-2")
+        assert run["resumed_from"] == "run-1"
+        assert {s["source_id"]: s["stage"] for s in run["sources"]} == {1: "persisted", 2: "notified"}
+    finally:
+        await engine.dispose()
+        os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_recently_notified_ignores_own_run_and_old_checkpoints() -> None:
+    fd, db_path = tempfile.mkstemp(prefix="run_checkpoint_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        service = RunCheckpointService(session_factory=session_factory)
+        await service.start_run("replica-a")
+        await service.save("replica-a", source_id=1, stage="notified")
+        await service.save("replica-a", source_id=2, stage="analyzed")
+        await service.start_run("replica-b")
+        await service.save("replica-b", source_id=3, stage="notified")
+
+        since = app_now() - timedelta(minutes=5)
+        assert await service.recently_notified([1, 2, 3, 4], since=since, exclude_run_id="replica-b") == {1}
+        assert await service.recently_notified([1, 2, 3], since=app_now() + timedelta(minutes=1)) == set()
+    finally:
+        await engine.dispose()
+        os.remove(db_path)
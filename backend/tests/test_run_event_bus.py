@@ -0,0 +1,49 @@
+import pytest
+
+from core.request_context import run_id_ctx_var
+from services.run_event_bus import RunEvent, RunEventBus, publish_run_event, run_event_bus
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_receives_history_then_live_events() -> None:
+    bus = RunEventBus()
+    bus.publish(RunEvent(run_id="r1", stage="crawled", source_id=1, data={"count": 3}))
+    bus.publish(RunEvent(run_id="r2", stage="crawled", source_id=2))
+
+    queue = bus.subscribe("r1")
+    bus.publish(RunEvent(run_id="r1", stage="notified", source_id=1))
+
+    assert (await queue.get()).stage == "crawled"
+    assert (await queue.get()).stage == "notified"
+    assert queue.empty()
+
+    bus.unsubscribe("r1", queue)
+    bus.publish(RunEvent(run_id="r1", stage="run_done"))
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_events() -> None:
+    bus = RunEventBus(queue_size=2)
+    queue = bus.subscribe("r1")
+    for stage in ("crawled", "cleaned", "analyzed"):
+        bus.publish(RunEvent(run_id="r1", stage=stage))
+
+    assert [(await queue.get()).stage, (await queue.get()).stage] == ["cleaned", "analyzed"]
+
+
+@pytest.mark.asyncio
+async def test_publish_run_event_uses_current_run_id() -> None:
+    publish_run_event("crawled", source_id=1)  # 不在运行上下文中：忽略
+
+    token = run_id_ctx_var.set("ctx-run")
+    try:
+        queue = run_event_bus.subscribe("ctx-run")
+        publish_run_event("crawled", source_id=1, count=5)
+    finally:
+        run_id_ctx_var.reset(token)
+
+    event = await queue.get()
+    assert event.source_id == 1
+    assert event.data == {"count": 5}
+    run_event_bus.unsubscribe("ctx-run", queue)
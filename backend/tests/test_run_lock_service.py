@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.base import Base
+from services.run_lock_service import DatabaseRunLockBackend, InMemoryRunLockBackend, RunLockService
+
+
+@pytest.mark.asyncio
+async def test_hold_is_exclusive_until_released() -> None:
+    service = RunLockService(backend=InMemoryRunLockBackend())
+
+    async with service.hold("pipeline:run_all") as first:
+        assert first is True
+        async with service.hold("pipeline:run_all") as second:
+            assert second is False
+        async with service.hold("pipeline:source:1") as other:
+            assert other is True
+
+    async with service.hold("pipeline:run_all") as again:
+        assert again is True
+
+
+@pytest.mark.asyncio
+async def test_database_backend_expired_lease_can_be_taken_over() -> None:
+    fd, db_path = tempfile.mkstemp(prefix="run_lock_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        backend = DatabaseRunLockBackend(session_factory=session_factory)
+        assert await backend.acquire("pipeline:run_all", owner="a", ttl_seconds=60) is True
+        assert await backend.acquire("pipeline:run_all", owner="b", ttl_seconds=60) is False
+        assert await backend.renew("pipeline:run_all", owner="b", ttl_seconds=60) is False
+
+        # 持有者崩溃未释放：租约过期后可被接管
+        assert await backend.acquire("pipeline:source:1", owner="a", ttl_seconds=-1) is True
+        assert await backend.acquire("pipeline:source:1", owner="b", ttl_seconds=60) is True
+        assert await backend.renew("pipeline:source:1", owner="a", ttl_seconds=60) is False
+
+        await backend.release("pipeline:run_all", owner="a")
+        assert await backend.acquire("pipeline:run_all", owner="b", ttl_seconds=60) is True
+    finally:
+        await engine.dispose()
+        os.remove(db_path)
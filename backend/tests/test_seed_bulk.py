@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.load_api import LoadTestConfig, run_load_test
+from db.base import Base
+from db.seed import seed_bulk
+from db.session import get_db
+from main import app
+from models import ContentAIAnalysis, ContentItem, LLMCallLog, MonitorSource, PushLog, PushLogItem
+
+
+@pytest.mark.asyncio
+async def test_seed_bulk_generates_consistent_data_and_drives_load_test() -> None:
+    fd, db_path = tempfile.mkstemp(prefix="seed_bulk_", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    progress: list[tuple[str, int, int]] = []
+    try:
+        async with session_factory() as session:
+            stats = await seed_bulk(
+                session,
+                contents=250,
+                logs=40,
+                items_per_log=3,
+                sources=5,
+                analyzed_ratio=0.6,
+                batch_size=100,
+                on_progress=lambda table, done, total: progress.append((table, done, total)),
+            )
+            # 重复执行应追加数据而不触发唯一约束
+            await seed_bulk(session, contents=50, logs=10, items_per_log=1, sources=2, batch_size=100)
+
+        assert stats["contents"] == 250
+        assert stats["analyses"] == 150
+        assert stats["log_items"] == 120
+        assert ("contents", 250, 250) in progress
+
+        async with session_factory() as session:
+
+            async def count(column) -> int:
+                return int((await session.execute(select(func.count(column)))).scalar_one())
+
+            assert await count(MonitorSource.id) == 7
+            assert await count(ContentItem.id) == 300
+            assert await count(ContentAIAnalysis.id) == 190
+            assert await count(PushLog.id) == 50
+            assert await count(PushLogItem.id) == 130
+            assert await count(LLMCallLog.id) == 50
+            # 每条分析都指向存在的资讯
+            orphans = (
+                await session.execute(
+                    select(func.count(ContentAIAnalysis.id))
+                    .outerjoin(ContentItem, ContentItem.id == ContentAIAnalysis.content_item_id)
+                    .where(ContentItem.id.is_(None))
+                )
+            ).scalar_one()
+            assert orphans == 0
+
+        async def _override_get_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _override_get_db
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            report = await run_load_test(LoadTestConfig(requests=60, concurrency=4, page_size=10), client=client)
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+    scenario = report["scenarios"]["read_api"]
+    assert scenario["requests"] == 60
+    assert scenario["errors"] == 0
+    assert scenario["requests_per_second"] > 0
+    assert report["dataset"]["content_pages"] == 30
+    assert {"contents_first_page", "logs_page"} <= set(scenario["spans"])
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from core.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_inflight_request_and_cache_result() -> None:
+    flight = SingleFlight(ttl_seconds=60)
+    calls = 0
+
+    async def _fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"tweets": [1]}
+
+    results = await asyncio.gather(*(flight.do(("timeline", "karpathy"), _fetch) for _ in range(5)))
+    assert calls == 1
+    assert all(result == {"tweets": [1]} for result in results)
+
+    assert await flight.do(("timeline", "karpathy"), _fetch) == {"tweets": [1]}
+    assert calls == 1
+    assert (flight.misses, flight.shared, flight.hits) == (1, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_but_not_cached_and_caller_cancel_does_not_abort() -> None:
+    flight = SingleFlight(ttl_seconds=60)
+    attempts = 0
+
+    async def _fail():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream_503")
+
+    results = await asyncio.gather(flight.do("q", _fail), flight.do("q", _fail), return_exceptions=True)
+    assert attempts == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def _ok():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("q", _ok))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("q", _ok))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "ok"
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+
+from core.tracing import JsonFileSpanExporter, OtlpHttpSpanExporter, Span, Tracer
+from models import MonitorSource
+from services import pipeline_service as pipeline_module
+from services.pipeline_service import SourceRunContext
+
+
+class _MemoryExporter:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks_and_record_errors() -> None:
+    exporter = _MemoryExporter()
+    tracer = Tracer()
+    tracer.configure(exporter, flush_interval=0.1)
+
+    async def child(index: int) -> None:
+        with tracer.span("child", index=index):
+            await asyncio.sleep(0)
+
+    with tracer.span("root", run_id="r1") as root:
+        await asyncio.gather(*(asyncio.create_task(child(index)) for index in range(2)))
+        with pytest.raises(ValueError):
+            with tracer.span("broken"):
+                raise ValueError("boom")
+    tracer.shutdown()
+
+    by_name: dict[str, list[Span]] = {}
+    for span in exporter.spans:
+        by_name.setdefault(span.name, []).append(span)
+    assert len(by_name["child"]) == 2
+    assert all(span.parent_id == root.span_id and span.trace_id == root.trace_id for span in by_name["child"])
+    assert by_name["broken"][0].status == "error"
+    assert "boom" in by_name["broken"][0].error
+    assert by_name["root"][0].parent_id is None
+    assert by_name["root"][0].attributes == {"run_id": "r1"}
+
+
+def test_disabled_tracer_is_noop() -> None:
+    tracer = Tracer()
+    with tracer.span("anything") as span:
+        span.set_attribute("k", "v")
+    assert span.trace_id is None
+    assert tracer.start_span("manual") is None
+
+
+@pytest.mark.asyncio
+async def test_stage_spans_attach_to_source_span_from_other_workers(monkeypatch) -> None:
+    exporter = _MemoryExporter()
+    tracer = Tracer()
+    tracer.configure(exporter, flush_interval=0.1)
+    monkeypatch.setattr(pipeline_module, "tracer", tracer)
+
+    source = MonitorSource(id=7, type="author", value="openai", is_active=True)
+    with tracer.span("pipeline.run"):
+        ctx = SourceRunContext(source=source, span=tracer.start_span("pipeline.source", source_id=7))
+
+    async def run_stage(stage: str) -> None:
+        # 分阶段流水线中各阶段在不同的 worker 任务中执行，且不在 run Span 上下文内
+        with pipeline_module._stage_scope(ctx, stage):
+            await asyncio.sleep(0)
+
+    await asyncio.create_task(run_stage("crawl"))
+    await asyncio.create_task(run_stage("notify"))
+    ctx.error = "notify_failed"
+    pipeline_module._end_source_span(ctx)
+    tracer.shutdown()
+
+    source_span = next(span for span in exporter.spans if span.name == "pipeline.source")
+    stages = [span for span in exporter.spans if span.name in ("pipeline.crawl", "pipeline.notify")]
+    assert len(stages) == 2
+    assert all(span.parent_id == source_span.span_id for span in stages)
+    assert source_span.status == "error"
+
+
+def test_json_file_and_otlp_encoding() -> None:
+    fd, path = tempfile.mkstemp(prefix="traces_", suffix=".jsonl")
+    os.close(fd)
+    tracer = Tracer()
+    tracer.configure(JsonFileSpanExporter(path), flush_interval=0.1)
+    with tracer.span("glm.call", model="glm-test", hedged=False):
+        pass
+    tracer.shutdown()
+
+    with open(path, encoding="utf-8") as fp:
+        records = [json.loads(line) for line in fp]
+    os.remove(path)
+    assert records[0]["name"] == "glm.call"
+    assert records[0]["attributes"] == {"model": "glm-test", "hedged": False}
+
+    span = Span(name="x", trace_id="a" * 32, span_id="b" * 16, parent_id=None, start_ns=1, end_ns=2)
+    span.set_error("boom")
+    exporter = OtlpHttpSpanExporter("http://127.0.0.1:4318/v1/traces", service_name="svc")
+    encoded = exporter.encode([span])
+    exporter.shutdown()
+    otlp_span = encoded["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp_span["traceId"] == "a" * 32
+    assert otlp_span["status"] == {"code": 2, "message": "boom"}
+    assert "parentSpanId" not in otlp_span
@@ -0,0 +1,42 @@
+"""独立任务 worker 入口：`python worker.py`（API 侧配置 JOB_WORKER_EMBEDDED=false）。"""
+
+import asyncio
+import contextlib
+import signal
+
+from core import setup_logging
+from core.loop_monitor import loop_monitor
+from core.process_pool import process_pool
+from core.tracing import tracer
+from db.init_db import init_db
+from services.job_worker import JobWorker
+
+
+async def run() -> None:
+    setup_logging()
+    tracer.configure_from_settings()
+    loop_monitor.start_from_settings()
+    process_pool.configure_from_settings()
+    await init_db()
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Windows 不支持 add_signal_handler，退化为 Ctrl+C 直接中断
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await JobWorker().run_forever(stop_event)
+    finally:
+        process_pool.shutdown()
+        loop_monitor.stop()
+        tracer.shutdown()
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,7 @@ import api from './http'
 export function fetchOverview() {
   return api.get('/api/dashboard/overview')
 }
+
+export function fetchTokenUsage(days = 7) {
+  return api.get('/api/dashboard/token-usage', { params: { days } })
+}
@@ -7,3 +7,34 @@ export function runNowJob() {
 export function fetchRunNowStatus(jobId) {
   return api.get(`/api/jobs/run-now/${jobId}`)
 }
+
+const RUN_EVENT_TYPES = [
+  'job_status',
+  'source_start',
+  'crawled',
+  'cleaned',
+  'persisted',
+  'analyzed',
+  'llm_call_done',
+  'llm_call_failed',
+  'notified',
+  'source_failed',
+  'run_done',
+  'run_failed',
+]
+
+// SSE 订阅任务实时进度；返回关闭函数。浏览器不支持或连接失败时由调用方回退到轮询。
+export function subscribeRunNowEvents(jobId, { onEvent, onError }) {
+  const baseURL = import.meta.env.VITE_API_BASE_URL || ''
+  const source = new EventSource(`${baseURL}/api/jobs/run-now/${jobId}/events`)
+  RUN_EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (event) => {
+      onEvent(type, JSON.parse(event.data))
+    })
+  })
+  source.onerror = (event) => {
+    source.close()
+    onError?.(event)
+  }
+  return () => source.close()
+}